@@ -1,48 +1,129 @@
-from fastapi import FastAPI, HTTPException, Depends, Query, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, Query, Header, Response
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from typing import List, Mapping, Optional, AsyncIterator, Iterator, Sequence, Tuple
+from decimal import Decimal
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import Session, select
-import re
+from sqlalchemy import and_, or_, exists, func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 import os
-import tempfile
-from datetime import datetime
-
-# PDF and Email imports
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.utils import ImageReader
-import emails
-from emails.template import JinjaTemplate
+import base64
+import asyncio
+import time
+import zipfile
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+
+# PDF rendering (order_pdf, which imports reportlab) and email sending
+# (order_email) are imported on first use or in warm_up(), not here
 
 # Database imports
-from database import create_db_and_tables, get_session
-from models import OrderTable, OrderItemTable, OrderCreate, OrderRead
-
-app = FastAPI()
-
-# Create database tables on startup
-@app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
-
-# Predefined products with prices in CAD (base currency)
-PREDEFINED_PRODUCTS = {
-    "Laptop": 1200.00,
-    "Mouse": 25.00,
-    "Keyboard": 75.00,
-    "Monitor": 300.00,
-    "Headphones": 150.00,
-    "Webcam": 80.00,
-    "Smartphone": 800.00,
-    "Tablet": 500.00,
-    "Charger": 30.00,
-    "Speaker": 120.00
-}
+from database import run_migrations, get_async_session, get_async_read_session, async_engine, async_read_engine, dispose_engines, pool_metrics
+from executors import queue_depths, run_blocking, shutdown_executors
+from email_outbox import EmailOutbox
+from pdf_cache import PdfCache, content_key
+from fast_json import FastJSONResponse, dumps, dumps_lines
+from order_cache import OrderCache, CachedOrder, backend_from_url
+from confirmation import ConfirmationCache, render_confirmation, render_error
+from validation import EMAIL_PATTERN, error as validation_error, order_errors, validate_orders
+from idempotency import IdempotencyStore, MAX_KEY_LENGTH, StoredResponse, request_fingerprint
+from metrics import REGISTRY, STAGE_SECONDS, MetricsMiddleware
+from catalog import ProductCatalog
+from rates import BASE_CURRENCY, ExchangeRateService
+from pricing import order_line_prices as price_order_lines, price_lines, price_order
+from exports import EXPORT_FORMATS, StreamSink, csv_chunks, export_statement, iter_export_rows, parquet_chunks
+from reports import (
+    REPORTS_SUMMARY_TABLES, OrderSale, sale_from_order, record_sales, run_report,
+    products_statement, currencies_statement, periods_statement, customers_statement
+)
+from models import OrderTable, OrderItemTable, OrderCreate, OrderRead, OrderItemRead, EmailJobTable, EmailJobRead, BulkPdfRequest, OrderBatchCreate, ProductUpdate, order_from_snapshot, order_snapshot
+
+# server.py migrates once before starting its workers and turns this off for them
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "true").lower() == "true"
+# Wall-clock time the worker process started; server.py resets it in each forked worker
+WORKER_STARTED_AT = time.time()
+WARMED_UP = False
+
+def warm_up():
+    """
+    Load what every request needs before the first one arrives: the catalog,
+    the exchange rates, and the PDF and email modules with reportlab's fonts. server.py calls this once before
+    forking so workers inherit it; otherwise each worker runs it on startup.
+    """
+    global WARMED_UP
+    import order_email
+    product_catalog.load()
+    exchange_rate_service.snapshot
+    sample = OrderTable(id=0, customer_name="Warm Up", currency=BASE_CURRENCY, created_at=datetime.utcnow())
+    sample.order_items = [OrderItemTable(id=0, product_name=name, quantity=1, order_id=0) for name in list(product_catalog.prices)[:1]]
+    generate_order_pdf(sample)
+    WARMED_UP = True
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Worker startup and graceful shutdown.
+    On shutdown (SIGTERM) uvicorn stops accepting connections and waits for
+    in-flight requests first; then queued email deliveries and PDF renders
+    finish before the pools and connections are released.
+    """
+    if RUN_MIGRATIONS_ON_STARTUP:
+        run_migrations()
+    if not WARMED_UP:
+        warm_up()
+    product_catalog.start()
+    exchange_rate_service.start()
+    email_outbox.start()
+    idempotency_store.start()
+    cold_start = time.time() - WORKER_STARTED_AT
+    WORKER_COLD_START.set(round(cold_start, 4))
+    print(f"[SERVER] Worker {os.getpid()} ready in {cold_start * 1000:.0f} ms")
+
+    yield
+
+    await email_outbox.stop()
+    await idempotency_store.stop()
+    await product_catalog.stop()
+    await exchange_rate_service.stop()
+    await order_cache.close()
+    await asyncio.to_thread(shutdown_executors)
+    await dispose_engines()
+    print(f"[SERVER] Worker {os.getpid()} stopped")
+
+app = FastAPI(lifespan=lifespan)
+
+# Products and their prices in CAD (base currency), cached per worker
+product_catalog = ProductCatalog()
+
+async def catalog_loaded():
+    """Route dependency: load the catalog through the async engine in a worker that skipped warm_up()"""
+    await product_catalog.ensure_loaded()
+
+# Added to every route that prices orders or serves the catalog
+CATALOG_LOADED = [Depends(catalog_loaded)]
+
+# Exchange rates from CAD, fetched from EXCHANGE_RATES_SOURCE and cached per worker
+exchange_rate_service = ExchangeRateService()
+
+# How long clients and proxies may reuse the GET /api/products response
+PRODUCTS_MAX_AGE_SECONDS = int(os.getenv("PRODUCTS_MAX_AGE_SECONDS", "60"))
+
+# Maximum number of orders accepted by POST /orders/batch
+ORDER_BATCH_MAX = int(os.getenv("ORDER_BATCH_MAX", "50000"))
+
+# Bulk PDF export settings: orders fetched and rendered per round trip, the
+# most order IDs one request may list, and the cap for the combined document,
+# which reportlab has to build in memory
+BULK_PDF_PAGE_SIZE = int(os.getenv("BULK_PDF_PAGE_SIZE", "50"))
+BULK_PDF_MAX_ORDER_IDS = int(os.getenv("BULK_PDF_MAX_ORDER_IDS", "10000"))
+BULK_PDF_MAX_COMBINED_ORDERS = int(os.getenv("BULK_PDF_MAX_COMBINED_ORDERS", "500"))
+
+# Pagination settings for GET /orders
+ORDERS_PAGE_DEFAULT = 100
+ORDERS_PAGE_MAX = 1000
 
 # Add CORS middleware
 app.add_middleware(
@@ -51,65 +132,230 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Idempotent-Replayed"],
 )
 
-# Data validation functions
-def validate_product_name(product_name: str) -> str:
-    """Validate product name"""
-    if not product_name.strip():
-        raise ValueError("Product name cannot be empty or whitespace.")
-    if product_name not in PREDEFINED_PRODUCTS:
-        raise ValueError(f"Product '{product_name}' is not available. Please select from predefined products.")
-    return product_name
-
-def validate_customer_name(customer_name: str) -> str:
-    """Validate customer name"""
-    if not customer_name.strip():
-        raise ValueError("Customer name cannot be empty or whitespace.")
-    if not re.match(r"^[a-zA-Z ]+$", customer_name):
-        raise ValueError("Customer name can only contain alphabetic characters and spaces.")
-    return customer_name
-
-def validate_currency(currency: str) -> str:
-    """Validate currency"""
-    supported_currencies = ["CAD", "USD", "EUR", "GBP"]
-    if currency not in supported_currencies:
-        raise ValueError(f"Currency '{currency}' is not supported. Supported currencies: {', '.join(supported_currencies)}")
-    return currency
-
-def validate_order_items(order_items: List[dict]) -> List[dict]:
-    """Validate order items"""
-    if len(order_items) > 100:
-        raise ValueError("You cannot add more than 100 line items.")
-
-    product_names = set()
-    total_quantity = 0
-
-    for item in order_items:
-        product_name = item.get("product_name", "")
-        quantity = item.get("quantity", 0)
-        
-        # Validate product name
-        validate_product_name(product_name)
-        
-        # Check for duplicate product names
-        if product_name in product_names:
-            raise ValueError(f"Duplicate product name detected: '{product_name}'.")
-        product_names.add(product_name)
+# Request latency per route for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Pagination helpers
+def encode_order_cursor(created_at: datetime, order_id: int) -> str:
+    """
+    Encode the keyset position of an order as an opaque cursor.
+
+    Args:
+        created_at (datetime): Creation time of the last order of a page.
+        order_id (int): ID of the last order of a page.
+
+    Returns:
+        str: URL-safe cursor to pass back as the `after` parameter.
+    """
+    raw = f"{created_at.isoformat()}|{order_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_order_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by `encode_order_cursor`.
+
+    Args:
+        cursor (str): The opaque cursor string.
+
+    Returns:
+        Tuple[datetime, int]: The (created_at, id) keyset position.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, order_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(order_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input (used with escape="\\")"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def order_filter_clauses(
+    dialect_name: str,
+    customer: Optional[str] = None,
+    search: Optional[str] = None,
+    product: Optional[str] = None,
+    currency: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> list:
+    """
+    Build the WHERE clauses of the GET /orders filters. Each one is served
+    by an index (see migration 0007).
+
+    Args:
+        dialect_name (str): The database dialect.
+        customer (Optional[str]): Case-insensitive customer name prefix.
+        search (Optional[str]): Fuzzy customer name search; trigram similarity
+            on PostgreSQL, a case-insensitive substring match elsewhere.
+        product (Optional[str]): Orders containing this product.
+        currency (Optional[str]): Orders in this currency.
+        created_from (Optional[datetime]): Orders created at or after this time.
+        created_to (Optional[datetime]): Orders created before this time.
+
+    Returns:
+        list: SQL conditions to AND together.
+    """
+    clauses = []
+    if customer:
+        clauses.append(func.lower(OrderTable.customer_name).like(escape_like(customer.lower()) + "%", escape="\\"))
+    if search:
+        if dialect_name == "postgresql":
+            clauses.append(OrderTable.customer_name.op("%")(search))
+        else:
+            clauses.append(func.lower(OrderTable.customer_name).like("%" + escape_like(search.lower()) + "%", escape="\\"))
+    if product:
+        clauses.append(exists().where(
+            OrderItemTable.order_id == OrderTable.id,
+            OrderItemTable.product_name == product
+        ))
+    if currency:
+        clauses.append(OrderTable.currency == currency)
+    if created_from is not None:
+        clauses.append(OrderTable.created_at >= created_from)
+    if created_to is not None:
+        clauses.append(OrderTable.created_at < created_to)
+    return clauses
+
+def keyset_page(statement, limit: int, after: Optional[Tuple[datetime, int]], filters: Sequence):
+    """Restrict an orders query to one page in (created_at, id) order"""
+    statement = statement.where(*filters).order_by(OrderTable.created_at, OrderTable.id).limit(limit)
+    if after is not None:
+        created_at, order_id = after
+        statement = statement.where(
+            or_(
+                OrderTable.created_at > created_at,
+                and_(OrderTable.created_at == created_at, OrderTable.id > order_id),
+            )
+        )
+    return statement
+
+def orders_page_statement(limit: int, after: Optional[Tuple[datetime, int]] = None, filters: Sequence = ()):
+    """
+    Build a keyset-paginated query for orders ordered by (created_at, id).
+    Order items are eager loaded in a single extra query per page.
+
+    Args:
+        limit (int): Maximum number of orders to return.
+        after (Optional[Tuple[datetime, int]]): Keyset position to start after.
+        filters (Sequence): Additional WHERE clauses, e.g. from `order_filter_clauses`.
+
+    Returns:
+        Select: The SQL statement for the page.
+    """
+    return keyset_page(select(OrderTable).options(selectinload(OrderTable.order_items)), limit, after, filters)
+
+# The columns behind OrderRead and OrderItemRead, in schema order. Read
+# endpoints select only these and encode the rows directly, skipping ORM
+# objects and pydantic; the output is the same bytes as the response_model.
+ORDER_READ_COLUMNS = [getattr(OrderTable, name) for name in OrderRead.model_fields if name != "order_items"]
+ORDER_ITEM_READ_COLUMNS = [getattr(OrderItemTable, name) for name in OrderItemRead.model_fields]
+
+def order_rows_page_statement(limit: int, after: Optional[Tuple[datetime, int]] = None, filters: Sequence = ()):
+    """
+    Build the keyset-paginated projection of `orders_page_statement`.
+
+    Args:
+        limit (int): Maximum number of orders to return.
+        after (Optional[Tuple[datetime, int]]): Keyset position to start after.
+        filters (Sequence): Additional WHERE clauses.
+
+    Returns:
+        Select: The SQL statement for the page.
+    """
+    return keyset_page(select(*ORDER_READ_COLUMNS), limit, after, filters)
 
-        # Accumulate total quantity
-        total_quantity += quantity
+async def fetch_order_rows(session: AsyncSession, statement) -> List[dict]:
+    """
+    Run an order projection and attach the items of every order with one more query.
 
-    # Check total order quantity
-    if total_quantity > 1000000:
-        raise ValueError("The total quantity for the order cannot exceed 1,000,000.")
+    Args:
+        session (AsyncSession): Database session.
+        statement (Select): Query selecting ORDER_READ_COLUMNS.
 
-    return order_items
+    Returns:
+        List[dict]: Orders in OrderRead shape, ready for `fast_json.dumps`.
+    """
+    orders = [dict(row._mapping) for row in (await session.exec(statement)).all()]
+    if not orders:
+        return orders
+    items_by_order = {}
+    for order in orders:
+        order["order_items"] = items_by_order[order["id"]] = []
+    items = await session.exec(
+        select(*ORDER_ITEM_READ_COLUMNS)
+        .where(OrderItemTable.order_id.in_(list(items_by_order)))
+        .order_by(OrderItemTable.order_id, OrderItemTable.id)
+    )
+    for item in items.all():
+        items_by_order[item.order_id].append(dict(item._mapping))
+    return orders
+
+async def stream_orders_ndjson(
+    chunk_size: int,
+    after: Optional[Tuple[datetime, int]] = None,
+    filters: Sequence = ()
+) -> AsyncIterator[bytes]:
+    """
+    Yield all orders after the given position as NDJSON, one chunk per page.
+
+    Args:
+        chunk_size (int): Number of orders fetched and yielded per chunk.
+        after (Optional[Tuple[datetime, int]]): Keyset position to start after.
+        filters (Sequence): Additional WHERE clauses.
+
+    Yields:
+        bytes: Newline-delimited JSON for one page of orders.
+    """
+    # The request-scoped session is closed before the body is streamed,
+    # so the generator owns its own session.
+    async with AsyncSession(async_read_engine) as session:
+        while True:
+            orders = await fetch_order_rows(session, order_rows_page_statement(chunk_size, after, filters))
+            if not orders:
+                break
+            yield dumps_lines(orders)
+            if len(orders) < chunk_size:
+                break
+            after = (orders[-1]["created_at"], orders[-1]["id"])
 
 # Utility functions
+def order_line_prices(
+    order: OrderTable,
+    prices: Optional[Mapping[str, float]] = None,
+    rates: Optional[Mapping[str, float]] = None
+) -> Tuple[List[Tuple[Decimal, Decimal]], Decimal]:
+    """
+    Unit price and line total per item, and the order total.
+    Prices are frozen on the order when it is created; orders that predate
+    that and have not been backfilled are priced with the current catalog and rates.
+
+    Args:
+        order (OrderTable): The order object with its items loaded.
+        prices (Optional[Mapping[str, float]]): Product prices in CAD; defaults to the catalog.
+        rates (Optional[Mapping[str, float]]): Exchange rates from CAD; defaults to the current rates.
+
+    Returns:
+        Tuple[List[Tuple[Decimal, Decimal]], Decimal]: Per-item prices and the order total.
+    """
+    return price_order_lines(
+        order,
+        product_catalog.prices if prices is None else prices,
+        exchange_rate_service.rates if rates is None else rates
+    )
+
+# Rendered confirmation pages, per process
+confirmation_cache = ConfirmationCache()
+
 def generate_order_confirmation(order: OrderTable) -> str:
     """
     Generate an HTML string for order confirmation with pricing details.
+    Orders with stored prices are rendered once and then served from the
+    confirmation cache.
 
     Args:
         order (OrderTable): The order object containing customer and item details.
@@ -117,298 +363,296 @@ def generate_order_confirmation(order: OrderTable) -> str:
     Returns:
         str: HTML string for the order confirmation page.
     """
-    # Get exchange rates for currency conversion
-    exchange_rates = {
-        "CAD": 1.0,
-        "USD": 0.75,
-        "EUR": 0.68,
-        "GBP": 0.59
-    }
-    
-    conversion_rate = exchange_rates.get(order.currency, 1.0)
-    
-    # Calculate pricing for each item and total
-    order_items_html = ""
-    total_order_amount = 0
-    
-    for item in order.order_items:
-        # Get base price in CAD
-        base_price = PREDEFINED_PRODUCTS.get(item.product_name, 0)
-        # Convert to order currency
-        unit_price = base_price * conversion_rate
-        line_total = unit_price * item.quantity
-        total_order_amount += line_total
-        
-        order_items_html += f"""
-        <tr>
-            <td>{item.product_name}</td>
-            <td>{item.quantity}</td>
-            <td>{unit_price:.2f} {order.currency}</td>
-            <td>{line_total:.2f} {order.currency}</td>
-        </tr>
-        """
-    
-    return f"""
-    <div class='order-confirmation-container'>
-        <h1>Order Confirmation</h1>
-        <p><strong>Order ID:</strong> {order.id}</p>
-        <p><strong>Customer Name:</strong> {order.customer_name}</p>
-        <p><strong>Currency:</strong> {order.currency}</p>
-        <p><strong>Order Date:</strong> {order.created_at.strftime('%Y-%m-%d %H:%M:%S')}</p>
-        
-        <h3>Order Items:</h3>
-        <table style="width: 100%; border-collapse: collapse; margin: 20px 0;">
-            <thead>
-                <tr style="background-color: #f5f5f5;">
-                    <th style="border: 1px solid #ddd; padding: 12px; text-align: left;">Product</th>
-                    <th style="border: 1px solid #ddd; padding: 12px; text-align: center;">Quantity</th>
-                    <th style="border: 1px solid #ddd; padding: 12px; text-align: right;">Unit Price</th>
-                    <th style="border: 1px solid #ddd; padding: 12px; text-align: right;">Line Total</th>
-                </tr>
-            </thead>
-            <tbody>
-                {order_items_html}
-            </tbody>
-            <tfoot>
-                <tr style="background-color: #f9f9f9; font-weight: bold;">
-                    <td colspan="3" style="border: 1px solid #ddd; padding: 12px; text-align: right;">Total Order Amount:</td>
-                    <td style="border: 1px solid #ddd; padding: 12px; text-align: right;">{total_order_amount:.2f} {order.currency}</td>
-                </tr>
-            </tfoot>
-        </table>
-        
-        <button onclick=\"window.location.href='/'\">Create Another Order</button>
-    </div>
-    """
+    cacheable = order.order_total is not None
+    if cacheable:
+        html = confirmation_cache.get(order.id)
+        if html is not None:
+            return html
+    line_prices, total_order_amount = order_line_prices(order)
+    html = render_confirmation(order, line_prices, total_order_amount)
+    if cacheable:
+        confirmation_cache.put(order.id, html)
+    return html
 
 def generate_error_response(detail: str) -> HTMLResponse:
     """
     Generate an HTML response for errors.
 
     Args:
-        detail (str): The error message to display.
+        detail (str): The error message to display; escaped when rendered.
 
     Returns:
         HTMLResponse: HTML response containing the error message.
     """
-    return HTMLResponse(
-        content=f"""
-        <div class='order-confirmation-container'>
-            <h1>Error</h1>
-            <p>{detail}</p>
-            <button onclick=\"window.location.href='/'\">Create Another Order</button>
-        </div>
-        """,
-        status_code=400
-    )
+    return HTMLResponse(content=render_error(detail), status_code=400)
 
-def generate_order_pdf(order: OrderTable) -> str:
+# Bump when the PDF layout changes so cached documents are re-rendered
+PDF_TEMPLATE_VERSION = "1"
+
+# Rendered PDFs, keyed by a hash of the order contents and template version
+pdf_cache = PdfCache()
+
+def order_pdf_cache_key(order: OrderTable) -> str:
     """
-    Generate a PDF file for the order confirmation.
+    Compute the content key of an order's PDF confirmation.
+    Any change to the order, its items or their prices yields a new key.
     
     Args:
-        order (OrderTable): The order object containing customer and item details.
+        order (OrderTable): The order object with its items loaded.
         
     Returns:
-        str: Path to the generated PDF file.
-    """
-    # Create a temporary file for the PDF
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-    pdf_path = temp_file.name
-    temp_file.close()
-    
-    # Create PDF document
-    doc = SimpleDocTemplate(pdf_path, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-    
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=20,
-        textColor=colors.HexColor('#1890ff'),
-        spaceAfter=30,
-        alignment=1  # Center alignment
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#1890ff'),
-        spaceAfter=12
-    )
-    
-    # Get exchange rates for currency conversion
-    exchange_rates = {
-        "CAD": 1.0,
-        "USD": 0.75,
-        "EUR": 0.68,
-        "GBP": 0.59
-    }
+        str: Hex digest used as cache key and ETag.
+    """
+    line_prices, order_total = order_line_prices(order)
+    return content_key({
+        "template": PDF_TEMPLATE_VERSION,
+        "id": order.id,
+        "customer_name": order.customer_name,
+        "currency": order.currency,
+        "created_at": order.created_at.isoformat(),
+        "items": [
+            [item.product_name, item.quantity, str(unit_price), str(line_total)]
+            for item, (unit_price, line_total) in zip(order.order_items, line_prices)
+        ],
+        "total": str(order_total),
+    })
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
     
-    conversion_rate = exchange_rates.get(order.currency, 1.0)
-    
-    # Build the PDF content
-    content = []
-    
-    # Title
-    content.append(Paragraph("ORDER CONFIRMATION", title_style))
-    content.append(Spacer(1, 12))
-    
-    # Order Information
-    content.append(Paragraph("Order Information", heading_style))
-    order_info = [
-        ['Order ID:', str(order.id)],
-        ['Customer Name:', order.customer_name],
-        ['Currency:', order.currency],
-        ['Order Date:', order.created_at.strftime('%Y-%m-%d %H:%M:%S')],
-    ]
-    
-    order_info_table = Table(order_info, colWidths=[2*inch, 3*inch])
-    order_info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f2ff')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d9d9d9')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    
-    content.append(order_info_table)
-    content.append(Spacer(1, 20))
-    
-    # Order Items
-    content.append(Paragraph("Order Items", heading_style))
-    
-    # Prepare items data
-    items_data = [['Product', 'Quantity', f'Unit Price ({order.currency})', f'Line Total ({order.currency})']]
-    total_order_amount = 0
-    
-    for item in order.order_items:
-        base_price = PREDEFINED_PRODUCTS.get(item.product_name, 0)
-        unit_price = base_price * conversion_rate
-        line_total = unit_price * item.quantity
-        total_order_amount += line_total
-        
-        items_data.append([
-            item.product_name,
-            str(item.quantity),
-            f'{unit_price:.2f}',
-            f'{line_total:.2f}'
-        ])
-    
-    # Add total row
-    items_data.append(['', '', 'TOTAL:', f'{total_order_amount:.2f}'])
-    
-    # Create items table
-    items_table = Table(items_data, colWidths=[2.5*inch, 1*inch, 1.5*inch, 1.5*inch])
-    items_table.setStyle(TableStyle([
-        # Header row
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1890ff')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
+    Args:
+        if_none_match (str): The raw header value.
+        etag (str): The current quoted ETag.
         
-        # Data rows
-        ('BACKGROUND', (0, 1), (-1, -2), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -2), colors.black),
-        ('ALIGN', (0, 1), (0, -2), 'LEFT'),  # Product names left-aligned
-        ('ALIGN', (1, 1), (-1, -2), 'CENTER'),  # Numbers center-aligned
-        ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -2), 10),
+    Returns:
+        bool: True if the client already holds this version.
+    """
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+# Chunk size used when streaming PDF bytes to the client
+PDF_STREAM_CHUNK_SIZE = 64 * 1024
+
+def iter_pdf_chunks(pdf_bytes: bytes, chunk_size: int = PDF_STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield a rendered PDF in fixed-size chunks without copying it.
+    
+    Args:
+        pdf_bytes (bytes): The PDF document.
+        chunk_size (int): Maximum size of each chunk.
         
-        # Total row
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#f0f2ff')),
-        ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
-        ('ALIGN', (0, -1), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, -1), (-1, -1), 11),
+    Yields:
+        bytes: Consecutive slices of the document.
+    """
+    view = memoryview(pdf_bytes)
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size]
+
+async def get_order_pdf_bytes(order: OrderTable) -> bytes:
+    """
+    Return the order PDF from the cache, rendering it on a miss.
+    The same bytes serve downloads and email attachments.
+    
+    Args:
+        order (OrderTable): The order object with its items loaded.
         
-        # Grid
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d9d9d9')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-    ]))
+    Returns:
+        bytes: The PDF document.
+    """
+    cache_key = order_pdf_cache_key(order)
+    pdf_bytes = pdf_cache.get_memory(cache_key)
+    if pdf_bytes is None:
+        # Disk lookup or render on the bounded PDF pool
+        pdf_bytes = await run_blocking(
+            "pdf", pdf_cache.get_or_render, cache_key, lambda: generate_order_pdf(order), order.id
+        )
+    return pdf_bytes
+
+def generate_order_pdf(order: OrderTable) -> bytes:
+    """
+    Generate the PDF for the order confirmation in memory.
     
-    content.append(items_table)
-    content.append(Spacer(1, 20))
+    Args:
+        order (OrderTable): The order object containing customer and item details.
+        
+    Returns:
+        bytes: The generated PDF document.
+    """
+    import order_pdf
+    return order_pdf.PDF_TEMPLATE.render(order, product_catalog.prices, exchange_rate_service.rates)
+
+# Serialized orders by id, per worker and optionally shared (ORDER_CACHE_URL)
+order_cache = OrderCache(backend=backend_from_url())
+
+async def get_order_payload(session: AsyncSession, order_id: int) -> CachedOrder:
+    """
+    Return an order's OrderRead JSON from the cache, loading and caching it on a miss.
+
+    Args:
+        session (AsyncSession): Database session, only used on a miss.
+        order_id (int): The ID of the order.
+
+    Returns:
+        CachedOrder: The serialized order and its ETag.
+    """
+    cached = await order_cache.get(order_id)
+    if cached is not None:
+        return cached
+    orders = await fetch_order_rows(session, select(*ORDER_READ_COLUMNS).where(OrderTable.id == order_id))
+    if not orders:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return await order_cache.put(order_id, dumps(orders[0]))
+
+async def get_order_or_404(session: AsyncSession, order_id: int) -> OrderTable:
+    """
+    Load an order with its items through the order cache, or raise a 404.
+
+    Args:
+        session (AsyncSession): Database session, only used on a cache miss.
+        order_id (int): The ID of the order.
+
+    Returns:
+        OrderTable: A transient order with its items, not attached to the session.
+    """
+    payload = await get_order_payload(session, order_id)
+    return order_from_snapshot(OrderRead.model_validate_json(payload.body).model_dump())
+
+async def deliver_email_job(job: EmailJobTable):
+    """
+    Render the order PDF and send it for one outbox job.
+    Raising marks the attempt as failed so the outbox retries it.
     
-    # Footer
-    footer_text = f"<para align=center><font size=8 color='#666666'>Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}<br/>Order Entry System</font></para>"
-    content.append(Paragraph(footer_text, styles['Normal']))
+    Args:
+        job (EmailJobTable): The claimed email job.
+    """
+    import order_email
+    # Runs outside any route, so nothing has loaded the catalog in a worker that skipped warm_up()
+    await product_catalog.ensure_loaded()
+    async with AsyncSession(async_engine) as session:
+        order = await get_order_or_404(session, job.order_id)
     
-    # Build PDF
-    doc.build(content)
+    pdf_bytes = await get_order_pdf_bytes(order)
+    with STAGE_SECONDS.time("email_dispatch"):
+        email_sent = await run_blocking(
+            "email", order_email.send_order_email, order, pdf_bytes, job.recipient_email, generate_order_confirmation(order)
+        )
     
-    return pdf_path
+    if not email_sent:
+        raise RuntimeError("Failed to send email. Please check email configuration.")
 
-def send_order_email(order: OrderTable, pdf_path: str, recipient_email: str) -> bool:
+def bulk_range_clause(request: BulkPdfRequest):
     """
-    Simulate sending order confirmation email with PDF attachment.
-    This is a simulation - no actual email is sent.
+    Build the created_at filter of a date-range bulk export.
     
     Args:
-        order (OrderTable): The order object.
-        pdf_path (str): Path to the PDF file.
-        recipient_email (str): Email address to send to.
+        request (BulkPdfRequest): The export request.
         
     Returns:
-        bool: Always returns True (simulation mode).
+        ColumnElement: SQL condition selecting the requested orders.
     """
-    try:
-        # Simulate email processing delay
-        import time
-        time.sleep(1)  # Simulate email sending time
-        
-        # Log the simulated email details
-        print(f"[EMAIL SIMULATION] Order confirmation email would be sent:")
-        print(f"  To: {recipient_email}")
-        print(f"  Subject: Order Confirmation #{order.id} - {order.customer_name}")
-        print(f"  Order ID: {order.id}")
-        print(f"  Customer: {order.customer_name}")
-        print(f"  Date: {order.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"  Currency: {order.currency}")
-        print(f"  PDF Attachment: order_confirmation_{order.id}.pdf")
-        print(f"  Email Body: HTML formatted order confirmation")
-        print(f"[EMAIL SIMULATION] Email successfully 'sent' (simulation mode)")
+    clauses = []
+    if request.created_from is not None:
+        clauses.append(OrderTable.created_at >= request.created_from)
+    if request.created_to is not None:
+        clauses.append(OrderTable.created_at < request.created_to)
+    return and_(*clauses)
+
+async def iter_bulk_order_pages(request: BulkPdfRequest) -> AsyncIterator[List[Tuple[str, dict]]]:
+    """
+    Yield the orders of a bulk export one page at a time.
+    Each page is a single eager-loaded query; pages are released after use.
+    
+    Args:
+        request (BulkPdfRequest): The export request.
         
-        # In a real implementation, you would:
-        # 1. Configure SMTP settings (Gmail, SendGrid, etc.)
-        # 2. Create the email with HTML template
-        # 3. Attach the PDF file
-        # 4. Send via SMTP
-        # 5. Handle any email service errors
+    Yields:
+        List[Tuple[str, dict]]: (PDF cache key, order snapshot) pairs.
+    """
+    async with AsyncSession(async_read_engine) as session:
+        if request.order_ids:
+            order_ids = sorted(set(request.order_ids))
+            for offset in range(0, len(order_ids), BULK_PDF_PAGE_SIZE):
+                statement = (
+                    select(OrderTable)
+                    .options(selectinload(OrderTable.order_items))
+                    .where(OrderTable.id.in_(order_ids[offset:offset + BULK_PDF_PAGE_SIZE]))
+                    .order_by(OrderTable.id)
+                )
+                orders = (await session.exec(statement)).all()
+                yield [(order_pdf_cache_key(order), order_snapshot(order)) for order in orders]
+                session.expunge_all()
+            return
         
-        return True  # Always succeed in simulation mode
+        after = None
+        while True:
+            statement = orders_page_statement(BULK_PDF_PAGE_SIZE, after).where(bulk_range_clause(request))
+            orders = (await session.exec(statement)).all()
+            if not orders:
+                break
+            yield [(order_pdf_cache_key(order), order_snapshot(order)) for order in orders]
+            if len(orders) < BULK_PDF_PAGE_SIZE:
+                break
+            after = (orders[-1].created_at, orders[-1].id)
+            session.expunge_all()
+
+async def render_bulk_pdf(cache_key: str, snapshot: dict) -> bytes:
+    """Return a cached PDF if this worker holds one, else render on the process pool"""
+    pdf_bytes = pdf_cache.get_memory(cache_key)
+    if pdf_bytes is None:
+        import order_pdf
+        pdf_bytes = await run_blocking(
+            "pdf-render", order_pdf.render_order_pdf_snapshot, snapshot,
+            dict(product_catalog.prices), dict(exchange_rate_service.rates)
+        )
+    return pdf_bytes
+
+async def stream_bulk_zip(request: BulkPdfRequest) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP archive with one confirmation PDF per order.
+    Each page of orders is rendered in parallel, then written and flushed
+    before the next page is fetched, so memory stays bounded by the page size.
+    PDFs are stored uncompressed: reportlab already compresses their content,
+    and deflating them again would run on the event loop.
+    
+    Args:
+        request (BulkPdfRequest): The export request.
         
-    except Exception as e:
-        print(f"[EMAIL SIMULATION] Error in simulation: {str(e)}")
-        return False
+    Yields:
+        bytes: Consecutive pieces of the archive.
+    """
+    sink = StreamSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        async for page in iter_bulk_order_pages(request):
+            pdfs = await asyncio.gather(*(render_bulk_pdf(cache_key, snapshot) for cache_key, snapshot in page))
+            for (_, snapshot), pdf_bytes in zip(page, pdfs):
+                archive.writestr(f"order_confirmation_{snapshot['id']}.pdf", pdf_bytes)
+            yield sink.drain()
+    yield sink.drain()
 
-def cleanup_pdf_file(file_path: str):
+async def stream_bulk_combined_pdf(request: BulkPdfRequest) -> AsyncIterator[bytes]:
     """
-    Background task to clean up temporary PDF files.
+    Stream one multi-page PDF with every requested confirmation.
     
     Args:
-        file_path (str): Path to the PDF file to delete.
+        request (BulkPdfRequest): The export request.
+        
+    Yields:
+        bytes: Consecutive pieces of the document.
     """
-    try:
-        if os.path.exists(file_path):
-            os.unlink(file_path)
-            print(f"Cleaned up temporary file: {file_path}")
-    except Exception as e:
-        print(f"Error cleaning up file {file_path}: {str(e)}")
+    snapshots = []
+    async for page in iter_bulk_order_pages(request):
+        snapshots.extend(snapshot for _, snapshot in page)
+    import order_pdf
+    pdf_bytes = await run_blocking(
+        "pdf-render", order_pdf.render_orders_pdf_snapshots, snapshots,
+        dict(product_catalog.prices), dict(exchange_rate_service.rates)
+    )
+    for chunk in iter_pdf_chunks(pdf_bytes):
+        yield chunk
+
+# Background workers delivering queued confirmation emails
+email_outbox = EmailOutbox(deliver_email_job)
 
 # Routes
 @app.get("/")
@@ -426,224 +670,716 @@ async def root():
         "docs": "/docs"
     }
 
-@app.post("/order", response_class=HTMLResponse)
-async def create_order(order_data: OrderCreate, session: Session = Depends(get_session)):
+# Idempotency-Key values of created orders, swept after IDEMPOTENCY_KEY_TTL_SECONDS
+idempotency_store = IdempotencyStore()
+
+def replay_response(key: str, stored: StoredResponse, request_hash: str) -> Response:
+    """
+    Response to a repeated Idempotency-Key: the recorded confirmation, or a
+    422 when the key was used for a different order.
+    """
+    if stored.request_hash != request_hash:
+        return JSONResponse(status_code=422, content={"detail": [
+            validation_error(["header", "idempotency-key"], "Idempotency-Key was already used for a different order.", key)
+        ]})
+    idempotency_store.replays += 1
+    return HTMLResponse(content=stored.body, status_code=stored.status_code, headers={"Idempotent-Replayed": "true"})
+
+@app.post("/order", response_class=HTMLResponse, dependencies=CATALOG_LOADED)
+async def create_order(
+    order_data: OrderCreate,
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=MAX_KEY_LENGTH),
+    session: AsyncSession = Depends(get_async_session)
+):
     """
     Endpoint to create a new order.
     Validates the input data and stores the order in the database.
-    Returns an HTML response for order confirmation or error.
+    Returns an HTML response for order confirmation or error; invalid
+    orders get a 422 listing every error. With an Idempotency-Key header,
+    repeating the request returns the first confirmation instead of
+    creating another order.
 
     Args:
         order_data (OrderCreate): The order data submitted by the user.
-        session (Session): Database session.
+        idempotency_key (Optional[str]): Client-chosen key identifying this submission.
+        session (AsyncSession): Database session.
 
     Returns:
         HTMLResponse: The HTML response for order confirmation or error.
     """
-    try:
-        # Validate input data
-        validate_customer_name(order_data.customer_name)
-        validate_currency(order_data.currency)
-        
-        # Convert order items to dict format for validation
-        order_items_dict = [{"product_name": item.product_name, "quantity": item.quantity} for item in order_data.order_items]
-        validate_order_items(order_items_dict)
+    if idempotency_key is not None:
+        request_hash = request_fingerprint(order_data.model_dump_json().encode())
+        stored = await idempotency_store.get(session, idempotency_key)
+        if stored is not None:
+            return replay_response(idempotency_key, stored, request_hash)
 
-        # Validate that the order has at least one order item
-        if not order_data.order_items:
-            raise HTTPException(status_code=400, detail="Order must have at least one order item.")
+    # Every problem with the order is reported at once, as a structured 422;
+    # the order is validated and priced with the same rates
+    rates = exchange_rate_service.snapshot
+    with STAGE_SECONDS.time("validation"):
+        errors = order_errors(order_data, product_catalog.prices, rates.rates)
+    if errors:
+        return JSONResponse(status_code=422, content={"detail": errors})
 
-        # Create order in database
+    try:
+        # Create order and its items in database; the relationship cascade
+        # inserts the items in the same flush and keeps them loaded
         db_order = OrderTable(
             customer_name=order_data.customer_name,
-            currency=order_data.currency
+            currency=order_data.currency,
+            exchange_rate_version=rates.version,
+            order_items=[
+                OrderItemTable(product_name=item_data.product_name, quantity=item_data.quantity)
+                for item_data in order_data.order_items
+            ]
         )
+        # Freeze unit prices and totals at order time
+        price_order(db_order, product_catalog.prices, rates.rates)
         session.add(db_order)
-        session.flush()  # Flush to get the order ID
-
-        # Create order items
-        for item_data in order_data.order_items:
-            db_order_item = OrderItemTable(
-                product_name=item_data.product_name,
-                quantity=item_data.quantity,
-                order_id=db_order.id
-            )
-            session.add(db_order_item)
+        if REPORTS_SUMMARY_TABLES:
+            await record_sales(session, [sale_from_order(db_order)])
+        if idempotency_key is None:
+            with STAGE_SECONDS.time("commit"):
+                await session.commit()
+            # Use utility function to generate confirmation HTML
+            html = generate_order_confirmation(db_order)
+        else:
+            # The key is inserted with the order, so of concurrent retries only one commits
+            with STAGE_SECONDS.time("flush"):
+                await session.flush()
+            html = render_confirmation(db_order, *order_line_prices(db_order))
+            stored = await idempotency_store.record(session, idempotency_key, request_hash, db_order.id, html)
+            try:
+                with STAGE_SECONDS.time("commit"):
+                    await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                stored = await idempotency_store.get(session, idempotency_key)
+                if stored is None:
+                    raise
+                return replay_response(idempotency_key, stored, request_hash)
+            idempotency_store.remember(idempotency_key, stored)
+            confirmation_cache.put(db_order.id, html)
 
-        session.commit()
-        session.refresh(db_order)
+        # Orders do not change once created; cache the read payload right away
+        await order_cache.put(db_order.id, dumps(OrderRead.model_validate(db_order).model_dump()))
 
-        # Use utility function to generate confirmation HTML
-        return HTMLResponse(content=generate_order_confirmation(db_order))
+        return HTMLResponse(content=html)
 
     except HTTPException as http_exc:
-        session.rollback()
+        await session.rollback()
         # Use utility function to generate error HTML
         return generate_error_response(http_exc.detail)
 
     except Exception as exc:
-        session.rollback()
+        await session.rollback()
         # Use utility function to generate error HTML
         return generate_error_response(f"An unexpected error occurred: {str(exc)}")
 
+@app.post("/orders/batch", dependencies=CATALOG_LOADED)
+async def create_orders_batch(batch: OrderBatchCreate, session: AsyncSession = Depends(get_async_session)):
+    """
+    Endpoint to create many orders in one request.
+    Every order is validated up front; the valid ones are inserted in a single
+    transaction with multi-row INSERT statements. Invalid orders are reported
+    individually and do not prevent the others from being created.
+    
+    Args:
+        batch (OrderBatchCreate): The orders to create.
+        session (AsyncSession): Database session.
+    
+    Returns:
+        JSONResponse: Counts and one result per submitted order, in order.
+    """
+    if len(batch.orders) > ORDER_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"A batch cannot contain more than {ORDER_BATCH_MAX} orders.")
+    
+    results = [None] * len(batch.orders)
+    valid_orders = []
+    rates = exchange_rate_service.snapshot
+    with STAGE_SECONDS.time("validation"):
+        batch_errors = validate_orders(batch.orders, product_catalog.prices, rates.rates)
+    for index, (order_data, errors) in enumerate(zip(batch.orders, batch_errors)):
+        if errors:
+            results[index] = {"index": index, "status": "error", "error": " ".join(error["msg"] for error in errors), "errors": errors}
+        else:
+            valid_orders.append((index, order_data))
+    
+    if valid_orders:
+        created_at = datetime.utcnow()
+        prices = product_catalog.prices
+        # Freeze unit prices and totals at order time, with one catalog and rate version for the batch
+        priced = [
+            price_lines(((item.product_name, item.quantity) for item in order_data.order_items), order_data.currency, prices, rates.rates)
+            for _, order_data in valid_orders
+        ]
+        try:
+            # One multi-row INSERT ... RETURNING for the orders, in submission order
+            order_rows = (await session.exec(
+                insert(OrderTable).returning(OrderTable.id, sort_by_parameter_order=True),
+                params=[
+                    {
+                        "customer_name": order_data.customer_name,
+                        "currency": order_data.currency,
+                        "exchange_rate_version": rates.version,
+                        "order_total": order_total,
+                        "created_at": created_at
+                    }
+                    for (_, order_data), (_, order_total) in zip(valid_orders, priced)
+                ]
+            )).all()
+            
+            # One multi-row INSERT for all of their items
+            await session.exec(
+                insert(OrderItemTable),
+                params=[
+                    {
+                        "product_name": item.product_name,
+                        "quantity": item.quantity,
+                        "unit_price": unit_price,
+                        "line_total": line_total,
+                        "order_id": row.id
+                    }
+                    for (_, order_data), (line_prices, _), row in zip(valid_orders, priced, order_rows)
+                    for item, (unit_price, line_total) in zip(order_data.order_items, line_prices)
+                ]
+            )
+            if REPORTS_SUMMARY_TABLES:
+                await record_sales(session, [
+                    OrderSale(
+                        created_at, order_data.currency, order_data.customer_name, order_total,
+                        [
+                            (item.product_name, item.quantity, line_total)
+                            for item, (_, line_total) in zip(order_data.order_items, line_prices)
+                        ]
+                    )
+                    for (_, order_data), (line_prices, order_total) in zip(valid_orders, priced)
+                ])
+            with STAGE_SECONDS.time("batch_commit"):
+                await session.commit()
+        except Exception as exc:
+            await session.rollback()
+            for index, _ in valid_orders:
+                results[index] = {"index": index, "status": "error", "error": f"An unexpected error occurred: {str(exc)}"}
+        else:
+            for (index, _), row in zip(valid_orders, order_rows):
+                results[index] = {"index": index, "status": "created", "order_id": row.id}
+    
+    created = sum(1 for result in results if result["status"] == "created")
+    return JSONResponse(content={
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    })
+
 @app.get("/orders", response_model=List[OrderRead])
-async def get_orders(session: Session = Depends(get_session)):
+async def get_orders(
+    limit: int = Query(ORDERS_PAGE_DEFAULT, ge=1, le=ORDERS_PAGE_MAX, description="Maximum number of orders per page"),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    stream: bool = Query(False, description="Stream all remaining orders as NDJSON, fetched in pages of `limit`"),
+    customer: Optional[str] = Query(None, min_length=1, max_length=100, description="Customer name prefix, case-insensitive"),
+    search: Optional[str] = Query(None, min_length=3, max_length=100, description="Fuzzy customer name search"),
+    product: Optional[str] = Query(None, description="Only orders containing this product"),
+    currency: Optional[str] = Query(None, description="Only orders in this currency"),
+    created_from: Optional[datetime] = Query(None, description="Orders created at or after this time (UTC)"),
+    created_to: Optional[datetime] = Query(None, description="Orders created before this time (UTC)"),
+    session: AsyncSession = Depends(get_async_read_session)
+):
     """
-    Endpoint to retrieve all orders from the database.
+    Endpoint to retrieve orders from the database, oldest first.
+    Results are keyset-paginated on (created_at, id); the cursor for the
+    next page is returned in the X-Next-Cursor header. Filters are applied
+    in SQL and must be repeated with the cursor.
     
     Args:
-        session (Session): Database session.
+        limit (int): Maximum number of orders to return.
+        after (Optional[str]): Cursor of the last order already seen.
+        stream (bool): Whether to stream every remaining order as NDJSON.
+        customer (Optional[str]): Customer name prefix.
+        search (Optional[str]): Fuzzy customer name search.
+        product (Optional[str]): Product the orders must contain.
+        currency (Optional[str]): Order currency.
+        created_from (Optional[datetime]): Start of the created_at range.
+        created_to (Optional[datetime]): End of the created_at range, exclusive.
+        session (AsyncSession): Read-only database session.
     
     Returns:
-        List[OrderRead]: List of all orders with their items.
+        List[OrderRead]: One page of orders with their items.
     """
-    statement = select(OrderTable)
-    orders = session.exec(statement).all()
-    return orders
+    position = decode_order_cursor(after) if after else None
+    filters = order_filter_clauses(
+        session.bind.dialect.name,
+        customer=customer,
+        search=search,
+        product=product,
+        currency=currency,
+        created_from=created_from,
+        created_to=created_to
+    )
+
+    if stream:
+        return StreamingResponse(
+            stream_orders_ndjson(limit, position, filters),
+            media_type="application/x-ndjson"
+        )
+
+    orders = await fetch_order_rows(session, order_rows_page_statement(limit, position, filters))
+    headers = {}
+    if len(orders) == limit:
+        headers["X-Next-Cursor"] = encode_order_cursor(orders[-1]["created_at"], orders[-1]["id"])
+    return FastJSONResponse(orders, headers=headers)
+
+async def stream_orders_export(format: str, created_from: Optional[datetime], created_to: Optional[datetime]) -> AsyncIterator[bytes]:
+    """
+    Stream the flat order line export from a server-side cursor.
+
+    Args:
+        format (str): csv or parquet.
+        created_from (Optional[datetime]): Start of the created_at range.
+        created_to (Optional[datetime]): End of the created_at range, exclusive.
+
+    Yields:
+        bytes: Consecutive pieces of the file.
+    """
+    # The cursor outlives the request-scoped session, so the generator owns its own
+    async with AsyncSession(async_read_engine) as session:
+        batches = iter_export_rows(session, export_statement(created_from, created_to))
+        encode = parquet_chunks if format == "parquet" else csv_chunks
+        async for chunk in encode(batches):
+            yield chunk
+
+@app.get("/orders/export")
+async def export_orders(
+    format: str = Query("csv", description="csv or parquet"),
+    created_from: Optional[datetime] = Query(None, alias="from", description="Orders created at or after this time (UTC)"),
+    created_to: Optional[datetime] = Query(None, alias="to", description="Orders created before this time (UTC)")
+):
+    """
+    Endpoint to export orders and their line items as one flat table,
+    one row per line item, oldest order first. The file is streamed while
+    it is read from the database, so memory stays constant whatever the
+    size of the range.
+
+    Args:
+        format (str): csv or parquet.
+        created_from (Optional[datetime]): Start of the created_at range.
+        created_to (Optional[datetime]): End of the created_at range, exclusive.
+
+    Returns:
+        StreamingResponse: The CSV or Parquet file.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Format must be 'csv' or 'parquet'.")
+    if created_from and created_to and created_from >= created_to:
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'.")
+
+    media_type = "application/vnd.apache.parquet" if format == "parquet" else "text/csv; charset=utf-8"
+    return StreamingResponse(
+        stream_orders_export(format, created_from, created_to),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="orders.{format}"'}
+    )
 
 @app.get("/orders/{order_id}", response_model=OrderRead)
-async def get_order(order_id: int, session: Session = Depends(get_session)):
+async def get_order(
+    order_id: int,
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_async_read_session)
+):
     """
-    Endpoint to retrieve a specific order from the database.
+    Endpoint to retrieve a specific order.
+    Served from the order cache when possible; a matching If-None-Match
+    returns 304.
     
     Args:
         order_id (int): The ID of the order to retrieve.
-        session (Session): Database session.
+        if_none_match (Optional[str]): ETag(s) the client already holds.
+        session (AsyncSession): Read-only database session, only used on a cache miss.
     
     Returns:
-        OrderRead: The requested order with its items.
+        OrderRead: The requested order with its items, or 304 Not Modified.
     """
-    order = session.get(OrderTable, order_id)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    payload = await get_order_payload(session, order_id)
+    headers = {"ETag": payload.etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and etag_matches(if_none_match, payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+# Gauges read when /metrics is scraped
+REGISTRY.gauge(
+    "cache_hit_ratio", "Share of lookups served from cache in this worker",
+    lambda: {
+        ("order",): order_cache.metrics()["hit_ratio"],
+        ("confirmation",): confirmation_cache.hit_ratio(),
+        ("pdf",): pdf_cache.hit_ratio(),
+    },
+    ("cache",)
+)
+REGISTRY.gauge(
+    "executor_queue_depth", "Tasks waiting for a worker in each blocking-work pool",
+    lambda: {(name,): depth for name, depth in queue_depths().items()},
+    ("pool",)
+)
+REGISTRY.gauge(
+    "db_pool_checked_out", "Database connections in use per pool",
+    lambda: {(name,): status["checked_out"] for name, status in pool_metrics().items()},
+    ("pool",)
+)
+REGISTRY.gauge("email_jobs_in_flight", "Email jobs being delivered by this worker", lambda: email_outbox.in_flight)
+WORKER_COLD_START = REGISTRY.gauge("worker_cold_start_seconds", "Seconds from worker process start until it was ready to serve")
+EMAIL_BACKLOG = REGISTRY.gauge("email_jobs_pending", "Email jobs waiting in the outbox, across all workers")
+
+# Endpoint for Prometheus
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Expose this worker's metrics in the Prometheus text format: request
+    latency per route, hot stage timings, cache hit ratios and queue depths.
+
+    Returns:
+        PlainTextResponse: The metrics exposition.
+    """
+    try:
+        EMAIL_BACKLOG.set(await email_outbox.backlog())
+    except Exception as e:
+        print(f"[METRICS] Reading the email backlog failed: {str(e)}")
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Endpoint to report connection pool usage
+@app.get("/metrics/pool")
+async def get_pool_metrics():
+    """
+    Return connection pool usage for every database engine.
+
+    Returns:
+        JSONResponse: Per-pool size, checked out connections, overflow and checkout wait times.
+    """
+    return JSONResponse(content=pool_metrics())
+
+# Sales reports, aggregated in the database
+def validate_report_range(from_date: Optional[date], to_date: Optional[date]):
+    """Reject report ranges that end before they start"""
+    if from_date and to_date and from_date >= to_date:
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'.")
+
+@app.get("/reports/sales/products")
+async def sales_by_product(
+    from_date: Optional[date] = Query(None, alias="from", description="First day included (UTC)"),
+    to_date: Optional[date] = Query(None, alias="to", description="First day excluded (UTC)"),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """
+    Quantity sold and revenue per product and order currency, highest revenue first.
+
+    Args:
+        from_date (Optional[date]): First day included.
+        to_date (Optional[date]): First day excluded.
+        session (AsyncSession): Read-only database session.
+
+    Returns:
+        JSONResponse: One row per product and currency.
+    """
+    validate_report_range(from_date, to_date)
+    return JSONResponse(content=await run_report(session, products_statement(from_date, to_date, REPORTS_SUMMARY_TABLES)))
+
+@app.get("/reports/sales/currencies")
+async def sales_by_currency(
+    from_date: Optional[date] = Query(None, alias="from", description="First day included (UTC)"),
+    to_date: Optional[date] = Query(None, alias="to", description="First day excluded (UTC)"),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """
+    Order count and revenue per order currency.
+
+    Args:
+        from_date (Optional[date]): First day included.
+        to_date (Optional[date]): First day excluded.
+        session (AsyncSession): Read-only database session.
+
+    Returns:
+        JSONResponse: One row per currency.
+    """
+    validate_report_range(from_date, to_date)
+    return JSONResponse(content=await run_report(session, currencies_statement(from_date, to_date, REPORTS_SUMMARY_TABLES)))
+
+@app.get("/reports/sales/periods")
+async def sales_by_period(
+    period: str = Query("day", pattern="^(day|week|month)$", description="day, week (starting Monday) or month"),
+    from_date: Optional[date] = Query(None, alias="from", description="First day included (UTC)"),
+    to_date: Optional[date] = Query(None, alias="to", description="First day excluded (UTC)"),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """
+    Order count and revenue per day, week or month and order currency, oldest first.
+
+    Args:
+        period (str): The bucket size.
+        from_date (Optional[date]): First day included.
+        to_date (Optional[date]): First day excluded.
+        session (AsyncSession): Read-only database session.
+
+    Returns:
+        JSONResponse: One row per period and currency; `period` is its first day.
+    """
+    validate_report_range(from_date, to_date)
+    statement = periods_statement(period, session.bind.dialect.name, from_date, to_date, REPORTS_SUMMARY_TABLES)
+    return JSONResponse(content=await run_report(session, statement))
+
+@app.get("/reports/sales/customers")
+async def top_customers(
+    limit: int = Query(10, ge=1, le=100, description="Number of customers"),
+    from_date: Optional[date] = Query(None, alias="from", description="First day included (UTC)"),
+    to_date: Optional[date] = Query(None, alias="to", description="First day excluded (UTC)"),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """
+    Customers with the highest revenue, per order currency.
+
+    Args:
+        limit (int): Number of customers.
+        from_date (Optional[date]): First day included.
+        to_date (Optional[date]): First day excluded.
+        session (AsyncSession): Read-only database session.
+
+    Returns:
+        JSONResponse: One row per customer and currency, highest revenue first.
+    """
+    validate_report_range(from_date, to_date)
+    return JSONResponse(content=await run_report(session, customers_statement(limit, from_date, to_date, REPORTS_SUMMARY_TABLES)))
+
+# Endpoint to report order cache usage
+@app.get("/metrics/order-cache")
+async def get_order_cache_metrics():
+    """
+    Return this worker's order cache counters.
+
+    Returns:
+        JSONResponse: Entries, hits, misses, hit ratio, evictions and shared backend stats.
+    """
+    return JSONResponse(content=order_cache.metrics())
 
 # Endpoint to fetch exchange rates
 @app.get("/api/exchange-rates")
-async def get_exchange_rates():
+async def get_exchange_rates(if_none_match: Optional[str] = Header(None)):
     """
-    Return hardcoded exchange rates with CAD as the base currency.
+    Return the current exchange rates with CAD as the base currency.
+    The rate version is the ETag and is recorded on every order priced with it.
+
+    Args:
+        if_none_match (Optional[str]): ETag(s) the client already holds.
 
     Returns:
-        JSONResponse: A dictionary of hardcoded exchange rates.
+        Response: A JSON object of currencies and their rates, or 304 Not Modified.
     """
-    hardcoded_rates = {
-        "CAD": 1.0,
-        "USD": 0.75,
-        "EUR": 0.68,
-        "GBP": 0.59
-    }
-    return JSONResponse(content=hardcoded_rates)
+    snapshot = exchange_rate_service.snapshot
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if if_none_match and etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.json_body, media_type="application/json", headers=headers)
 
-# Endpoint to fetch predefined products
-@app.get("/api/products")
-async def get_products():
+# Endpoint to fetch the product catalog
+@app.get("/api/products", dependencies=CATALOG_LOADED)
+async def get_products(if_none_match: Optional[str] = Header(None)):
     """
-    Return predefined products with their prices in CAD.
+    Return the products with their prices in CAD.
+    The body is serialized once per catalog version; a matching
+    If-None-Match returns 304.
+
+    Args:
+        if_none_match (Optional[str]): ETag(s) the client already holds.
 
     Returns:
-        JSONResponse: A dictionary of predefined products and their prices.
+        Response: A JSON object of products and their prices, or 304 Not Modified.
     """
-    return JSONResponse(content=PREDEFINED_PRODUCTS)
+    snapshot = product_catalog.snapshot
+    headers = {"ETag": snapshot.etag, "Cache-Control": f"public, max-age={PRODUCTS_MAX_AGE_SECONDS}"}
+    if if_none_match and etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.json_body, media_type="application/json", headers=headers)
+
+@app.put("/api/products/{product_name}", dependencies=CATALOG_LOADED)
+async def put_product(
+    product_name: str,
+    product: ProductUpdate,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Add a product or change its price. Other workers pick up the new
+    catalog version within CATALOG_REFRESH_SECONDS.
+
+    Args:
+        product_name (str): The product name.
+        product (ProductUpdate): The new price in CAD.
+        session (AsyncSession): Database session.
+
+    Returns:
+        JSONResponse: The stored product and the new catalog version.
+    """
+    if not product_name.strip():
+        raise HTTPException(status_code=400, detail="Product name cannot be empty or whitespace.")
+    stored = await product_catalog.upsert(session, product_name, product.price)
+    return JSONResponse(content={
+        "name": stored.name,
+        "price": float(stored.price),
+        "version": product_catalog.snapshot.version,
+    })
 
 # PDF and Email endpoints
-@app.get("/orders/{order_id}/pdf")
+@app.get("/orders/{order_id}/pdf", dependencies=CATALOG_LOADED)
 async def download_order_pdf(
     order_id: int, 
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session)
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Generate and download PDF for a specific order.
+    Download the PDF for a specific order.
+    Rendered PDFs are cached by content; a matching If-None-Match
+    returns 304 without rendering.
     
     Args:
         order_id (int): The ID of the order.
-        background_tasks (BackgroundTasks): Background tasks for cleanup.
-        session (Session): Database session.
+        if_none_match (Optional[str]): ETag(s) the client already holds.
+        session (AsyncSession): Database session.
         
     Returns:
-        FileResponse: PDF file download.
+        StreamingResponse: PDF file download, or 304 Not Modified.
     """
     # Get order from database
-    order = session.get(OrderTable, order_id)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
+    order = await get_order_or_404(session, order_id)
+    
+    cache_key = order_pdf_cache_key(order)
+    headers = {"ETag": f'"{cache_key}"', "Cache-Control": "private, no-cache"}
+    if if_none_match and etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
     
     try:
-        # Generate PDF
-        pdf_path = generate_order_pdf(order)
-        
-        # Schedule cleanup of the temporary file after response is sent
-        background_tasks.add_task(cleanup_pdf_file, pdf_path)
-        
-        # Return file response
-        return FileResponse(
-            path=pdf_path,
-            filename=f"order_confirmation_{order_id}.pdf",
-            media_type="application/pdf"
-        )
-        
+        pdf_bytes = await get_order_pdf_bytes(order)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {str(e)}")
+    
+    headers["Content-Disposition"] = f'attachment; filename="order_confirmation_{order_id}.pdf"'
+    headers["Content-Length"] = str(len(pdf_bytes))
+    return StreamingResponse(iter_pdf_chunks(pdf_bytes), media_type="application/pdf", headers=headers)
 
-@app.post("/orders/{order_id}/email")
+@app.post("/orders/pdf/bulk", dependencies=CATALOG_LOADED)
+async def download_bulk_order_pdfs(
+    request: BulkPdfRequest,
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """
+    Export the PDF confirmations of many orders in one download.
+    Orders are selected by ID list or by created_at range and returned as a
+    ZIP archive (format=zip) or a single multi-page PDF (format=pdf).
+    
+    Args:
+        request (BulkPdfRequest): The order selection and output format.
+        session (AsyncSession): Database session.
+        
+    Returns:
+        StreamingResponse: The archive or document, streamed as it is rendered.
+    """
+    if request.format not in ("zip", "pdf"):
+        raise HTTPException(status_code=400, detail="Format must be 'zip' or 'pdf'.")
+    has_range = request.created_from is not None or request.created_to is not None
+    if bool(request.order_ids) == has_range:
+        raise HTTPException(status_code=400, detail="Provide either order_ids or a created_from/created_to range.")
+    if request.order_ids and len(request.order_ids) > BULK_PDF_MAX_ORDER_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A bulk export can list at most {BULK_PDF_MAX_ORDER_IDS} order IDs; use a created_from/created_to range for larger exports."
+        )
+    
+    # Validate the selection up front; errors can't be reported once streaming starts
+    if request.order_ids:
+        order_ids = set(request.order_ids)
+        found = set()
+        id_list = sorted(order_ids)
+        for offset in range(0, len(id_list), 1000):
+            chunk = id_list[offset:offset + 1000]
+            found.update((await session.exec(select(OrderTable.id).where(OrderTable.id.in_(chunk)))).all())
+        missing = sorted(order_ids - found)
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Orders not found: {missing[:20]}")
+        order_count = len(order_ids)
+    else:
+        order_count = (await session.exec(
+            select(func.count()).select_from(OrderTable).where(bulk_range_clause(request))
+        )).one()
+        if not order_count:
+            raise HTTPException(status_code=404, detail="No orders found in the requested range")
+    
+    if request.format == "pdf":
+        if order_count > BULK_PDF_MAX_COMBINED_ORDERS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"A combined PDF is limited to {BULK_PDF_MAX_COMBINED_ORDERS} orders; use format=zip for larger exports."
+            )
+        return StreamingResponse(
+            stream_bulk_combined_pdf(request),
+            media_type="application/pdf",
+            headers={"Content-Disposition": 'attachment; filename="order_confirmations.pdf"'}
+        )
+    
+    return StreamingResponse(
+        stream_bulk_zip(request),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="order_confirmations.zip"'}
+    )
+
+@app.post("/orders/{order_id}/email", status_code=202, dependencies=CATALOG_LOADED)
 async def email_order_confirmation(
     order_id: int, 
     email: str = Query(..., description="Email address to send the confirmation to"),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Email order confirmation with PDF attachment.
+    Queue an order confirmation email with PDF attachment.
+    The email is delivered by the outbox workers; poll
+    GET /email-jobs/{job_id} for its status.
     
     Args:
         order_id (int): The ID of the order.
         email (str): Email address to send to.
-        session (Session): Database session.
+        session (AsyncSession): Database session.
         
     Returns:
-        JSONResponse: Success or error message.
+        JSONResponse: The queued job id and status.
     """
     # Validate email format
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, email):
+    if EMAIL_PATTERN.fullmatch(email) is None:
         raise HTTPException(status_code=400, detail="Invalid email address format")
     
-    # Get order from database
-    order = session.get(OrderTable, order_id)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
+    # Make sure the order exists before queueing
+    await get_order_payload(session, order_id)
     
-    try:
-        # Generate PDF
-        pdf_path = generate_order_pdf(order)
-        
-        # Send email
-        email_sent = send_order_email(order, pdf_path, email)
-        
-        # Clean up PDF file
-        if os.path.exists(pdf_path):
-            os.unlink(pdf_path)
-        
-        if email_sent:
-            return JSONResponse(
-                content={
-                    "message": f"📧 Email simulation successful! In a real implementation, order confirmation would be sent to {email}",
-                    "simulation": True,
-                    "order_id": order_id,
-                    "email": email,
-                    "note": "This is a demonstration mode. No actual email was sent."
-                }
-            )
-        else:
-            raise HTTPException(
-                status_code=500, 
-                detail="Failed to send email. Please check email configuration."
-            )
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        # Clean up PDF file in case of error
-        if 'pdf_path' in locals() and os.path.exists(pdf_path):
-            os.unlink(pdf_path)
-        raise HTTPException(status_code=500, detail=f"Failed to process request: {str(e)}")
\ No newline at end of file
+    job = await email_outbox.enqueue(session, order_id, email)
+    
+    import order_email
+    return JSONResponse(
+        status_code=202,
+        content={
+            "message": f"📧 Order confirmation queued for {email}",
+            "job_id": job.id,
+            "status": job.status,
+            "simulation": not order_email.SMTP_HOST,
+            "order_id": order_id,
+            "email": email,
+        }
+    )
+
+@app.get("/email-jobs/{job_id}", response_model=EmailJobRead)
+async def get_email_job(job_id: int, session: AsyncSession = Depends(get_async_session)):
+    """
+    Endpoint to report the delivery status of a queued email.
+    
+    Args:
+        job_id (int): The ID of the email job.
+        session (AsyncSession): Database session.
+    
+    Returns:
+        EmailJobRead: The job with its status, attempts and last error.
+    """
+    job = await session.get(EmailJobTable, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Email job not found")
+    return job
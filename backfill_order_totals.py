@@ -0,0 +1,79 @@
+"""
+Backfill unit prices, line totals and order totals for orders created before
+they were stored (migration 0005).
+
+The prices in effect when those orders were placed were never recorded, so
+they are priced with the current catalog and exchange rates, exactly as the
+confirmation and PDF rendered them until now. Orders are processed in id
+order, one transaction per batch, and the job can be stopped and rerun.
+
+Usage:
+    python backfill_order_totals.py [--batch-size 1000]
+"""
+import argparse
+from typing import Mapping, Optional
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from catalog import ProductCatalog
+from database import engine, run_migrations
+from models import OrderTable
+from pricing import price_order
+from rates import ExchangeRateService
+
+def backfill_order_totals(
+    batch_size: int = 1000,
+    prices: Optional[Mapping[str, float]] = None,
+    rates: Optional[Mapping[str, float]] = None
+) -> int:
+    """
+    Price every order that has no stored total.
+
+    Args:
+        batch_size (int): Orders updated per transaction.
+        prices (Optional[Mapping[str, float]]): Product prices in CAD; defaults to the catalog.
+        rates (Optional[Mapping[str, float]]): Exchange rates from CAD; defaults to the configured rates.
+
+    Returns:
+        int: Number of orders updated.
+    """
+    if prices is None:
+        catalog = ProductCatalog()
+        catalog.load()
+        prices = catalog.prices
+    if rates is None:
+        rates = ExchangeRateService().rates
+
+    updated = 0
+    last_id = 0
+    while True:
+        with Session(engine) as session:
+            orders = session.exec(
+                select(OrderTable)
+                .where(OrderTable.order_total.is_(None), OrderTable.id > last_id)
+                .order_by(OrderTable.id)
+                .limit(batch_size)
+                .options(selectinload(OrderTable.order_items))
+            ).all()
+            if not orders:
+                return updated
+            for order in orders:
+                price_order(order, prices, rates)
+                session.add(order)
+            session.commit()
+            last_id = orders[-1].id
+            updated += len(orders)
+        print(f"[BACKFILL] Priced {updated} orders (up to id {last_id})")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    run_migrations()
+    updated = backfill_order_totals(args.batch_size)
+    print(f"[BACKFILL] Done, {updated} orders updated")
+
+if __name__ == "__main__":
+    main()
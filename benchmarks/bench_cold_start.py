@@ -0,0 +1,120 @@
+"""
+Benchmark: worker cold start, from process start to ready to serve.
+
+    spawned  a fresh interpreter imports the app and runs its startup, as
+             every worker did under `uvicorn app:app --workers N`
+    forked   the worker is forked from a parent that already imported and
+             warmed up the app, as server.py does
+
+Both variants skip the migrations, which server.py runs once before
+forking. Also reports how long `import app` takes in a fresh interpreter,
+with the slowest modules; with --import-budget it exits with status 1 when
+the median exceeds the budget. Uses DATABASE_URL, a throwaway SQLite
+database when it is not set.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 5] [--import-budget 2.0]
+"""
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/cold_start.db"
+import argparse
+import asyncio
+import statistics
+import subprocess
+import time
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Run in a fresh interpreter: import the app, run its startup, print the seconds until ready
+SPAWNED_WORKER = """
+import asyncio, sys, time
+started = float(sys.argv[1])
+import app
+async def start():
+    async with app.app.router.lifespan_context(app.app):
+        print("READY", time.time() - started)
+asyncio.run(start())
+"""
+
+def import_times(module: str) -> dict:
+    """Self and cumulative microseconds per module, from `python -X importtime`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+def report(times: dict, count: int = 15) -> str:
+    slowest = sorted(times.items(), key=lambda entry: entry[1][1], reverse=True)[:count]
+    lines = [f"  {'cumulative ms':>14} {'self ms':>9}  module"]
+    lines.extend(f"  {cumulative / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}" for name, (self_us, cumulative) in slowest)
+    return "\n".join(lines)
+
+def spawned_cold_start() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", SPAWNED_WORKER, str(time.time())],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return float(next(line for line in output.splitlines() if line.startswith("READY")).split()[1])
+
+def forked_cold_start(application) -> float:
+    read_end, write_end = os.pipe()
+    started = time.time()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+
+        async def start():
+            async with application.app.router.lifespan_context(application.app):
+                os.write(write_end, str(time.time() - started).encode())
+
+        try:
+            asyncio.run(start())
+        finally:
+            os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end) as result:
+        elapsed = float(result.read())
+    os.waitpid(pid, 0)
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, help="Fail when the median `import app` time exceeds this many seconds")
+    args = parser.parse_args()
+
+    from database import engine, run_migrations
+    run_migrations()
+    os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+    spawned = [spawned_cold_start() for _ in range(args.runs)]
+
+    import app as application
+    application.warm_up()
+    engine.dispose()
+    forked = [forked_cold_start(application) for _ in range(args.runs)]
+
+    print(f"Worker cold start, median of {args.runs} runs")
+    print(f"  spawned  {statistics.median(spawned) * 1000:8.1f} ms")
+    print(f"  forked   {statistics.median(forked) * 1000:8.1f} ms")
+
+    runs = [import_times("app") for _ in range(args.runs)]
+    import_seconds = statistics.median(times["app"][1] for times in runs) / 1e6
+    print(f"`import app`, median of {args.runs} runs: {import_seconds * 1000:.1f} ms")
+    print(report(runs[-1]))
+    if args.import_budget is not None and import_seconds > args.import_budget:
+        print(f"`import app` took {import_seconds:.2f} s, budget {args.import_budget} s")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
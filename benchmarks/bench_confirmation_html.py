@@ -0,0 +1,97 @@
+"""
+Micro-benchmark: confirmation page render time with the precompiled Jinja
+template, with and without the rendered-page cache, versus concatenating
+f-strings per item (the old behaviour).
+
+Usage:
+    python benchmarks/bench_confirmation_html.py [--orders 500] [--items 100]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import statistics
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from app import confirmation_cache, generate_order_confirmation, order_line_prices
+from confirmation import render_confirmation
+from models import OrderTable, OrderItemTable
+
+PRODUCTS = ["Laptop", "Mouse", "Keyboard", "Monitor", "Headphones"]
+
+def make_order(order_id: int, item_count: int) -> OrderTable:
+    order = OrderTable(id=order_id, customer_name="Benchmark Customer", currency="USD", created_at=datetime(2025, 1, 1))
+    order.order_items = [
+        OrderItemTable(
+            id=index,
+            product_name=f"{PRODUCTS[index % len(PRODUCTS)]} {index}",
+            quantity=index + 1,
+            unit_price=Decimal("18.75"),
+            line_total=Decimal("18.75") * (index + 1),
+            order_id=order_id
+        )
+        for index in range(item_count)
+    ]
+    order.order_total = sum(item.line_total for item in order.order_items)
+    return order
+
+def concatenated_confirmation(order: OrderTable) -> str:
+    """The previous implementation: one f-string per item appended with +="""
+    line_prices, total_order_amount = order_line_prices(order)
+    order_items_html = ""
+    for item, (unit_price, line_total) in zip(order.order_items, line_prices):
+        order_items_html += f"""
+        <tr>
+            <td>{item.product_name}</td>
+            <td>{item.quantity}</td>
+            <td>{unit_price:.2f} {order.currency}</td>
+            <td>{line_total:.2f} {order.currency}</td>
+        </tr>
+        """
+    return f"""
+    <div class='order-confirmation-container'>
+        <h1>Order Confirmation</h1>
+        <p><strong>Order ID:</strong> {order.id}</p>
+        <p><strong>Customer Name:</strong> {order.customer_name}</p>
+        <table><tbody>{order_items_html}</tbody></table>
+        <p>{total_order_amount:.2f} {order.currency}</p>
+    </div>
+    """
+
+def templated_confirmation(order: OrderTable) -> str:
+    return render_confirmation(order, *order_line_prices(order))
+
+def time_renders(render, orders):
+    timings = []
+    for order in orders:
+        started = time.perf_counter()
+        render(order)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--items", type=int, default=100)
+    args = parser.parse_args()
+
+    orders = [make_order(order_id, args.items) for order_id in range(1, args.orders + 1)]
+    confirmation_cache.max_entries = len(orders)
+    time_renders(templated_confirmation, orders[:5])
+
+    results = [
+        ("f-string concat", time_renders(concatenated_confirmation, orders)),
+        ("jinja template", time_renders(templated_confirmation, orders)),
+    ]
+    confirmation_cache.clear()
+    results.append(("cache, first render", time_renders(generate_order_confirmation, orders)))
+    results.append(("cache, hit", time_renders(generate_order_confirmation, orders)))
+
+    print(f"{args.orders} orders x {args.items} items")
+    for label, timings in results:
+        print(f"  {label:<20} mean {statistics.mean(timings) * 1000:7.3f} ms   median {statistics.median(timings) * 1000:7.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Load test for the order API.
+
+Seeds N orders through POST /orders/batch, then drives each scenario with
+a fixed number of requests at the given concurrency:
+
+    create_order   POST /order
+    list_orders    GET /orders?limit=50
+    get_order      GET /orders/{id}
+    order_pdf      GET /orders/{id}/pdf
+    order_email    POST /orders/{id}/email
+
+and reports throughput and p50/p95/p99 latency per scenario. Results are
+written as JSON; with --baseline they are compared to an earlier run and
+the script exits with status 1 when a scenario regressed by more than
+--threshold.
+
+Without --base-url the app runs in-process against DATABASE_URL, a
+throwaway SQLite database when it is not set. Point --base-url at a
+running server (e.g. one using PostgreSQL) to include the network and
+the server's workers.
+
+Usage:
+    python benchmarks/bench_load.py [--orders 1000] [--requests 200] [--concurrency 20]
+        [--scenarios create_order,get_order] [--base-url http://localhost:8000]
+        [--output load_test_results.json] [--baseline baseline.json] [--threshold 0.2] [--save-baseline]
+"""
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import string
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+SCENARIOS = ("create_order", "list_orders", "get_order", "order_pdf", "order_email")
+SEED_BATCH_SIZE = 1000
+CURRENCIES = ("CAD", "USD", "EUR", "GBP")
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    """
+    Throughput and latency statistics of one scenario.
+
+    Args:
+        latencies (List[float]): Seconds per request, successful or not.
+        errors (int): Requests that failed or got an unexpected status.
+        elapsed (float): Wall-clock seconds for the whole scenario.
+
+    Returns:
+        Dict[str, float]: Request count, errors, requests per second and latencies in milliseconds.
+    """
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+def random_order(rng: random.Random, products: List[str]) -> dict:
+    name = "Load " + "".join(rng.choices(string.ascii_letters, k=10))
+    items = rng.sample(products, rng.randint(1, min(5, len(products))))
+    return {
+        "customer_name": name,
+        "currency": rng.choice(CURRENCIES),
+        "order_items": [{"product_name": product, "quantity": rng.randint(1, 10)} for product in items],
+    }
+
+async def seed_orders(client: httpx.AsyncClient, count: int, products: List[str], rng: random.Random) -> List[int]:
+    """
+    Create orders through the batch endpoint.
+
+    Returns:
+        List[int]: The ids of the created orders.
+    """
+    order_ids = []
+    while len(order_ids) < count:
+        size = min(SEED_BATCH_SIZE, count - len(order_ids))
+        response = await client.post("/orders/batch", json={"orders": [random_order(rng, products) for _ in range(size)]})
+        response.raise_for_status()
+        created = [result["order_id"] for result in response.json()["results"] if result["status"] == "created"]
+        if not created:
+            raise RuntimeError(f"Seeding failed: {response.json()['results'][0]}")
+        order_ids.extend(created)
+    return order_ids
+
+async def send_request(client: httpx.AsyncClient, scenario: str, order_ids: List[int], products: List[str], rng: random.Random) -> httpx.Response:
+    if scenario == "create_order":
+        return await client.post("/order", json=random_order(rng, products))
+    if scenario == "list_orders":
+        return await client.get("/orders", params={"limit": 50})
+    order_id = rng.choice(order_ids)
+    if scenario == "get_order":
+        return await client.get(f"/orders/{order_id}")
+    if scenario == "order_pdf":
+        return await client.get(f"/orders/{order_id}/pdf")
+    if scenario == "order_email":
+        return await client.post(f"/orders/{order_id}/email", params={"email": "load.test@example.com"})
+    raise ValueError(f"Unknown scenario '{scenario}'")
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: str,
+    requests: int,
+    concurrency: int,
+    order_ids: List[int],
+    products: List[str],
+    seed: int
+) -> Dict[str, float]:
+    """
+    Send `requests` requests for one scenario from `concurrency` concurrent workers.
+
+    Returns:
+        Dict[str, float]: The scenario summary.
+    """
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await send_request(client, scenario, order_ids, products, rng)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+async def run_load_test(
+    client: httpx.AsyncClient,
+    scenarios: List[str] = list(SCENARIOS),
+    orders: int = 1000,
+    requests: int = 200,
+    concurrency: int = 20,
+    seed: int = 42
+) -> dict:
+    """
+    Seed orders, then run each scenario in turn.
+
+    Returns:
+        dict: The configuration and one summary per scenario.
+    """
+    rng = random.Random(seed)
+    products_response = await client.get("/api/products")
+    products_response.raise_for_status()
+    products = list(products_response.json())
+    order_ids = await seed_orders(client, orders, products, rng)
+
+    results = {}
+    for index, scenario in enumerate(scenarios):
+        results[scenario] = await run_scenario(client, scenario, requests, concurrency, order_ids, products, seed + index)
+    return {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "config": {"orders": orders, "requests": requests, "concurrency": concurrency, "seed": seed, "python": platform.python_version()},
+        "scenarios": results,
+    }
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Compare a run with a baseline run.
+
+    Args:
+        results (dict): Output of `run_load_test`.
+        baseline (dict): An earlier output of `run_load_test`.
+        threshold (float): Allowed relative change, e.g. 0.2 for 20%.
+
+    Returns:
+        List[str]: One message per regressed metric; empty when nothing regressed.
+    """
+    regressions = []
+    for scenario, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario)
+        if previous is None:
+            continue
+        if previous["throughput_rps"] and current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{scenario}: throughput {current['throughput_rps']} rps, baseline {previous['throughput_rps']} rps")
+        for key in ("p95_ms", "p99_ms"):
+            if previous[key] and current[key] > previous[key] * (1 + threshold):
+                regressions.append(f"{scenario}: {key[:3]} {current[key]} ms, baseline {previous[key]} ms")
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{scenario}: {current['errors']} errors, baseline {previous['errors']}")
+    return regressions
+
+@asynccontextmanager
+async def open_client(base_url: Optional[str]) -> AsyncIterator[httpx.AsyncClient]:
+    """HTTP client for a running server, or for the app in-process with its startup and shutdown run"""
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            yield client
+        return
+
+    from app import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=60) as client:
+            yield client
+
+def print_results(results: dict):
+    config = results["config"]
+    print(f"{config['orders']} seeded orders, {config['requests']} requests per scenario, concurrency {config['concurrency']}")
+    print(f"  {'scenario':<14} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for scenario, summary in results["scenarios"].items():
+        print(
+            f"  {scenario:<14} {summary['throughput_rps']:>9.1f} {summary['p50_ms']:>9.2f} "
+            f"{summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f} {summary['errors']:>7}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Server to test; the app runs in-process when omitted")
+    parser.add_argument("--orders", type=int, default=1000, help="Orders to seed before the scenarios")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--baseline", help="Earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression (default 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write the results to --baseline")
+    args = parser.parse_args()
+    if not args.base_url and "DATABASE_URL" not in os.environ:
+        # Set before the app is imported by open_client
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/load_test.db"
+
+    scenarios = [scenario.strip() for scenario in args.scenarios.split(",") if scenario.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    async def run():
+        async with open_client(args.base_url) as client:
+            return await run_load_test(client, scenarios, args.orders, args.requests, args.concurrency, args.seed)
+
+    results = asyncio.run(run())
+    print_results(results)
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2)
+    print(f"Results written to {args.output}")
+
+    if not args.baseline:
+        return
+    if args.save_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as output:
+            json.dump(results, output, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+    with open(args.baseline) as baseline_file:
+        regressions = find_regressions(results, json.load(baseline_file), args.threshold)
+    if regressions:
+        print(f"Regressions against {args.baseline} (threshold {args.threshold:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"No regressions against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
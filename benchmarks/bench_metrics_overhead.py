@@ -0,0 +1,65 @@
+"""
+Micro-benchmark: per-request cost of the metrics middleware and of one
+stage timer, measured against a bare ASGI app so nothing else is timed.
+
+Usage:
+    python benchmarks/bench_metrics_overhead.py [--requests 200000]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import asyncio
+import time
+
+from metrics import MetricsMiddleware, Registry
+
+class Route:
+    path_format = "/orders/{order_id}"
+
+ROUTE = Route()
+
+async def bare_app(scope, receive, send):
+    scope["route"] = ROUTE
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+async def send(message):
+    pass
+
+async def drive(app, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app({"type": "http", "method": "GET", "path": "/orders/1"}, receive, send)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200000)
+    args = parser.parse_args()
+
+    registry = Registry()
+    histogram = registry.histogram("bench_seconds", "Benchmark", ("method", "route", "status"))
+    stage = registry.histogram("bench_stage_seconds", "Benchmark", ("stage",))
+    instrumented = MetricsMiddleware(bare_app, histogram)
+
+    asyncio.run(drive(instrumented, 1000))
+    bare = asyncio.run(drive(bare_app, args.requests))
+    with_middleware = asyncio.run(drive(instrumented, args.requests))
+
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        with stage.time("validation"):
+            pass
+    timer = time.perf_counter() - started
+
+    per_request = (with_middleware - bare) / args.requests
+    print(f"{args.requests} requests")
+    print(f"  middleware overhead  {per_request * 1e6:6.2f} us/request")
+    print(f"  stage timer          {timer / args.requests * 1e6:6.2f} us/block")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Throughput benchmark: POST /order one order at a time versus POST /orders/batch.
+
+Runs in-process against DATABASE_URL; when it is not set a throwaway SQLite
+database is used as a local stand-in for PostgreSQL.
+
+Usage:
+    python benchmarks/bench_order_batch.py [--orders 2000] [--batch-size 1000]
+"""
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_order_batch.db"
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from app import app, product_catalog
+from database import run_migrations
+
+def make_orders(count: int, items_per_order: int = 3):
+    products = list(product_catalog.prices)
+    return [
+        {
+            "customer_name": "Benchmark Customer",
+            "currency": "USD",
+            "order_items": [
+                {"product_name": products[(index + offset) % len(products)], "quantity": offset + 1}
+                for offset in range(items_per_order)
+            ],
+        }
+        for index in range(count)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    run_migrations()
+    product_catalog.load()
+    client = TestClient(app)
+    orders = make_orders(args.orders)
+
+    started = time.perf_counter()
+    for order in orders:
+        response = client.post("/order", json=order)
+        assert response.status_code == 200, response.text
+    single_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for offset in range(0, len(orders), args.batch_size):
+        response = client.post("/orders/batch", json={"orders": orders[offset:offset + args.batch_size]})
+        assert response.json()["failed"] == 0, response.text
+    batch_elapsed = time.perf_counter() - started
+
+    single_rate = args.orders / single_elapsed
+    batch_rate = args.orders / batch_elapsed
+    print(f"{args.orders} orders, batch size {args.batch_size}")
+    print(f"  POST /order         {single_rate:10.0f} orders/s")
+    print(f"  POST /orders/batch  {batch_rate:10.0f} orders/s  ({batch_rate / single_rate:.1f}x)")
+
+if __name__ == "__main__":
+    main()
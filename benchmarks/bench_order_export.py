@@ -0,0 +1,107 @@
+"""
+GET /orders/export memory: peak Python allocations while exporting ranges
+of growing size, against reading the same rows into one list first. The
+streamed export should stay flat while the all-at-once read grows with
+the row count.
+
+Reads DATABASE_URL, a throwaway SQLite database when it is not set, seeded
+with orders of three line items each.
+
+Usage:
+    python benchmarks/bench_order_export.py [--sizes 10000,50000,200000] [--format csv]
+"""
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_order_export.db"
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, insert, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import async_read_engine, engine, run_migrations
+from exports import csv_chunks, export_statement, iter_export_rows, parquet_chunks
+from models import OrderItemTable, OrderTable
+
+ITEMS_PER_ORDER = 3
+START = datetime(2024, 1, 1)
+
+def seed(order_count: int):
+    with engine.begin() as connection:
+        existing = connection.execute(select(func.count()).select_from(OrderTable)).scalar()
+        for offset in range(existing, order_count, 10000):
+            rows = [
+                {
+                    "customer_name": f"Customer {index}",
+                    "currency": "USD",
+                    "order_total": Decimal("56.25") * ITEMS_PER_ORDER,
+                    "exchange_rate_version": "bench",
+                    "created_at": START + timedelta(seconds=index),
+                }
+                for index in range(offset, min(offset + 10000, order_count))
+            ]
+            ids = connection.execute(insert(OrderTable).returning(OrderTable.id), rows).scalars().all()
+            connection.execute(insert(OrderItemTable), [
+                {"product_name": "Keyboard", "quantity": 1, "unit_price": Decimal("56.25"), "line_total": Decimal("56.25"), "order_id": order_id}
+                for order_id in ids
+                for _ in range(ITEMS_PER_ORDER)
+            ])
+
+async def streamed(order_count: int, encode) -> int:
+    """Export the first `order_count` orders; return the bytes produced"""
+    size = 0
+    async with AsyncSession(async_read_engine) as session:
+        batches = iter_export_rows(session, export_statement(START, START + timedelta(seconds=order_count)))
+        async for chunk in encode(batches):
+            size += len(chunk)
+    return size
+
+async def all_at_once(order_count: int, encode) -> int:
+    """Read every row, then encode them; what a non-streaming export would do"""
+    async with AsyncSession(async_read_engine) as session:
+        statement = export_statement(START, START + timedelta(seconds=order_count)).execution_options(yield_per=None)
+        rows = (await session.exec(statement)).all()
+
+    async def one_batch():
+        yield rows
+
+    return sum([len(chunk) async for chunk in encode(one_batch())])
+
+def measure(export, order_count: int, encode):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = asyncio.run(export(order_count, encode))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,50000,200000", help="Comma-separated order counts")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    encode = parquet_chunks if args.format == "parquet" else csv_chunks
+
+    run_migrations()
+    seed(max(sizes))
+    print(f"{args.format} export, {ITEMS_PER_ORDER} line items per order")
+    print(f"  {'orders':>8} {'rows':>8} {'MB out':>8} {'streamed s':>11} {'peak MB':>8} {'all-at-once s':>14} {'peak MB':>8}")
+    for order_count in sizes:
+        size, streamed_seconds, streamed_peak = measure(streamed, order_count, encode)
+        _, loaded_seconds, loaded_peak = measure(all_at_once, order_count, encode)
+        print(
+            f"  {order_count:>8} {order_count * ITEMS_PER_ORDER:>8} {size / 1e6:>8.1f} "
+            f"{streamed_seconds:>11.2f} {streamed_peak / 1e6:>8.1f} {loaded_seconds:>14.2f} {loaded_peak / 1e6:>8.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Latency of the GET /orders filters as the orders table grows.
+
+Seeds DATABASE_URL (a throwaway SQLite database when it is not set) up to each
+size in --sizes and runs every filter --repeat times with random inputs, one
+100-order page each, reporting p50 and p95. With the indexes from migration
+0007 p95 should stay roughly flat from one size to the next; run against
+PostgreSQL for the prefix and trigram indexes, e.g. with --sizes 100000,1000000,10000000.
+
+Usage:
+    python benchmarks/bench_order_filters.py [--sizes 10000,100000,1000000] [--repeat 50]
+"""
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_order_filters.db"
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+from sqlmodel import Session
+
+from app import order_filter_clauses, orders_page_statement
+from database import engine, run_migrations
+from models import OrderItemTable, OrderTable
+
+SYLLABLES = ["an", "bel", "cor", "da", "el", "fin", "gar", "ha", "is", "jo", "ka", "lin", "mar", "no", "or", "pe", "qui", "ros", "sa", "tor"]
+PRODUCTS = ["Laptop", "Mouse", "Keyboard", "Monitor", "Headphones", "Webcam", "Smartphone", "Tablet", "Charger", "Speaker"]
+CURRENCIES = ["CAD", "USD", "EUR", "GBP"]
+START = datetime(2024, 1, 1)
+
+def make_name(rng: random.Random) -> str:
+    first = "".join(rng.choice(SYLLABLES) for _ in range(2)).title()
+    last = "".join(rng.choice(SYLLABLES) for _ in range(3)).title()
+    return f"{first} {last}"
+
+def seed(order_count: int):
+    with engine.begin() as connection:
+        existing = connection.execute(select(func.count()).select_from(OrderTable)).scalar()
+        rng = random.Random(existing)
+        for offset in range(existing, order_count, 10000):
+            rows = [
+                {
+                    "customer_name": make_name(rng),
+                    "currency": rng.choice(CURRENCIES),
+                    "created_at": START + timedelta(seconds=rng.randint(0, 365 * 24 * 3600)),
+                }
+                for _ in range(offset, min(offset + 10000, order_count))
+            ]
+            ids = connection.execute(insert(OrderTable).returning(OrderTable.id), rows).scalars().all()
+            connection.execute(insert(OrderItemTable), [
+                {"product_name": PRODUCTS[(order_id + item) % len(PRODUCTS)], "quantity": item + 1, "order_id": order_id}
+                for order_id in ids
+                for item in range(2)
+            ])
+
+def filter_cases(rng: random.Random):
+    """Random inputs for every filter"""
+    day = START + timedelta(days=rng.randint(0, 360))
+    return {
+        "customer prefix": {"customer": make_name(rng)[:5]},
+        "fuzzy search": {"search": make_name(rng)},
+        "product": {"product": rng.choice(PRODUCTS)},
+        "currency": {"currency": rng.choice(CURRENCIES)},
+        "created_at range": {"created_from": day, "created_to": day + timedelta(days=1)},
+        "product + currency + range": {
+            "product": rng.choice(PRODUCTS), "currency": rng.choice(CURRENCIES),
+            "created_from": day, "created_to": day + timedelta(days=7),
+        },
+    }
+
+def measure(repeat: int):
+    rng = random.Random(3)
+    timings = {}
+    with Session(engine) as session:
+        for _ in range(repeat):
+            for name, params in filter_cases(rng).items():
+                statement = orders_page_statement(100, None, order_filter_clauses(engine.dialect.name, **params))
+                started = time.perf_counter()
+                session.exec(statement).all()
+                timings.setdefault(name, []).append(time.perf_counter() - started)
+                session.expunge_all()
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    run_migrations()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = {}
+    for size in sizes:
+        seed(size)
+        results[size] = measure(args.repeat)
+
+    print(f"p50 / p95 per 100-order page on {engine.dialect.name} (ms)")
+    print(f"  {'filter':<28}" + "".join(f"{size:>22,}" for size in sizes))
+    for name in results[sizes[0]]:
+        cells = []
+        for size in sizes:
+            timings = results[size][name]
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            cells.append(f"{statistics.median(timings) * 1000:9.2f} / {p95 * 1000:9.2f}")
+        print(f"  {name:<28}" + "".join(f"{cell:>22}" for cell in cells))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+GET /orders serialization: ORM objects through response_model (pydantic
+validation and json.dumps, what FastAPI does) versus the narrow SQL
+projection encoded with orjson.
+
+Both paths read N orders in pages of 1000 (the ORDERS_PAGE_MAX) from
+DATABASE_URL, a throwaway SQLite database when it is not set, and produce
+identical bytes.
+
+Usage:
+    python benchmarks/bench_order_json.py [--sizes 1000,10000,100000]
+"""
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_order_json.db"
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import func, insert, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import ORDERS_PAGE_MAX, fetch_order_rows, order_rows_page_statement, orders_page_statement
+from database import async_read_engine, engine, run_migrations
+from fast_json import dumps
+from models import OrderItemTable, OrderRead, OrderTable
+
+ORDERS_ADAPTER = TypeAdapter(List[OrderRead])
+
+def seed(order_count: int, items_per_order: int = 3):
+    with engine.begin() as connection:
+        existing = connection.execute(select(func.count()).select_from(OrderTable)).scalar()
+        start = datetime(2024, 1, 1)
+        for offset in range(existing, order_count, 10000):
+            rows = [
+                {
+                    "customer_name": f"Customer {index}",
+                    "currency": "USD",
+                    "order_total": Decimal("56.25") * items_per_order,
+                    "exchange_rate_version": "bench",
+                    "created_at": start + timedelta(seconds=index),
+                }
+                for index in range(offset, min(offset + 10000, order_count))
+            ]
+            ids = connection.execute(insert(OrderTable).returning(OrderTable.id), rows).scalars().all()
+            connection.execute(insert(OrderItemTable), [
+                {"product_name": "Keyboard", "quantity": 1, "unit_price": Decimal("56.25"), "line_total": Decimal("56.25"), "order_id": order_id}
+                for order_id in ids
+                for _ in range(items_per_order)
+            ])
+
+async def response_model_path(session: AsyncSession, limit: int, after):
+    orders = (await session.exec(orders_page_statement(limit, after))).all()
+    content = ORDERS_ADAPTER.dump_python(ORDERS_ADAPTER.validate_python(orders, from_attributes=True), mode="json")
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+    session.expunge_all()
+    return body, (orders[-1].created_at, orders[-1].id) if orders else None
+
+async def fast_path(session: AsyncSession, limit: int, after):
+    orders = await fetch_order_rows(session, order_rows_page_statement(limit, after))
+    return dumps(orders), (orders[-1]["created_at"], orders[-1]["id"]) if orders else None
+
+async def read_orders(path, count: int):
+    """Read the first `count` orders page by page; return the bytes produced and the elapsed time"""
+    total = 0
+    after = None
+    started = time.perf_counter()
+    async with AsyncSession(async_read_engine, expire_on_commit=False) as session:
+        remaining = count
+        while remaining > 0:
+            body, after = await path(session, min(ORDERS_PAGE_MAX, remaining), after)
+            total += len(body)
+            remaining -= ORDERS_PAGE_MAX
+    return total, time.perf_counter() - started
+
+async def run(sizes: List[int]):
+    # Warm up both paths (statement compilation, connections)
+    await read_orders(response_model_path, 1000)
+    await read_orders(fast_path, 1000)
+    for size in sizes:
+        model_bytes, model_elapsed = await read_orders(response_model_path, size)
+        fast_bytes, fast_elapsed = await read_orders(fast_path, size)
+        assert model_bytes == fast_bytes
+        print(
+            f"  {size:>7,} orders  response_model {model_elapsed * 1000:9.1f} ms   "
+            f"orjson projection {fast_elapsed * 1000:9.1f} ms   ({model_elapsed / fast_elapsed:.1f}x, {fast_bytes / 1e6:.1f} MB)"
+        )
+    await async_read_engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    run_migrations()
+    seed(max(sizes))
+    print(f"Orders with 3 items each, pages of {ORDERS_PAGE_MAX}, on {engine.dialect.name}")
+    asyncio.run(run(sizes))
+
+if __name__ == "__main__":
+    main()
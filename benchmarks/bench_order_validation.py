@@ -0,0 +1,111 @@
+"""
+Micro-benchmark: validating orders with the single-pass validator, one at a
+time and in batch mode, versus the previous per-field validators that copied
+the items into dicts and stopped at the first error.
+
+Usage:
+    python benchmarks/bench_order_validation.py [--orders 5000] [--items 10] [--invalid 0.1]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from models import OrderCreate
+from rates import DEFAULT_RATES
+from validation import order_errors, validate_orders
+
+PRODUCTS = {"Laptop": 1200.0, "Mouse": 25.0, "Keyboard": 75.0, "Monitor": 300.0, "Headphones": 150.0,
+            "Webcam": 90.0, "Microphone": 120.0, "Speakers": 80.0, "Printer": 200.0, "Tablet": 450.0}
+
+# The previous validators, kept here for comparison
+def legacy_validate_product_name(product_name: str) -> str:
+    if not product_name.strip():
+        raise ValueError("Product name cannot be empty or whitespace.")
+    if product_name not in PRODUCTS:
+        raise ValueError(f"Product '{product_name}' is not available. Please select from predefined products.")
+    return product_name
+
+def legacy_validate_order_items(order_items: List[dict]) -> List[dict]:
+    if len(order_items) > 100:
+        raise ValueError("You cannot add more than 100 line items.")
+    product_names = set()
+    total_quantity = 0
+    for item in order_items:
+        product_name = item.get("product_name", "")
+        legacy_validate_product_name(product_name)
+        if product_name in product_names:
+            raise ValueError(f"Duplicate product name detected: '{product_name}'.")
+        product_names.add(product_name)
+        total_quantity += item.get("quantity", 0)
+    if total_quantity > 1000000:
+        raise ValueError("The total quantity for the order cannot exceed 1,000,000.")
+    return order_items
+
+def legacy_validate(order_data: OrderCreate) -> OrderCreate:
+    if not order_data.customer_name.strip():
+        raise ValueError("Customer name cannot be empty or whitespace.")
+    if not re.match(r"^[a-zA-Z ]+$", order_data.customer_name):
+        raise ValueError("Customer name can only contain alphabetic characters and spaces.")
+    supported_currencies = ["CAD", "USD", "EUR", "GBP"]
+    if order_data.currency not in supported_currencies:
+        raise ValueError(f"Currency '{order_data.currency}' is not supported. Supported currencies: {', '.join(supported_currencies)}")
+    legacy_validate_order_items([{"product_name": item.product_name, "quantity": item.quantity} for item in order_data.order_items])
+    if not order_data.order_items:
+        raise ValueError("Order must have at least one order item.")
+    return order_data
+
+def make_orders(count: int, item_count: int, invalid_share: float) -> List[OrderCreate]:
+    rng = random.Random(42)
+    names = list(PRODUCTS)
+    orders = []
+    for index in range(count):
+        items = [{"product_name": name, "quantity": rng.randint(1, 5)} for name in rng.sample(names, min(item_count, len(names)))]
+        currency = rng.choice(["CAD", "USD", "EUR", "GBP"])
+        if rng.random() < invalid_share:
+            currency = "JPY"
+        orders.append(OrderCreate.model_validate({"customer_name": f"Customer {chr(65 + index % 26)}", "currency": currency, "order_items": items}))
+    return orders
+
+def legacy_run(orders):
+    invalid = 0
+    for order in orders:
+        try:
+            legacy_validate(order)
+        except ValueError:
+            invalid += 1
+    return invalid
+
+def single_run(orders):
+    return sum(1 for order in orders if order_errors(order, PRODUCTS, DEFAULT_RATES))
+
+def batch_run(orders):
+    return sum(1 for errors in validate_orders(orders, PRODUCTS, DEFAULT_RATES) if errors)
+
+def best_of(run, orders, repeat: int = 5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        invalid = run(orders)
+        timings.append(time.perf_counter() - started)
+    return min(timings), invalid
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--invalid", type=float, default=0.1, help="Share of orders with an unsupported currency")
+    args = parser.parse_args()
+
+    orders = make_orders(args.orders, args.items, args.invalid)
+    print(f"{args.orders} orders x {args.items} items, {args.invalid:.0%} invalid")
+    for label, run in (("previous validators", legacy_run), ("single pass", single_run), ("batch mode", batch_run)):
+        elapsed, invalid = best_of(run, orders)
+        print(f"  {label:<20} {elapsed * 1000:8.2f} ms   {elapsed / args.orders * 1e6:6.2f} us/order   {invalid} invalid")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Micro-benchmark: per-order PDF render time with the shared template versus
+rebuilding the styles and table styles on every render (the old behaviour).
+
+Usage:
+    python benchmarks/bench_pdf_render.py [--orders 200] [--items 10]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import statistics
+import time
+from datetime import datetime
+
+from order_pdf import PDF_TEMPLATE, OrderPdfTemplate
+from models import OrderTable, OrderItemTable
+
+# Fixed prices and rates so the benchmark needs no database
+PRICES = {"Laptop": 1200.0, "Mouse": 25.0, "Keyboard": 75.0, "Monitor": 300.0, "Headphones": 150.0}
+RATES = {"CAD": 1.0, "USD": 0.74}
+
+def make_order(order_id: int, item_count: int) -> OrderTable:
+    products = list(PRICES)
+    order = OrderTable(id=order_id, customer_name="Benchmark Customer", currency="USD", created_at=datetime(2025, 1, 1))
+    order.order_items = [
+        OrderItemTable(id=index, product_name=products[index % len(products)], quantity=index + 1, order_id=order_id)
+        for index in range(item_count)
+    ]
+    return order
+
+def time_renders(render, orders):
+    timings = []
+    for order in orders:
+        started = time.perf_counter()
+        render(order)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--items", type=int, default=10)
+    args = parser.parse_args()
+
+    orders = [make_order(order_id, args.items) for order_id in range(1, args.orders + 1)]
+    # Warm up reportlab's font and module caches before timing either path
+    time_renders(lambda order: PDF_TEMPLATE.render(order, PRICES, RATES), orders[:5])
+
+    per_render = time_renders(lambda order: OrderPdfTemplate().render(order, PRICES, RATES), orders)
+    shared = time_renders(lambda order: PDF_TEMPLATE.render(order, PRICES, RATES), orders)
+
+    print(f"{args.orders} orders x {args.items} items")
+    for label, timings in (("template per render", per_render), ("shared template", shared)):
+        print(f"  {label:<20} mean {statistics.mean(timings) * 1000:7.3f} ms   median {statistics.median(timings) * 1000:7.3f} ms")
+    saved = statistics.mean(per_render) - statistics.mean(shared)
+    print(f"  saved per order      {saved * 1000:7.3f} ms ({saved / statistics.mean(per_render):.1%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Query plans and timings for the hot order queries, before and after the
+indexes added in migration 0002.
+
+Seeds N orders into DATABASE_URL (a throwaway SQLite database when it is not
+set), runs each query at migration 0001 and again at head, and prints the
+plans (EXPLAIN ANALYZE on PostgreSQL, EXPLAIN QUERY PLAN on SQLite).
+
+Usage:
+    python benchmarks/bench_query_plans.py [--orders 100000] [--repeat 20]
+"""
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_query_plans.db"
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from alembic import command
+from sqlalchemy import func, insert, select, text
+
+from database import alembic_config, engine, run_migrations
+from models import OrderItemTable, OrderTable
+
+QUERIES = {
+    "items of 100 orders (selectinload)": (
+        "SELECT * FROM order_items WHERE order_id IN ({ids})"
+    ),
+    "keyset page on (created_at, id)": (
+        "SELECT * FROM orders WHERE created_at > '{middle}' OR (created_at = '{middle}' AND id > 0) "
+        "ORDER BY created_at, id LIMIT 100"
+    ),
+    "created_at range count": (
+        "SELECT count(*) FROM orders WHERE created_at >= '{middle}' AND created_at < '{week_later}'"
+    ),
+}
+
+def seed(order_count: int, items_per_order: int = 3):
+    run_migrations("head")
+    with engine.begin() as connection:
+        existing = connection.execute(select(func.count()).select_from(OrderTable)).scalar()
+        if existing >= order_count:
+            return
+        random.seed(7)
+        start = datetime(2024, 1, 1)
+        for offset in range(existing, order_count, 5000):
+            rows = [
+                {
+                    "customer_name": f"Customer {index % 5000}",
+                    "currency": "CAD",
+                    "created_at": start + timedelta(seconds=random.randint(0, 365 * 24 * 3600)),
+                }
+                for index in range(offset, min(offset + 5000, order_count))
+            ]
+            ids = connection.execute(insert(OrderTable).returning(OrderTable.id), rows).scalars().all()
+            connection.execute(insert(OrderItemTable), [
+                {"product_name": "Mouse", "quantity": item + 1, "order_id": order_id}
+                for order_id in ids
+                for item in range(items_per_order)
+            ])
+
+def render_queries():
+    with engine.connect() as connection:
+        ids = connection.execute(text("SELECT id FROM orders ORDER BY random() LIMIT 100")).scalars().all()
+        count = connection.execute(text("SELECT count(*) FROM orders")).scalar()
+        middle = connection.execute(text(f"SELECT created_at FROM orders ORDER BY id LIMIT 1 OFFSET {count // 2}")).scalar()
+    middle = middle if isinstance(middle, datetime) else datetime.fromisoformat(str(middle))
+    params = {
+        "ids": ", ".join(str(order_id) for order_id in ids),
+        "middle": middle.isoformat(sep=" "),
+        "week_later": (middle + timedelta(days=7)).isoformat(sep=" "),
+    }
+    return {name: sql.format(**params) for name, sql in QUERIES.items()}
+
+def explain(sql: str):
+    prefix = "EXPLAIN ANALYZE " if engine.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN "
+    with engine.connect() as connection:
+        rows = connection.execute(text(prefix + sql)).all()
+    return [str(row[-1]) for row in rows]
+
+def time_query(sql: str, repeat: int) -> float:
+    with engine.connect() as connection:
+        connection.execute(text(sql)).all()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            connection.execute(text(sql)).all()
+    return (time.perf_counter() - started) / repeat
+
+def report(label: str, queries, repeat: int):
+    print(f"=== {label} ===")
+    timings = {}
+    for name, sql in queries.items():
+        timings[name] = time_query(sql, repeat)
+        print(f"-- {name}: {timings[name] * 1000:.3f} ms")
+        for line in explain(sql):
+            print(f"     {line}")
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    seed(args.orders)
+    queries = render_queries()
+
+    command.downgrade(alembic_config(), "0001")
+    before = report("before (migration 0001)", queries, args.repeat)
+    run_migrations("head")
+    after = report("after (migration head)", queries, args.repeat)
+
+    print("=== summary ===")
+    for name in queries:
+        print(f"  {name:<40} {before[name] * 1000:9.3f} ms -> {after[name] * 1000:9.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Sales report timings: GROUP BY over orders/order_items versus the sales
+summary tables.
+
+Seeds N priced orders into DATABASE_URL (a throwaway SQLite database when it
+is not set), rebuilds the summaries and times every report both ways.
+
+Usage:
+    python benchmarks/bench_reports.py [--orders 200000] [--repeat 5]
+"""
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_reports.db"
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, insert, select
+
+from database import engine, run_migrations
+from models import OrderItemTable, OrderTable
+from reports import currencies_statement, customers_statement, periods_statement, products_statement, rebuild_summaries
+
+PRICES = {"Laptop": Decimal("1200.00"), "Mouse": Decimal("25.00"), "Keyboard": Decimal("75.00"), "Monitor": Decimal("300.00")}
+
+def seed(order_count: int, items_per_order: int = 3):
+    run_migrations()
+    with engine.begin() as connection:
+        existing = connection.execute(select(func.count()).select_from(OrderTable)).scalar()
+        random.seed(11)
+        start = datetime(2024, 1, 1)
+        products = list(PRICES)
+        for offset in range(existing, order_count, 5000):
+            orders = []
+            for index in range(offset, min(offset + 5000, order_count)):
+                lines = [(products[(index + item) % len(products)], item + 1) for item in range(items_per_order)]
+                orders.append((lines, {
+                    "customer_name": f"Customer {index % 2000}",
+                    "currency": random.choice(["CAD", "USD", "EUR", "GBP"]),
+                    "order_total": sum(PRICES[name] * quantity for name, quantity in lines),
+                    "created_at": start + timedelta(seconds=random.randint(0, 365 * 24 * 3600)),
+                }))
+            ids = connection.execute(insert(OrderTable).returning(OrderTable.id), [row for _, row in orders]).scalars().all()
+            connection.execute(insert(OrderItemTable), [
+                {"product_name": name, "quantity": quantity, "unit_price": PRICES[name], "line_total": PRICES[name] * quantity, "order_id": order_id}
+                for (lines, _), order_id in zip(orders, ids)
+                for name, quantity in lines
+            ])
+
+def time_statement(statement, repeat: int) -> float:
+    with engine.connect() as connection:
+        connection.execute(statement).all()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            connection.execute(statement).all()
+    return (time.perf_counter() - started) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    seed(args.orders)
+    rebuild_summaries()
+    dialect_name = engine.dialect.name
+    reports = {
+        "products": lambda summaries: products_statement(use_summaries=summaries),
+        "currencies": lambda summaries: currencies_statement(use_summaries=summaries),
+        "periods (week)": lambda summaries: periods_statement("week", dialect_name, use_summaries=summaries),
+        "periods (month)": lambda summaries: periods_statement("month", dialect_name, use_summaries=summaries),
+        "top customers": lambda summaries: customers_statement(10, use_summaries=summaries),
+    }
+
+    print(f"{args.orders} orders x 3 items on {dialect_name}")
+    for name, statement in reports.items():
+        scan = time_statement(statement(False), args.repeat)
+        summary = time_statement(statement(True), args.repeat)
+        print(f"  {name:<18} orders {scan * 1000:9.2f} ms   summaries {summary * 1000:8.2f} ms   ({scan / summary:.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from decimal import Decimal
+from types import MappingProxyType
+from typing import List, Mapping, Optional
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+from database import async_engine, engine
+from models import CatalogVersionTable, ProductTable
+
+# How often workers check the catalog version, and how long a snapshot may be
+# served before it is reloaded regardless of the version (e.g. after manual SQL edits)
+CATALOG_REFRESH_SECONDS = float(os.getenv("CATALOG_REFRESH_SECONDS", "5"))
+CATALOG_TTL_SECONDS = float(os.getenv("CATALOG_TTL_SECONDS", "300"))
+
+class CatalogSnapshot:
+    """Immutable view of the product catalog at one version"""
+
+    def __init__(self, version: int, products: List[ProductTable]):
+        self.version = version
+        self.prices: Mapping[str, float] = MappingProxyType({product.name: float(product.price) for product in products})
+        # /api/products is served straight from these bytes
+        self.json_body = json.dumps(dict(self.prices)).encode()
+        self.etag = f'"{version}-{hashlib.sha256(self.json_body).hexdigest()[:16]}"'
+        self.loaded_at = time.monotonic()
+
+class ProductCatalog:
+    """
+    Per-worker cache of the products table.
+
+    Lookups are plain dict hits on the current snapshot. A background task
+    compares the stored catalog version every CATALOG_REFRESH_SECONDS and
+    swaps in a new snapshot when it changed or is older than CATALOG_TTL_SECONDS.
+    The snapshot is never loaded implicitly: startup calls load(), and
+    request handlers await ensure_loaded(), which uses the async engine.
+    """
+
+    def __init__(self, refresh_seconds: float = CATALOG_REFRESH_SECONDS, ttl_seconds: float = CATALOG_TTL_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """The current snapshot; raises RuntimeError before the catalog is loaded"""
+        if self._snapshot is None:
+            raise RuntimeError("Product catalog is not loaded; call load() at startup or await ensure_loaded().")
+        return self._snapshot
+
+    @property
+    def prices(self) -> Mapping[str, float]:
+        """Product name to price in CAD"""
+        return self.snapshot.prices
+
+    def load(self):
+        """Load the catalog with a blocking query (startup, scripts, tests)"""
+        with Session(engine) as session:
+            version = session.get(CatalogVersionTable, 1)
+            products = session.exec(select(ProductTable).order_by(ProductTable.id)).all()
+        self._snapshot = CatalogSnapshot(version.version if version else 0, products)
+
+    async def ensure_loaded(self):
+        """Load the catalog through the async engine if this worker has no snapshot yet"""
+        if self._snapshot is None:
+            await self.refresh(force=True)
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the catalog if its version changed or the snapshot expired.
+
+        Args:
+            force (bool): Reload even if nothing changed.
+
+        Returns:
+            bool: True if a new snapshot was swapped in.
+        """
+        async with AsyncSession(async_engine) as session:
+            version_row = await session.get(CatalogVersionTable, 1)
+            version = version_row.version if version_row else 0
+            current = self._snapshot
+            expired = current is None or time.monotonic() - current.loaded_at > self.ttl_seconds
+            if not force and not expired and current.version == version:
+                return False
+            products = (await session.exec(select(ProductTable).order_by(ProductTable.id))).all()
+        self._snapshot = CatalogSnapshot(version, products)
+        return True
+
+    async def upsert(self, session: AsyncSession, name: str, price: Decimal) -> ProductTable:
+        """
+        Add a product or change its price, bump the catalog version and
+        refresh this worker. Other workers follow within refresh_seconds.
+        One INSERT ... ON CONFLICT, so concurrent requests adding the same
+        new product both succeed instead of one hitting the unique index.
+
+        Args:
+            session (AsyncSession): Database session.
+            name (str): Product name.
+            price (Decimal): Price in CAD.
+
+        Returns:
+            ProductTable: The stored product.
+        """
+        dialect_insert = postgresql.insert if session.bind.dialect.name == "postgresql" else sqlite.insert
+        statement = dialect_insert(ProductTable).values(name=name, price=price)
+        statement = statement.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"price": statement.excluded.price}
+        ).returning(ProductTable)
+        product = (await session.exec(statement)).scalar_one()
+        await session.exec(
+            update(CatalogVersionTable)
+            .where(CatalogVersionTable.id == 1)
+            .values(version=CatalogVersionTable.version + 1)
+        )
+        await session.commit()
+        await self.refresh(force=True)
+        return product
+
+    def start(self):
+        """Start the background refresh task on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background refresh task"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"[CATALOG] Refresh failed, keeping version {self._snapshot.version if self._snapshot else 0}: {str(e)}")
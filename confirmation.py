@@ -0,0 +1,132 @@
+from collections import OrderedDict
+from decimal import Decimal
+from typing import List, Optional, Tuple
+import os
+import threading
+
+from jinja2 import Environment
+
+# Rendered confirmations kept per process; 0 disables the cache
+CONFIRMATION_CACHE_ENTRIES = int(os.getenv("CONFIRMATION_CACHE_ENTRIES", "1000"))
+
+# Compiled once at import; autoescaping covers customer and product names and error details
+TEMPLATES = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+
+CONFIRMATION_TEMPLATE = TEMPLATES.from_string("""
+<div class='order-confirmation-container'>
+    <h1>Order Confirmation</h1>
+    <p><strong>Order ID:</strong> {{ order.id }}</p>
+    <p><strong>Customer Name:</strong> {{ order.customer_name }}</p>
+    <p><strong>Currency:</strong> {{ order.currency }}</p>
+    <p><strong>Order Date:</strong> {{ order.created_at.strftime('%Y-%m-%d %H:%M:%S') }}</p>
+
+    <h3>Order Items:</h3>
+    <table style="width: 100%; border-collapse: collapse; margin: 20px 0;">
+        <thead>
+            <tr style="background-color: #f5f5f5;">
+                <th style="border: 1px solid #ddd; padding: 12px; text-align: left;">Product</th>
+                <th style="border: 1px solid #ddd; padding: 12px; text-align: center;">Quantity</th>
+                <th style="border: 1px solid #ddd; padding: 12px; text-align: right;">Unit Price</th>
+                <th style="border: 1px solid #ddd; padding: 12px; text-align: right;">Line Total</th>
+            </tr>
+        </thead>
+        <tbody>
+{% for product_name, quantity, unit_price, line_total in rows %}
+            <tr>
+                <td>{{ product_name }}</td>
+                <td>{{ quantity }}</td>
+                <td>{{ unit_price }} {{ order.currency }}</td>
+                <td>{{ line_total }} {{ order.currency }}</td>
+            </tr>
+{% endfor %}
+        </tbody>
+        <tfoot>
+            <tr style="background-color: #f9f9f9; font-weight: bold;">
+                <td colspan="3" style="border: 1px solid #ddd; padding: 12px; text-align: right;">Total Order Amount:</td>
+                <td style="border: 1px solid #ddd; padding: 12px; text-align: right;">{{ order_total }} {{ order.currency }}</td>
+            </tr>
+        </tfoot>
+    </table>
+
+    <button onclick="window.location.href='/'">Create Another Order</button>
+</div>
+""")
+
+ERROR_TEMPLATE = TEMPLATES.from_string("""
+<div class='order-confirmation-container'>
+    <h1>Error</h1>
+    <p>{{ detail }}</p>
+    <button onclick="window.location.href='/'">Create Another Order</button>
+</div>
+""")
+
+def render_confirmation(order, line_prices: List[Tuple[Decimal, Decimal]], order_total: Decimal) -> str:
+    """
+    Render the order confirmation HTML.
+
+    Args:
+        order (OrderTable): The order with its items loaded.
+        line_prices (List[Tuple[Decimal, Decimal]]): Unit price and line total per item.
+        order_total (Decimal): The order total.
+
+    Returns:
+        str: HTML for the order confirmation page.
+    """
+    rows = [
+        (item.product_name, item.quantity, f"{unit_price:.2f}", f"{line_total:.2f}")
+        for item, (unit_price, line_total) in zip(order.order_items, line_prices)
+    ]
+    return CONFIRMATION_TEMPLATE.render(order=order, rows=rows, order_total=f"{order_total:.2f}")
+
+def render_error(detail: str) -> str:
+    """Render the error page HTML for a message"""
+    return ERROR_TEMPLATE.render(detail=detail)
+
+class ConfirmationCache:
+    """
+    Bounded LRU of rendered confirmations keyed by order id.
+
+    Only orders with stored prices are cached: they never change after
+    creation, so an entry stays valid until it is evicted.
+    """
+
+    def __init__(self, max_entries: int = CONFIRMATION_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, order_id: Optional[int]) -> Optional[str]:
+        """Return the cached HTML for an order, or None"""
+        if order_id is None or not self.max_entries:
+            return None
+        with self._lock:
+            html = self._entries.get(order_id)
+            if html is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(order_id)
+                self.hits += 1
+            return html
+
+    def put(self, order_id: Optional[int], html: str):
+        """Store an order's HTML, evicting the least recently used entries"""
+        if order_id is None or not self.max_entries:
+            return
+        with self._lock:
+            self._entries[order_id] = html
+            self._entries.move_to_end(order_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
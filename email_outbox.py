@@ -0,0 +1,199 @@
+from sqlalchemy import and_, func, or_, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Awaitable, Callable, List, Optional
+from datetime import datetime, timedelta
+import asyncio
+import os
+
+from database import async_engine
+from models import EmailJobTable
+
+# Outbox configuration
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", "2"))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "10"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_BACKOFF_SECONDS = float(os.getenv("EMAIL_BACKOFF_SECONDS", "2"))
+EMAIL_POLL_INTERVAL = float(os.getenv("EMAIL_POLL_INTERVAL", "1"))
+# Jobs left in "sending" longer than this (e.g. a worker died) are picked up again
+EMAIL_LEASE_SECONDS = float(os.getenv("EMAIL_LEASE_SECONDS", "300"))
+
+def retry_delay(attempts: int, base: float = EMAIL_BACKOFF_SECONDS) -> timedelta:
+    """
+    Exponential backoff before the next delivery attempt.
+
+    Args:
+        attempts (int): Number of attempts made so far.
+        base (float): Delay in seconds after the first failure.
+
+    Returns:
+        timedelta: Time to wait before retrying.
+    """
+    return timedelta(seconds=base * (2 ** max(attempts - 1, 0)))
+
+class EmailOutbox:
+    """
+    Pool of asyncio workers draining the email_jobs table.
+
+    Jobs are claimed in batches with a conditional UPDATE so several workers,
+    or several server processes, never deliver the same job twice.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[EmailJobTable], Awaitable[None]],
+        workers: int = EMAIL_WORKERS,
+        batch_size: int = EMAIL_BATCH_SIZE,
+        max_attempts: int = EMAIL_MAX_ATTEMPTS,
+        backoff_seconds: float = EMAIL_BACKOFF_SECONDS,
+        poll_interval: float = EMAIL_POLL_INTERVAL,
+        lease_seconds: float = EMAIL_LEASE_SECONDS,
+    ):
+        self.deliver = deliver
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self.in_flight = 0
+
+    def start(self):
+        """Start the worker tasks on the running event loop"""
+        if self._tasks:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Let in-flight batches finish, then stop the workers"""
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers after a job has been enqueued"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def enqueue(self, session: AsyncSession, order_id: int, recipient_email: str) -> EmailJobTable:
+        """
+        Persist a new email job and wake the workers.
+
+        Args:
+            session (AsyncSession): Database session.
+            order_id (int): The order to confirm.
+            recipient_email (str): Email address to send to.
+
+        Returns:
+            EmailJobTable: The stored job.
+        """
+        job = EmailJobTable(order_id=order_id, recipient_email=recipient_email)
+        session.add(job)
+        await session.commit()
+        self.notify()
+        return job
+
+    async def backlog(self) -> int:
+        """Number of jobs waiting to be delivered, including retries not yet due"""
+        async with AsyncSession(async_engine) as session:
+            return (await session.exec(
+                select(func.count(EmailJobTable.id)).where(EmailJobTable.status == "pending")
+            )).one()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                processed = await self.process_batch()
+            except Exception as e:
+                print(f"[EMAIL OUTBOX] Worker error: {str(e)}")
+                processed = 0
+            if processed == 0 and not self._stopping:
+                # Sleep until the next poll or until a job is enqueued
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def process_batch(self) -> int:
+        """
+        Claim up to one batch of due jobs and deliver them concurrently.
+
+        Returns:
+            int: Number of jobs processed.
+        """
+        jobs = await self._claim_batch()
+        if jobs:
+            await asyncio.gather(*(self._process(job) for job in jobs))
+        return len(jobs)
+
+    async def _claim_batch(self) -> List[EmailJobTable]:
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=self.lease_seconds)
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            candidates = (await session.exec(
+                select(EmailJobTable.id)
+                .where(or_(
+                    and_(EmailJobTable.status == "pending", EmailJobTable.next_attempt_at <= now),
+                    and_(EmailJobTable.status == "sending", EmailJobTable.updated_at <= stale),
+                ))
+                .order_by(EmailJobTable.next_attempt_at, EmailJobTable.id)
+                .limit(self.batch_size)
+            )).all()
+
+            claimed_ids = []
+            for job_id in candidates:
+                result = await session.exec(
+                    update(EmailJobTable)
+                    .where(EmailJobTable.id == job_id)
+                    .where(or_(
+                        EmailJobTable.status == "pending",
+                        and_(EmailJobTable.status == "sending", EmailJobTable.updated_at <= stale),
+                    ))
+                    .values(status="sending", attempts=EmailJobTable.attempts + 1, updated_at=now)
+                )
+                if result.rowcount == 1:
+                    claimed_ids.append(job_id)
+            await session.commit()
+
+            if not claimed_ids:
+                return []
+            return list((await session.exec(
+                select(EmailJobTable).where(EmailJobTable.id.in_(claimed_ids))
+            )).all())
+
+    async def _process(self, job: EmailJobTable):
+        error = None
+        self.in_flight += 1
+        try:
+            await self.deliver(job)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        finally:
+            self.in_flight -= 1
+
+        now = datetime.utcnow()
+        async with AsyncSession(async_engine) as session:
+            stored = await session.get(EmailJobTable, job.id)
+            if error is None:
+                stored.status = "sent"
+                stored.sent_at = now
+                stored.last_error = None
+            elif stored.attempts >= self.max_attempts:
+                stored.status = "failed"
+                stored.last_error = error
+                print(f"[EMAIL OUTBOX] Job {job.id} failed after {stored.attempts} attempts: {error}")
+            else:
+                stored.status = "pending"
+                stored.last_error = error
+                stored.next_attempt_at = now + retry_delay(stored.attempts, self.backoff_seconds)
+            stored.updated_at = now
+            session.add(stored)
+            await session.commit()
@@ -0,0 +1,76 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import asyncio
+import functools
+import multiprocessing
+import os
+
+# Bounded worker pools for blocking work that must not run on the event loop
+EXECUTOR_WORKERS = {
+    "pdf": int(os.getenv("PDF_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    "email": int(os.getenv("EMAIL_EXECUTOR_WORKERS", "8")),
+    "export": int(os.getenv("EXPORT_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1)))),
+}
+
+# Process pools for CPU-bound batch work that would otherwise hold the GIL.
+# Callables and arguments sent to them must be picklable.
+PROCESS_WORKERS = {
+    "pdf-render": int(os.getenv("PDF_PROCESS_WORKERS", str(os.cpu_count() or 1))),
+}
+
+_executors: Dict[str, Executor] = {}
+
+def get_executor(name: str) -> Executor:
+    """
+    Return the named worker pool, creating it on first use.
+
+    Args:
+        name (str): Pool name, one of EXECUTOR_WORKERS or PROCESS_WORKERS.
+
+    Returns:
+        Executor: The bounded pool.
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        if name in PROCESS_WORKERS:
+            # Spawn rather than fork: the server process has live threads and an event loop
+            executor = ProcessPoolExecutor(
+                max_workers=PROCESS_WORKERS[name],
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS[name], thread_name_prefix=name)
+        _executors[name] = executor
+    return executor
+
+async def run_blocking(name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking callable on the named pool and await its result.
+
+    Args:
+        name (str): Pool name, one of EXECUTOR_WORKERS or PROCESS_WORKERS.
+        func (Callable): The blocking function.
+        *args: Positional arguments for the function.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        Any: The function's return value.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(name), functools.partial(func, *args, **kwargs))
+
+def queue_depths() -> Dict[str, int]:
+    """Tasks submitted to each started pool and not yet picked up by a worker"""
+    depths = {}
+    for name, executor in list(_executors.items()):
+        if isinstance(executor, ProcessPoolExecutor):
+            depths[name] = len(executor._pending_work_items)
+        else:
+            depths[name] = executor._work_queue.qsize()
+    return depths
+
+def shutdown_executors():
+    """Wait for in-flight PDF and email work, then stop all pools"""
+    while _executors:
+        _, executor = _executors.popitem()
+        executor.shutdown(wait=True)
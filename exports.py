@@ -0,0 +1,178 @@
+"""
+Flat CSV and Parquet exports of orders and their line items.
+
+Rows come from one server-side cursor (yield_per) over the orders joined
+with their items and are encoded batch by batch, so memory depends on
+EXPORT_BATCH_ROWS and EXPORT_ROW_GROUP_ROWS, not on the number of rows
+exported. Encoding runs on the "export" thread pool, so a large export does
+not hold up the other requests of the worker. pyarrow is imported on the
+first Parquet export rather than at startup, to keep worker start-up fast.
+"""
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence
+import csv
+import io
+import os
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from executors import run_blocking
+from models import OrderItemTable, OrderTable
+
+# Rows fetched from the cursor per round trip
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "5000"))
+# Rows per Parquet row group; a group is buffered, then written and sent as a whole
+EXPORT_ROW_GROUP_ROWS = int(os.getenv("EXPORT_ROW_GROUP_ROWS", "50000"))
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+# Name and source column of each export field; one row per line item
+EXPORT_COLUMNS = [
+    ("order_id", OrderTable.id),
+    ("created_at", OrderTable.created_at),
+    ("customer_name", OrderTable.customer_name),
+    ("currency", OrderTable.currency),
+    ("exchange_rate_version", OrderTable.exchange_rate_version),
+    ("order_total", OrderTable.order_total),
+    ("item_id", OrderItemTable.id),
+    ("product_name", OrderItemTable.product_name),
+    ("quantity", OrderItemTable.quantity),
+    ("unit_price", OrderItemTable.unit_price),
+    ("line_total", OrderItemTable.line_total),
+]
+EXPORT_FIELDS = [name for name, _ in EXPORT_COLUMNS]
+
+class StreamSink:
+    """Write-only, unseekable file object that lets zipfile and pyarrow stream their output"""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain"""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def export_statement(
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    batch_rows: int = EXPORT_BATCH_ROWS
+):
+    """
+    Build the flat order line query, oldest order first.
+
+    Args:
+        created_from (Optional[datetime]): Orders created at or after this time.
+        created_to (Optional[datetime]): Orders created before this time.
+        batch_rows (int): Rows fetched from the server-side cursor at a time.
+
+    Returns:
+        Select: The SQL statement, set up to be streamed.
+    """
+    statement = (
+        select(*(column.label(name) for name, column in EXPORT_COLUMNS))
+        .join(OrderItemTable, OrderItemTable.order_id == OrderTable.id)
+        .order_by(OrderTable.created_at, OrderTable.id, OrderItemTable.id)
+        .execution_options(yield_per=batch_rows)
+    )
+    if created_from is not None:
+        statement = statement.where(OrderTable.created_at >= created_from)
+    if created_to is not None:
+        statement = statement.where(OrderTable.created_at < created_to)
+    return statement
+
+async def iter_export_rows(session: AsyncSession, statement) -> AsyncIterator[Sequence[tuple]]:
+    """
+    Run an export statement on a server-side cursor.
+
+    Yields:
+        Sequence[tuple]: The next batch of at most `yield_per` rows.
+    """
+    result = await session.stream(statement)
+    async for rows in result.partitions():
+        yield rows
+
+def csv_bytes(rows: Sequence[Sequence]) -> bytes:
+    """Encode rows as CSV lines (blocking)"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+CSV_HEADER = csv_bytes([EXPORT_FIELDS])
+
+async def csv_chunks(batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+    """
+    Encode row batches as CSV with a header line.
+
+    Yields:
+        bytes: The header, then one chunk per batch.
+    """
+    header = CSV_HEADER
+    async for rows in batches:
+        yield header + await run_blocking("export", csv_bytes, rows)
+        header = b""
+    if header:
+        yield header
+
+def parquet_schema():
+    import pyarrow as pa
+    return pa.schema([
+        ("order_id", pa.int64()),
+        ("created_at", pa.timestamp("us")),
+        ("customer_name", pa.string()),
+        ("currency", pa.string()),
+        ("exchange_rate_version", pa.string()),
+        ("order_total", pa.decimal128(14, 2)),
+        ("item_id", pa.int64()),
+        ("product_name", pa.string()),
+        ("quantity", pa.int64()),
+        ("unit_price", pa.decimal128(12, 2)),
+        ("line_total", pa.decimal128(14, 2)),
+    ])
+
+def write_row_group(writer, rows: List[tuple]):
+    """Convert rows to columns and write them as one row group (blocking)"""
+    import pyarrow as pa
+    schema = writer.schema
+    arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)]
+    writer.write_table(pa.Table.from_arrays(arrays, schema=schema), row_group_size=len(rows))
+
+async def parquet_chunks(
+    batches: AsyncIterator[Sequence[tuple]],
+    row_group_rows: int = EXPORT_ROW_GROUP_ROWS
+) -> AsyncIterator[bytes]:
+    """
+    Encode row batches as one Parquet file with row groups of `row_group_rows` rows.
+    Only the rows of the current group are held in memory.
+
+    Yields:
+        bytes: The file, one chunk per completed row group, then the footer.
+    """
+    import pyarrow.parquet as pq
+
+    rows: List[tuple] = []
+    sink = StreamSink()
+    with pq.ParquetWriter(sink, parquet_schema()) as writer:
+        async for batch in batches:
+            rows.extend(batch)
+            while len(rows) >= row_group_rows:
+                group, rows = rows[:row_group_rows], rows[row_group_rows:]
+                await run_blocking("export", write_row_group, writer, group)
+                yield sink.drain()
+        if rows:
+            await run_blocking("export", write_row_group, writer, rows)
+    yield sink.drain()
@@ -101,9 +101,9 @@ const OrderConfirmation = ({ orderData, onCreateAnotherOrder }) => {
       if (response.ok) {
         const result = await response.json()
         if (result.simulation) {
-          message.success(`📧 Email simulation completed! In production, confirmation would be sent to ${emailAddress}`, 5)
+          message.success(`📧 Email simulation queued! In production, confirmation would be sent to ${emailAddress}`, 5)
         } else {
-          message.success(`Order confirmation sent to ${emailAddress}`)
+          message.success(`Order confirmation queued for ${emailAddress}`)
         }
         setEmailModalVisible(false)
         setEmailAddress('')
@@ -113,6 +113,8 @@ const useOrderManagement = (predefinedProducts, exchangeRates, setShowOrderConfi
         method: "POST",
         headers: {
           "Content-Type": "application/json",
+          // Lets the backend recognise a retried submission instead of creating a second order
+          "Idempotency-Key": crypto.randomUUID(),
         },
         body: JSON.stringify(orderData)
       })
@@ -121,6 +123,11 @@ const useOrderManagement = (predefinedProducts, exchangeRates, setShowOrderConfi
         const result = await response.text() // Get HTML response
         setOrderConfirmationData(result) // Store the HTML response
         setShowOrderConfirmation(true) // Show order confirmation component
+      } else if (response.status === 422) {
+        // Validation errors list every problem with the order
+        const { detail } = await response.json()
+        const messages = Array.isArray(detail) ? detail.map((error) => error.msg) : [String(detail)]
+        setSubmitError("Order submission failed: " + messages.join(" "))
       } else {
         const errorText = await response.text()
         setSubmitError("Order submission failed: " + errorText)
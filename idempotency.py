@@ -0,0 +1,155 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+import asyncio
+import hashlib
+import os
+
+from sqlalchemy import delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import async_engine
+from models import IdempotencyKeyTable
+
+# Idempotency configuration
+IDEMPOTENCY_KEY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", str(24 * 3600)))
+IDEMPOTENCY_SWEEP_SECONDS = float(os.getenv("IDEMPOTENCY_SWEEP_SECONDS", "600"))
+IDEMPOTENCY_CACHE_ENTRIES = int(os.getenv("IDEMPOTENCY_CACHE_ENTRIES", "10000"))
+MAX_KEY_LENGTH = 255
+
+def request_fingerprint(payload: bytes) -> str:
+    """SHA-256 of a canonical request payload"""
+    return hashlib.sha256(payload).hexdigest()
+
+class StoredResponse(NamedTuple):
+    """The response recorded for an idempotency key"""
+    request_hash: str
+    order_id: int
+    status_code: int
+    body: str
+    created_at: datetime
+
+class IdempotencyStore:
+    """
+    Idempotency keys of created orders, in the idempotency_keys table with
+    a per-worker LRU in front.
+
+    A key is inserted in the same transaction as its order, so of two
+    concurrent submissions with the same key exactly one commits; the other
+    fails on the primary key, rolls its order back and replays the winner's
+    response. Keys are kept for ttl_seconds and then swept in the background.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = IDEMPOTENCY_KEY_TTL_SECONDS,
+        sweep_seconds: float = IDEMPOTENCY_SWEEP_SECONDS,
+        cache_entries: int = IDEMPOTENCY_CACHE_ENTRIES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.sweep_seconds = sweep_seconds
+        self.cache_entries = cache_entries
+        self._cache: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+        self.cache_hits = 0
+        self.replays = 0
+
+    def _expired(self, stored: StoredResponse) -> bool:
+        return stored.created_at <= datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+
+    def remember(self, key: str, stored: StoredResponse):
+        """Keep a committed key in the front cache"""
+        if not self.cache_entries:
+            return
+        self._cache[key] = stored
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+
+    async def get(self, session: AsyncSession, key: str) -> Optional[StoredResponse]:
+        """
+        Look a key up in the front cache, then in the database.
+
+        Args:
+            session (AsyncSession): Database session, only used on a cache miss.
+            key (str): The Idempotency-Key header value.
+
+        Returns:
+            Optional[StoredResponse]: The recorded response, or None for a new or expired key.
+        """
+        stored = self._cache.get(key)
+        if stored is not None:
+            if not self._expired(stored):
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return stored
+            del self._cache[key]
+
+        row = await session.get(IdempotencyKeyTable, key)
+        if row is None or self._expired(row):
+            return None
+        stored = StoredResponse(row.request_hash, row.order_id, row.status_code, row.response_body, row.created_at)
+        self.remember(key, stored)
+        return stored
+
+    async def record(self, session: AsyncSession, key: str, request_hash: str, order_id: int, body: str, status_code: int = 200) -> StoredResponse:
+        """
+        Add a key to the caller's transaction; call `remember` once it commits.
+        An expired row for the same key that has not been swept yet is
+        deleted in that transaction, so the key can be used again.
+
+        Args:
+            session (AsyncSession): The session creating the order; not committed here.
+            key (str): The Idempotency-Key header value.
+            request_hash (str): Fingerprint of the order payload.
+            order_id (int): The order created for the key.
+            body (str): The response to replay.
+            status_code (int): Its status code.
+
+        Returns:
+            StoredResponse: What will be replayed for the key.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        await session.exec(
+            delete(IdempotencyKeyTable).where(IdempotencyKeyTable.key == key, IdempotencyKeyTable.created_at <= cutoff)
+        )
+        row = IdempotencyKeyTable(key=key, request_hash=request_hash, order_id=order_id, status_code=status_code, response_body=body)
+        session.add(row)
+        return StoredResponse(request_hash, order_id, status_code, body, row.created_at)
+
+    async def sweep(self) -> int:
+        """
+        Delete expired keys.
+
+        Returns:
+            int: The number of keys deleted.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        async with AsyncSession(async_engine) as session:
+            result = await session.exec(delete(IdempotencyKeyTable).where(IdempotencyKeyTable.created_at <= cutoff))
+            await session.commit()
+        for key in [key for key, stored in self._cache.items() if stored.created_at <= cutoff]:
+            del self._cache[key]
+        return result.rowcount
+
+    def start(self):
+        """Start the background sweeper on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background sweeper"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.sweep_seconds)
+            try:
+                deleted = await self.sweep()
+                if deleted:
+                    print(f"[IDEMPOTENCY] Swept {deleted} expired keys")
+            except Exception as e:
+                print(f"[IDEMPOTENCY] Sweep failed: {str(e)}")
@@ -0,0 +1,220 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters and histograms are updated on the request path and cost a
+dictionary lookup, a bisect and a few additions under a lock. Gauges are
+callbacks evaluated only when /metrics is scraped. Values are per worker
+process; Prometheus adds them up across the workers it scrapes.
+"""
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+import threading
+from time import perf_counter
+
+# Upper bounds in seconds, from sub-millisecond cache hits to multi-second PDF exports
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render a label set, e.g. {method="GET",route="/orders"}"""
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic count per label set"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}_total{format_labels(self.labelnames, labels)} {format_value(value)}"
+
+class Histogram:
+    """Observations counted into cumulative buckets per label set"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: a count per bucket (the last one is +Inf), then the sum
+        self._values: Dict[tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def time(self, *labels: str) -> "Timer":
+        """Context manager observing the duration of its block"""
+        return Timer(self, labels)
+
+    def count(self, *labels: str) -> int:
+        counts = self._values.get(labels)
+        return sum(counts[:-1]) if counts else 0
+
+    def samples(self) -> Iterable[str]:
+        for labels, counts in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts[:-1]):
+                cumulative += count
+                le = 'le="' + format_value(bound) + '"'
+                yield f"{self.name}_bucket{format_labels(self.labelnames, labels, le)} {cumulative}"
+            rendered = format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{rendered} {format_value(counts[-1])}"
+            yield f"{self.name}_count{rendered} {cumulative}"
+
+class Timer:
+    """Times a block with perf_counter and records it in a histogram"""
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, labels: tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(perf_counter() - self.started, *self.labels)
+        return False
+
+GaugeValue = Union[float, Mapping[tuple, float]]
+
+class Gauge:
+    """Current value per label set, set directly or read from a callback at scrape time"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, callback: Optional[Callable[[], GaugeValue]] = None, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._values: Dict[tuple, float] = {}
+
+    def set(self, value: float, *labels: str):
+        self._values[labels] = value
+
+    def samples(self) -> Iterable[str]:
+        values = self._values
+        if self.callback is not None:
+            values = self.callback()
+            if not isinstance(values, Mapping):
+                values = {(): values}
+        for labels, sample in list(values.items()):
+            yield f"{self.name}{format_labels(self.labelnames, labels)} {format_value(sample)}"
+
+class Registry:
+    """The metrics exposed by one process"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, callback: Optional[Callable[[], GaugeValue]] = None, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, callback, labelnames))
+
+    def render(self) -> str:
+        """
+        Text exposition of every metric. A failing gauge callback is
+        skipped so one broken source does not hide the others.
+
+        Returns:
+            str: The /metrics response body.
+        """
+        lines = []
+        for metric in list(self._metrics.values()):
+            try:
+                samples = list(metric.samples())
+            except Exception as e:
+                print(f"[METRICS] Collecting {metric.name} failed: {str(e)}")
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "order_stage_duration_seconds", "Time spent in each hot stage of order handling", ("stage",)
+)
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per route template, so
+    /orders/1 and /orders/2 share one series. Unmatched paths are grouped
+    under a single label to keep the number of series bounded.
+    """
+
+    def __init__(self, app, histogram: Histogram = HTTP_REQUEST_SECONDS):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            self.histogram.observe(
+                perf_counter() - started,
+                scope["method"],
+                getattr(route, "path_format", None) or "unmatched",
+                str(status)
+            )
@@ -0,0 +1,48 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlmodel import SQLModel
+
+import models  # noqa: F401 - registers the tables on SQLModel.metadata
+from database import DATABASE_URL, engine
+
+config = context.config
+# The alembic CLI logs as configured in alembic.ini; run_migrations() turns this
+# off so the running app's and uvicorn's logging are left alone
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = SQLModel.metadata
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave the PostgreSQL-only indexes of migration 0007 out of autogenerate"""
+    return not (type_ == "index" and name in models.POSTGRES_ONLY_INDEXES)
+
+def run_migrations_offline():
+    """Emit the migration SQL without connecting (alembic upgrade --sql)"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """Run migrations on a connection from the application engine"""
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
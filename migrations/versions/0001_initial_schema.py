@@ -0,0 +1,65 @@
+"""Initial schema: orders, order_items and email_jobs
+
+Databases created earlier by init-db.sql or SQLModel.metadata.create_all
+already have some of these tables; only the missing ones are created.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-08-20
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "orders" not in existing:
+        op.create_table(
+            "orders",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("customer_name", sa.String(), nullable=False),
+            sa.Column("currency", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_orders_customer_name", "orders", ["customer_name"])
+
+    if "order_items" not in existing:
+        op.create_table(
+            "order_items",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("product_name", sa.String(), nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.Column("order_id", sa.Integer(), sa.ForeignKey("orders.id"), nullable=False),
+        )
+        op.create_index("ix_order_items_product_name", "order_items", ["product_name"])
+
+    if "email_jobs" not in existing:
+        op.create_table(
+            "email_jobs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("order_id", sa.Integer(), sa.ForeignKey("orders.id"), nullable=False),
+            sa.Column("recipient_email", sa.String(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("last_error", sa.String(), nullable=True),
+            sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.Column("sent_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_email_jobs_order_id", "email_jobs", ["order_id"])
+        op.create_index("ix_email_jobs_status", "email_jobs", ["status"])
+        op.create_index("ix_email_jobs_next_attempt_at", "email_jobs", ["next_attempt_at"])
+
+
+def downgrade():
+    op.drop_table("email_jobs")
+    op.drop_table("order_items")
+    op.drop_table("orders")
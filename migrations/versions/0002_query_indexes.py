@@ -0,0 +1,41 @@
+"""Indexes for the real query patterns
+
+- order_items.order_id: loading an order's items (selectinload, joins)
+  was a sequential scan of order_items.
+- orders (created_at, id): keyset pagination, date-range reports and
+  exports all filter and sort on it.
+
+On PostgreSQL the indexes are built CONCURRENTLY so large tables stay
+writable during the migration.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-08-20
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_order_items_order_id", "order_items", ["order_id"]),
+    ("ix_orders_created_at_id", "orders", ["created_at", "id"]),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
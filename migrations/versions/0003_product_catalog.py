@@ -0,0 +1,53 @@
+"""Product catalog: products and catalog_version tables
+
+Seeds the products that used to be hardcoded in app.py.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-08-22
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# Prices in CAD (base currency)
+SEED_PRODUCTS = [
+    ("Laptop", "1200.00"),
+    ("Mouse", "25.00"),
+    ("Keyboard", "75.00"),
+    ("Monitor", "300.00"),
+    ("Headphones", "150.00"),
+    ("Webcam", "80.00"),
+    ("Smartphone", "800.00"),
+    ("Tablet", "500.00"),
+    ("Charger", "30.00"),
+    ("Speaker", "120.00"),
+]
+
+
+def upgrade():
+    products = op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("price", sa.Numeric(12, 2), nullable=False),
+    )
+    op.create_index("ix_products_name", "products", ["name"], unique=True)
+    catalog_version = op.create_table(
+        "catalog_version",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+    op.bulk_insert(products, [{"name": name, "price": price} for name, price in SEED_PRODUCTS])
+    op.bulk_insert(catalog_version, [{"id": 1, "version": 1}])
+
+
+def downgrade():
+    op.drop_table("catalog_version")
+    op.drop_index("ix_products_name", table_name="products")
+    op.drop_table("products")
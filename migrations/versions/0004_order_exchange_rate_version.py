@@ -0,0 +1,24 @@
+"""Record the exchange rate version each order was priced with
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-08-29
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("orders") as batch_op:
+        batch_op.add_column(sa.Column("exchange_rate_version", sa.String(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("orders") as batch_op:
+        batch_op.drop_column("exchange_rate_version")
@@ -0,0 +1,32 @@
+"""Store unit prices, line totals and order totals
+
+Existing rows are left NULL; fill them with backfill_order_totals.py.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-09-02
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("order_items") as batch_op:
+        batch_op.add_column(sa.Column("unit_price", sa.Numeric(12, 2), nullable=True))
+        batch_op.add_column(sa.Column("line_total", sa.Numeric(14, 2), nullable=True))
+    with op.batch_alter_table("orders") as batch_op:
+        batch_op.add_column(sa.Column("order_total", sa.Numeric(14, 2), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("orders") as batch_op:
+        batch_op.drop_column("order_total")
+    with op.batch_alter_table("order_items") as batch_op:
+        batch_op.drop_column("line_total")
+        batch_op.drop_column("unit_price")
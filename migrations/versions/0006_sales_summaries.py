@@ -0,0 +1,48 @@
+"""Sales summary tables for /reports/sales
+
+Filled incrementally as orders are created when REPORTS_SUMMARY_TABLES is
+enabled; rebuild them from the orders with `python reports.py --rebuild`.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-09-04
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "sales_daily_products",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("currency", sa.String(), primary_key=True),
+        sa.Column("product_name", sa.String(), primary_key=True),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Numeric(18, 2), nullable=False),
+    )
+    op.create_table(
+        "sales_daily_currencies",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("currency", sa.String(), primary_key=True),
+        sa.Column("orders", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Numeric(18, 2), nullable=False),
+    )
+    op.create_table(
+        "sales_customers",
+        sa.Column("customer_name", sa.String(), primary_key=True),
+        sa.Column("currency", sa.String(), primary_key=True),
+        sa.Column("orders", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Numeric(18, 2), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("sales_customers")
+    op.drop_table("sales_daily_currencies")
+    op.drop_table("sales_daily_products")
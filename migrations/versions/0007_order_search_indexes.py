@@ -0,0 +1,50 @@
+"""Indexes for filtering and searching GET /orders
+
+- orders (currency, created_at, id): currency filter in keyset order.
+- order_items (product_name, order_id): orders containing a product.
+- PostgreSQL only: lower(customer_name) with text_pattern_ops for
+  case-insensitive prefix search, and a pg_trgm GIN index for fuzzy search.
+  Neither can be declared on the models portably; see models.POSTGRES_ONLY_INDEXES.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-09-08
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_orders_currency_created_at_id", "orders", ["currency", "created_at", "id"]),
+    ("ix_order_items_product_name_order_id", "order_items", ["product_name", "order_id"]),
+]
+
+POSTGRES_INDEXES = [
+    ("ix_orders_customer_name_lower_prefix", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_customer_name_lower_prefix ON orders (lower(customer_name) text_pattern_ops)"),
+    ("ix_orders_customer_name_trgm", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_customer_name_trgm ON orders USING gin (customer_name gin_trgm_ops)"),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+            for _, statement in POSTGRES_INDEXES:
+                op.execute(statement)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        for name, _ in POSTGRES_INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
@@ -1,15 +1,26 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
+
+# Indexes created by migration 0007 on PostgreSQL only (expression and pg_trgm
+# indexes); autogenerate must not try to drop them
+POSTGRES_ONLY_INDEXES = {"ix_orders_customer_name_lower_prefix", "ix_orders_customer_name_trgm"}
 
 class OrderItemTable(SQLModel, table=True):
     """Database table for order items"""
     __tablename__ = "order_items"
+    # GET /orders?product= looks up the orders containing a product
+    __table_args__ = (Index("ix_order_items_product_name_order_id", "product_name", "order_id"),)
     
     id: Optional[int] = Field(default=None, primary_key=True)
     product_name: str = Field(index=True)
     quantity: int
-    order_id: int = Field(foreign_key="orders.id")
+    # Prices in the order currency, frozen when the order is created
+    unit_price: Optional[Decimal] = Field(default=None, max_digits=12, decimal_places=2)
+    line_total: Optional[Decimal] = Field(default=None, max_digits=14, decimal_places=2)
+    order_id: int = Field(foreign_key="orders.id", index=True)
     
     # Relationship
     order: "OrderTable" = Relationship(back_populates="order_items")
@@ -17,14 +28,69 @@ class OrderItemTable(SQLModel, table=True):
 class OrderTable(SQLModel, table=True):
     """Database table for orders"""
     __tablename__ = "orders"
+    # Keyset pagination, reports and exports filter and sort on (created_at, id),
+    # GET /orders?currency= on (currency, created_at, id)
+    __table_args__ = (
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        Index("ix_orders_currency_created_at_id", "currency", "created_at", "id"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     customer_name: str = Field(index=True)
     currency: str = Field(default="CAD")
+    exchange_rate_version: Optional[str] = Field(default=None)  # Rates the order was priced with
+    order_total: Optional[Decimal] = Field(default=None, max_digits=14, decimal_places=2)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
-    # Relationship
-    order_items: List[OrderItemTable] = Relationship(back_populates="order")
+    # Relationship; items are always listed in insertion order
+    order_items: List[OrderItemTable] = Relationship(
+        back_populates="order",
+        sa_relationship_kwargs={"order_by": "OrderItemTable.id"}
+    )
+
+class ProductTable(SQLModel, table=True):
+    """Database table for the product catalog"""
+    __tablename__ = "products"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(index=True, unique=True)
+    price: Decimal = Field(max_digits=12, decimal_places=2)  # Price in CAD (base currency)
+
+class CatalogVersionTable(SQLModel, table=True):
+    """Single-row table holding the catalog version; bumped on every product change"""
+    __tablename__ = "catalog_version"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    version: int = Field(default=1)
+
+# Sales summaries, kept up to date as orders are created when REPORTS_SUMMARY_TABLES is enabled
+class SalesDailyProductTable(SQLModel, table=True):
+    """Quantity and revenue per day, currency and product"""
+    __tablename__ = "sales_daily_products"
+    
+    day: date = Field(primary_key=True)
+    currency: str = Field(primary_key=True)
+    product_name: str = Field(primary_key=True)
+    quantity: int = Field(default=0)
+    revenue: Decimal = Field(default=0, max_digits=18, decimal_places=2)
+
+class SalesDailyCurrencyTable(SQLModel, table=True):
+    """Order count and revenue per day and currency"""
+    __tablename__ = "sales_daily_currencies"
+    
+    day: date = Field(primary_key=True)
+    currency: str = Field(primary_key=True)
+    orders: int = Field(default=0)
+    revenue: Decimal = Field(default=0, max_digits=18, decimal_places=2)
+
+class SalesCustomerTable(SQLModel, table=True):
+    """Order count and revenue per customer and currency"""
+    __tablename__ = "sales_customers"
+    
+    customer_name: str = Field(primary_key=True)
+    currency: str = Field(primary_key=True)
+    orders: int = Field(default=0)
+    revenue: Decimal = Field(default=0, max_digits=18, decimal_places=2)
 
 # Request/Response models (these inherit from the table models but can be customized)
 class OrderItemCreate(SQLModel):
@@ -37,6 +103,8 @@ class OrderItemRead(SQLModel):
     id: int
     product_name: str
     quantity: int
+    unit_price: Optional[Decimal] = None
+    line_total: Optional[Decimal] = None
     order_id: int
 
 class OrderCreate(SQLModel):
@@ -50,5 +118,95 @@ class OrderRead(SQLModel):
     id: int
     customer_name: str
     currency: str
+    exchange_rate_version: Optional[str] = None
+    order_total: Optional[Decimal] = None
     created_at: datetime
     order_items: List[OrderItemRead]
+
+class EmailJobTable(SQLModel, table=True):
+    """Database table for queued order confirmation emails (the email outbox)"""
+    __tablename__ = "email_jobs"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    order_id: int = Field(foreign_key="orders.id", index=True)
+    recipient_email: str
+    status: str = Field(default="pending", index=True)  # pending, sending, sent, failed
+    attempts: int = Field(default=0)
+    last_error: Optional[str] = None
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
+
+class IdempotencyKeyTable(SQLModel, table=True):
+    """Database table of Idempotency-Key values and the response of the order they created"""
+    __tablename__ = "idempotency_keys"
+
+    key: str = Field(primary_key=True, max_length=255)
+    request_hash: str  # SHA-256 of the order payload, to reject a key reused for another order
+    order_id: int = Field(foreign_key="orders.id")
+    status_code: int = Field(default=200)
+    response_body: str
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)  # expiry sweeps
+
+class EmailJobRead(SQLModel):
+    """Model for reading email jobs"""
+    id: int
+    order_id: int
+    recipient_email: str
+    status: str
+    attempts: int
+    last_error: Optional[str]
+    next_attempt_at: datetime
+    created_at: datetime
+    updated_at: datetime
+    sent_at: Optional[datetime]
+
+class BulkPdfRequest(SQLModel):
+    """Model for bulk PDF export requests; select by order_ids or by a created_at range"""
+    order_ids: Optional[List[int]] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    format: str = "zip"  # zip (one PDF per order) or pdf (one combined document)
+
+class OrderBatchCreate(SQLModel):
+    """Model for creating many orders in one request"""
+    orders: List[OrderCreate]
+
+class ProductUpdate(SQLModel):
+    """Model for adding a product or changing its price"""
+    price: Decimal = Field(gt=0, max_digits=12, decimal_places=2)
+
+# Plain, picklable copies of orders for caches and process-pool workers
+def order_snapshot(order: OrderTable) -> dict:
+    """
+    Copy an order and its items into plain, picklable data.
+    
+    Args:
+        order (OrderTable): The order object with its items loaded.
+        
+    Returns:
+        dict: The order in OrderRead shape.
+    """
+    return OrderRead.model_validate(order).model_dump()
+
+def order_from_snapshot(snapshot: dict) -> OrderTable:
+    """
+    Rebuild a transient order object from `order_snapshot` output.
+    
+    Args:
+        snapshot (dict): The order in OrderRead shape.
+        
+    Returns:
+        OrderTable: An order not attached to any session.
+    """
+    order = OrderTable(
+        id=snapshot["id"],
+        customer_name=snapshot["customer_name"],
+        currency=snapshot["currency"],
+        exchange_rate_version=snapshot["exchange_rate_version"],
+        order_total=snapshot["order_total"],
+        created_at=snapshot["created_at"]
+    )
+    order.order_items = [OrderItemTable(**item) for item in snapshot["order_items"]]
+    return order
@@ -0,0 +1,206 @@
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+import hashlib
+import os
+import time
+
+# Cache configuration
+ORDER_CACHE_MAX_ENTRIES = int(os.getenv("ORDER_CACHE_MAX_ENTRIES", "10000"))
+ORDER_CACHE_TTL_SECONDS = float(os.getenv("ORDER_CACHE_TTL_SECONDS", "3600"))  # 0 keeps entries until evicted
+# Optional backend shared by every worker: redis://host:6379/0, or memory:// for a per-process stand-in
+ORDER_CACHE_URL = os.getenv("ORDER_CACHE_URL", "")
+
+def order_etag(body: bytes) -> str:
+    """Strong ETag of a serialized order"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+class CachedOrder(NamedTuple):
+    """A serialized OrderRead payload and its ETag"""
+    body: bytes
+    etag: str
+
+class MemoryBackend:
+    """Shared-backend stand-in that keeps entries in this process, with expiry like Redis SET EX"""
+
+    def __init__(self):
+        self._entries: Dict[str, tuple] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        self._entries[key] = (value, time.monotonic() + ttl_seconds if ttl_seconds else 0)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def close(self):
+        pass
+
+class RedisBackend:
+    """Backend on any Redis-compatible server; needs the optional redis package"""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("ORDER_CACHE_URL points at Redis but the redis package is not installed") from e
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        await self._client.set(key, value, ex=int(ttl_seconds) or None)
+
+    async def delete(self, key: str):
+        await self._client.delete(key)
+
+    async def close(self):
+        await self._client.aclose()
+
+def backend_from_url(url: str = ORDER_CACHE_URL):
+    """
+    Create the shared backend for a configured URL.
+
+    Args:
+        url (str): redis:// or rediss:// URL, memory://, or "" for none.
+
+    Returns:
+        The backend, or None for a per-worker cache only.
+    """
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return MemoryBackend()
+    return RedisBackend(url)
+
+class OrderCache:
+    """
+    Bounded LRU cache of serialized orders, keyed by order id.
+
+    Orders do not change after they are created, so entries are filled on
+    creation and on first read and only leave by eviction or expiry. Each
+    worker keeps its own LRU in front of the optional shared backend;
+    backend errors are counted and treated as misses so reads fall through
+    to the database.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ORDER_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = ORDER_CACHE_TTL_SECONDS,
+        backend=None,
+        key_prefix: str = "order:"
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.key_prefix = key_prefix
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shared_hits = 0
+        self.shared_errors = 0
+
+    async def get(self, order_id: int) -> Optional[CachedOrder]:
+        """
+        Look an order up in this worker, then in the shared backend.
+
+        Args:
+            order_id (int): The order id.
+
+        Returns:
+            Optional[CachedOrder]: The payload, or None on a miss.
+        """
+        entry = self._entries.get(order_id)
+        if entry is not None:
+            cached, expires_at = entry
+            if not expires_at or expires_at > time.monotonic():
+                self._entries.move_to_end(order_id)
+                self.hits += 1
+                return cached
+            del self._entries[order_id]
+
+        if self.backend is not None:
+            try:
+                body = await self.backend.get(self.key_prefix + str(order_id))
+            except Exception as e:
+                self.shared_errors += 1
+                print(f"[ORDER CACHE] Shared backend read failed: {str(e)}")
+                body = None
+            if body is not None:
+                self.shared_hits += 1
+                self.hits += 1
+                return self._store(order_id, bytes(body))
+
+        self.misses += 1
+        return None
+
+    async def put(self, order_id: int, body: bytes) -> CachedOrder:
+        """
+        Store a serialized order in this worker and the shared backend.
+
+        Args:
+            order_id (int): The order id.
+            body (bytes): The OrderRead JSON.
+
+        Returns:
+            CachedOrder: The stored payload with its ETag.
+        """
+        cached = self._store(order_id, body)
+        if self.backend is not None:
+            try:
+                await self.backend.set(self.key_prefix + str(order_id), body, self.ttl_seconds)
+            except Exception as e:
+                self.shared_errors += 1
+                print(f"[ORDER CACHE] Shared backend write failed: {str(e)}")
+        return cached
+
+    async def invalidate(self, order_id: int):
+        """Drop an order everywhere, e.g. after changing it outside create_order"""
+        self._entries.pop(order_id, None)
+        if self.backend is not None:
+            await self.backend.delete(self.key_prefix + str(order_id))
+
+    def clear(self):
+        """Empty this worker's LRU"""
+        self._entries.clear()
+
+    async def close(self):
+        """Release the shared backend's connections"""
+        if self.backend is not None:
+            await self.backend.close()
+
+    def metrics(self) -> Dict[str, float]:
+        """Counters and size of this worker's cache"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "shared_backend": type(self.backend).__name__ if self.backend is not None else None,
+            "shared_hits": self.shared_hits,
+            "shared_errors": self.shared_errors,
+        }
+
+    def _store(self, order_id: int, body: bytes) -> CachedOrder:
+        cached = CachedOrder(body, order_etag(body))
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0
+        self._entries[order_id] = (cached, expires_at)
+        self._entries.move_to_end(order_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return cached
@@ -0,0 +1,98 @@
+"""
+Sending order confirmation emails, loaded on the first email delivery.
+"""
+from email.message import EmailMessage
+import os
+import smtplib
+import time
+
+from models import OrderTable
+
+# SMTP settings; without SMTP_HOST emails are only simulated
+SMTP_HOST = os.getenv("SMTP_HOST")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USER = os.getenv("EMAIL_USER")
+SMTP_PASSWORD = os.getenv("EMAIL_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() == "true"
+EMAIL_FROM = os.getenv("EMAIL_FROM", SMTP_USER or "orders@example.com")
+
+def send_order_email_smtp(order: OrderTable, pdf_bytes: bytes, recipient_email: str, html: str):
+    """
+    Send the order confirmation email with PDF attachment through SMTP_HOST.
+    
+    Args:
+        order (OrderTable): The order object.
+        pdf_bytes (bytes): The PDF attachment.
+        recipient_email (str): Email address to send to.
+        html (str): The HTML order confirmation used as the body.
+    """
+    message = EmailMessage()
+    message["Subject"] = f"Order Confirmation #{order.id} - {order.customer_name}"
+    message["From"] = EMAIL_FROM
+    message["To"] = recipient_email
+    message.set_content(f"Your order #{order.id} has been received. The confirmation is attached.")
+    message.add_alternative(html, subtype="html")
+    message.add_attachment(
+        pdf_bytes,
+        maintype="application",
+        subtype="pdf",
+        filename=f"order_confirmation_{order.id}.pdf"
+    )
+    
+    with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30) as smtp:
+        if SMTP_STARTTLS:
+            smtp.starttls()
+        if SMTP_USER and SMTP_PASSWORD:
+            smtp.login(SMTP_USER, SMTP_PASSWORD)
+        smtp.send_message(message)
+
+def send_order_email(order: OrderTable, pdf_bytes: bytes, recipient_email: str, html: str) -> bool:
+    """
+    Send order confirmation email with PDF attachment.
+    Without SMTP_HOST configured this is a simulation - no actual email is sent.
+    
+    Args:
+        order (OrderTable): The order object.
+        pdf_bytes (bytes): The PDF attachment.
+        recipient_email (str): Email address to send to.
+        html (str): The HTML order confirmation used as the body.
+        
+    Returns:
+        bool: True if the email was sent (always True in simulation mode).
+    """
+    if SMTP_HOST:
+        try:
+            send_order_email_smtp(order, pdf_bytes, recipient_email, html)
+            return True
+        except Exception as e:
+            print(f"[EMAIL] Error sending to {recipient_email} via {SMTP_HOST}: {str(e)}")
+            return False
+
+    try:
+        # Simulate email processing delay
+        time.sleep(1)  # Simulate email sending time
+        
+        # Log the simulated email details
+        print(f"[EMAIL SIMULATION] Order confirmation email would be sent:")
+        print(f"  To: {recipient_email}")
+        print(f"  Subject: Order Confirmation #{order.id} - {order.customer_name}")
+        print(f"  Order ID: {order.id}")
+        print(f"  Customer: {order.customer_name}")
+        print(f"  Date: {order.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"  Currency: {order.currency}")
+        print(f"  PDF Attachment: order_confirmation_{order.id}.pdf ({len(pdf_bytes)} bytes)")
+        print(f"  Email Body: HTML formatted order confirmation")
+        print(f"[EMAIL SIMULATION] Email successfully 'sent' (simulation mode)")
+        
+        # In a real implementation, you would:
+        # 1. Configure SMTP settings (Gmail, SendGrid, etc.)
+        # 2. Create the email with HTML template
+        # 3. Attach the PDF file
+        # 4. Send via SMTP
+        # 5. Handle any email service errors
+        
+        return True  # Always succeed in simulation mode
+        
+    except Exception as e:
+        print(f"[EMAIL SIMULATION] Error in simulation: {str(e)}")
+        return False
@@ -0,0 +1,234 @@
+"""
+Order confirmation PDFs.
+
+reportlab takes longer to import than most of the app, so app.py imports
+this module on the first PDF request or in its warm-up, never at import
+time. Process-pool workers import only this module and the models, not
+the app.
+"""
+from datetime import datetime
+from typing import Dict, List, Mapping
+import io
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+
+from metrics import STAGE_SECONDS
+from models import OrderTable, order_from_snapshot
+from pricing import order_line_prices
+
+class OrderPdfTemplate:
+    """
+    Paragraph and table styles for the order confirmation PDF.
+    
+    Everything here is identical from one order to the next, so it is built
+    once and shared (read-only) by every render, including concurrent renders
+    on the PDF pool. Only flowables that depend on the order are created per
+    render.
+    """
+    
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        self.normal_style = styles['Normal']
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=20,
+            textColor=colors.HexColor('#1890ff'),
+            spaceAfter=30,
+            alignment=1  # Center alignment
+        )
+        
+        self.heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#1890ff'),
+            spaceAfter=12
+        )
+        
+        self.order_info_col_widths = [2*inch, 3*inch]
+        self.order_info_style = TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f2ff')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d9d9d9')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ])
+        
+        self.items_col_widths = [2.5*inch, 1*inch, 1.5*inch, 1.5*inch]
+        self.items_style = TableStyle([
+            # Header row
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1890ff')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            
+            # Data rows
+            ('BACKGROUND', (0, 1), (-1, -2), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -2), colors.black),
+            ('ALIGN', (0, 1), (0, -2), 'LEFT'),  # Product names left-aligned
+            ('ALIGN', (1, 1), (-1, -2), 'CENTER'),  # Numbers center-aligned
+            ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -2), 10),
+            
+            # Total row
+            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#f0f2ff')),
+            ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
+            ('ALIGN', (0, -1), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, -1), (-1, -1), 11),
+            
+            # Grid
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d9d9d9')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ])
+    
+    def render(
+        self,
+        order: OrderTable,
+        prices: Mapping[str, float],
+        rates: Mapping[str, float]
+    ) -> bytes:
+        """
+        Render the confirmation PDF for one order in memory.
+        
+        Args:
+            order (OrderTable): The order object containing customer and item details.
+            prices (Mapping[str, float]): Product prices in CAD, for orders without frozen prices.
+            rates (Mapping[str, float]): Exchange rates from CAD, for orders without frozen prices.
+            
+        Returns:
+            bytes: The generated PDF document.
+        """
+        return self.render_many([order], prices, rates)
+    
+    def render_many(
+        self,
+        orders: List[OrderTable],
+        prices: Mapping[str, float],
+        rates: Mapping[str, float]
+    ) -> bytes:
+        """
+        Render the confirmations of several orders into one document,
+        each order starting on a new page.
+        
+        Args:
+            orders (List[OrderTable]): The orders with their items loaded.
+            prices (Mapping[str, float]): Product prices in CAD, for orders without frozen prices.
+            rates (Mapping[str, float]): Exchange rates from CAD, for orders without frozen prices.
+            
+        Returns:
+            bytes: The generated PDF document.
+        """
+        # Render into an in-memory buffer; nothing is written to disk
+        buffer = io.BytesIO()
+        
+        # Create PDF document
+        doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+        
+        content = []
+        for index, order in enumerate(orders):
+            if index:
+                content.append(PageBreak())
+            content.extend(self.story(order, prices, rates))
+        
+        # Build PDF
+        with STAGE_SECONDS.time("pdf_build"):
+            doc.build(content)
+        
+        return buffer.getvalue()
+    
+    def story(self, order: OrderTable, prices: Mapping[str, float], rates: Mapping[str, float]) -> list:
+        """
+        Build the flowables for one order's confirmation.
+        
+        Args:
+            order (OrderTable): The order object containing customer and item details.
+            prices (Mapping[str, float]): Product prices in CAD.
+            rates (Mapping[str, float]): Exchange rates from CAD.
+            
+        Returns:
+            list: The reportlab flowables.
+        """
+        line_prices, total_order_amount = order_line_prices(order, prices, rates)
+        
+        # Build the PDF content
+        content = []
+        
+        # Title
+        content.append(Paragraph("ORDER CONFIRMATION", self.title_style))
+        content.append(Spacer(1, 12))
+        
+        # Order Information
+        content.append(Paragraph("Order Information", self.heading_style))
+        order_info = [
+            ['Order ID:', str(order.id)],
+            ['Customer Name:', order.customer_name],
+            ['Currency:', order.currency],
+            ['Order Date:', order.created_at.strftime('%Y-%m-%d %H:%M:%S')],
+        ]
+        
+        order_info_table = Table(order_info, colWidths=self.order_info_col_widths)
+        order_info_table.setStyle(self.order_info_style)
+        
+        content.append(order_info_table)
+        content.append(Spacer(1, 20))
+        
+        # Order Items
+        content.append(Paragraph("Order Items", self.heading_style))
+        
+        # Prepare items data
+        items_data = [['Product', 'Quantity', f'Unit Price ({order.currency})', f'Line Total ({order.currency})']]
+        
+        for item, (unit_price, line_total) in zip(order.order_items, line_prices):
+            items_data.append([
+                item.product_name,
+                str(item.quantity),
+                f'{unit_price:.2f}',
+                f'{line_total:.2f}'
+            ])
+        
+        # Add total row
+        items_data.append(['', '', 'TOTAL:', f'{total_order_amount:.2f}'])
+        
+        # Create items table
+        items_table = Table(items_data, colWidths=self.items_col_widths)
+        items_table.setStyle(self.items_style)
+        
+        content.append(items_table)
+        content.append(Spacer(1, 20))
+        
+        # Footer
+        footer_text = f"<para align=center><font size=8 color='#666666'>Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}<br/>Order Entry System</font></para>"
+        content.append(Paragraph(footer_text, self.normal_style))
+        
+        return content
+
+# Shared PDF template, built once at import
+PDF_TEMPLATE = OrderPdfTemplate()
+
+# Process-pool entry points receive the parent's prices and rates so that workers
+# never load the catalog or rates themselves and render with the same versions
+def render_order_pdf_snapshot(snapshot: dict, prices: Dict[str, float], rates: Dict[str, float]) -> bytes:
+    """Process-pool entry point: render one order from its snapshot"""
+    return PDF_TEMPLATE.render(order_from_snapshot(snapshot), prices, rates)
+
+def render_orders_pdf_snapshots(snapshots: List[dict], prices: Dict[str, float], rates: Dict[str, float]) -> bytes:
+    """Process-pool entry point: render several orders into one document"""
+    return PDF_TEMPLATE.render_many([order_from_snapshot(snapshot) for snapshot in snapshots], prices, rates)
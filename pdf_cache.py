@@ -0,0 +1,230 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+# Cache configuration
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", os.path.join(tempfile.gettempdir(), "order_pdf_cache"))
+PDF_CACHE_MEMORY_BYTES = int(os.getenv("PDF_CACHE_MEMORY_BYTES", str(64 * 1024 * 1024)))
+PDF_CACHE_DISK_BYTES = int(os.getenv("PDF_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+
+def content_key(payload: dict) -> str:
+    """
+    Hash a JSON-serializable description of a document.
+
+    Args:
+        payload (dict): Everything the rendered output depends on.
+
+    Returns:
+        str: Hex SHA-256 digest, stable across processes.
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class PdfCache:
+    """
+    Two-level, size-bounded LRU cache of rendered PDF bytes.
+
+    Entries are keyed by a content hash, so a changed order simply maps to a
+    new key; the previous entry for the same order is dropped when the new
+    one is stored. The memory level is per process, the disk level is shared
+    by every worker pointing at the same directory.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = PDF_CACHE_DIR,
+        max_memory_bytes: int = PDF_CACHE_MEMORY_BYTES,
+        max_disk_bytes: int = PDF_CACHE_DISK_BYTES,
+    ):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._order_keys: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.renders = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = self._scan_disk()[1]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get_memory(self, key: str) -> Optional[bytes]:
+        """Return the bytes for key if held in memory, without touching disk"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            return data
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look a key up in memory, then on disk.
+
+        Args:
+            key (str): Content key.
+
+        Returns:
+            Optional[bytes]: The cached PDF, or None on a miss.
+        """
+        data = self.get_memory(key)
+        if data is not None or not self.directory:
+            return data
+        try:
+            with open(self._path(key), "rb") as pdf_file:
+                data = pdf_file.read()
+        except OSError:
+            return None
+        self.disk_hits += 1
+        # Touch the file so disk eviction stays least-recently-used
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        self._store_memory(key, data)
+        return data
+
+    def put(self, key: str, data: bytes, order_id: Optional[int] = None):
+        """
+        Store rendered bytes and drop any stale entry for the same order.
+
+        Args:
+            key (str): Content key.
+            data (bytes): Rendered PDF.
+            order_id (Optional[int]): Order the PDF belongs to.
+        """
+        if order_id is not None:
+            with self._lock:
+                previous = self._order_keys.get(order_id)
+                self._order_keys[order_id] = key
+            if previous and previous != key:
+                self.discard(previous)
+        self._store_memory(key, data)
+        if self.directory:
+            self._store_disk(key, data)
+
+    def get_or_render(self, key: str, render: Callable[[], bytes], order_id: Optional[int] = None) -> bytes:
+        """
+        Return cached bytes for key, rendering and storing them on a miss.
+
+        Args:
+            key (str): Content key.
+            render (Callable[[], bytes]): Produces the PDF on a miss.
+            order_id (Optional[int]): Order the PDF belongs to.
+
+        Returns:
+            bytes: The PDF.
+        """
+        data = self.get(key)
+        if data is None:
+            self.renders += 1
+            data = render()
+            self.put(key, data, order_id)
+        return data
+
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from memory or disk instead of rendering"""
+        hits = self.memory_hits + self.disk_hits
+        return hits / (hits + self.renders) if hits + self.renders else 0.0
+
+    def invalidate_order(self, order_id: int):
+        """Drop the cached PDF for an order, e.g. after it was modified"""
+        with self._lock:
+            key = self._order_keys.pop(order_id, None)
+        if key:
+            self.discard(key)
+
+    def discard(self, key: str):
+        """Remove a key from both levels"""
+        with self._lock:
+            data = self._memory.pop(key, None)
+            if data is not None:
+                self._memory_bytes -= len(data)
+        if self.directory:
+            try:
+                os.unlink(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            keys = list(self._memory)
+            self._order_keys.clear()
+        for key in keys:
+            self.discard(key)
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pdf"):
+                    self.discard(name[:-4])
+
+    def _store_memory(self, key: str, data: bytes):
+        if len(data) > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _store_disk(self, key: str, data: bytes):
+        # Write then rename so other workers never read a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            print(f"Error writing PDF cache entry {key}: {str(e)}")
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return
+        with self._lock:
+            self._disk_bytes += len(data)
+            over_budget = self._disk_bytes > self.max_disk_bytes
+        # Only scan the directory once the running estimate says we're over
+        if over_budget:
+            self._evict_disk()
+
+    def _scan_disk(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".pdf"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        return entries, total
+
+    def _evict_disk(self):
+        entries, total = self._scan_disk()
+        # Evict down to 90% of the budget so the next few writes don't rescan
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
@@ -0,0 +1,89 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable, List, Mapping, Tuple
+
+CENT = Decimal("0.01")
+
+def to_money(value) -> Decimal:
+    """Round a price to cents, half up"""
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+def unit_price(base_price, rate) -> Decimal:
+    """
+    Convert a catalog price in CAD to the order currency.
+
+    Args:
+        base_price: Price in CAD.
+        rate: Exchange rate from CAD to the order currency.
+
+    Returns:
+        Decimal: Unit price in the order currency, rounded to cents.
+    """
+    return to_money(Decimal(str(base_price)) * Decimal(str(rate)))
+
+def price_lines(
+    items: Iterable[Tuple[str, int]],
+    currency: str,
+    prices: Mapping[str, float],
+    rates: Mapping[str, float]
+) -> Tuple[List[Tuple[Decimal, Decimal]], Decimal]:
+    """
+    Price order lines. Line totals are the rounded unit price times the
+    quantity, so the stored order total always equals the sum of its lines.
+
+    Args:
+        items (Iterable[Tuple[str, int]]): Product name and quantity per line.
+        currency (str): The order currency.
+        prices (Mapping[str, float]): Product prices in CAD.
+        rates (Mapping[str, float]): Exchange rates from CAD.
+
+    Returns:
+        Tuple[List[Tuple[Decimal, Decimal]], Decimal]: Unit price and line total per line, and the order total.
+    """
+    rate = rates.get(currency, 1.0)
+    lines = []
+    order_total = Decimal("0.00")
+    for product_name, quantity in items:
+        price = unit_price(prices.get(product_name, 0), rate)
+        line_total = price * quantity
+        lines.append((price, line_total))
+        order_total += line_total
+    return lines, order_total
+
+def price_order(order, prices: Mapping[str, float], rates: Mapping[str, float]):
+    """
+    Freeze the prices of an order and its items on the objects.
+
+    Args:
+        order (OrderTable): The order with its items.
+        prices (Mapping[str, float]): Product prices in CAD.
+        rates (Mapping[str, float]): Exchange rates from CAD.
+    """
+    lines, order_total = price_lines(
+        ((item.product_name, item.quantity) for item in order.order_items),
+        order.currency, prices, rates
+    )
+    for item, (price, line_total) in zip(order.order_items, lines):
+        item.unit_price = price
+        item.line_total = line_total
+    order.order_total = order_total
+
+def order_line_prices(order, prices: Mapping[str, float], rates: Mapping[str, float]) -> Tuple[List[Tuple[Decimal, Decimal]], Decimal]:
+    """
+    Unit price and line total per item, and the order total.
+    Prices are frozen on the order when it is created; orders that predate
+    that and have not been backfilled are priced with the given prices and rates.
+
+    Args:
+        order (OrderTable): The order object with its items loaded.
+        prices (Mapping[str, float]): Product prices in CAD.
+        rates (Mapping[str, float]): Exchange rates from CAD.
+
+    Returns:
+        Tuple[List[Tuple[Decimal, Decimal]], Decimal]: Per-item prices and the order total.
+    """
+    if order.order_total is not None and all(item.line_total is not None for item in order.order_items):
+        return [(item.unit_price, item.line_total) for item in order.order_items], order.order_total
+    return price_lines(
+        ((item.product_name, item.quantity) for item in order.order_items),
+        order.currency, prices, rates
+    )
@@ -0,0 +1,176 @@
+from types import MappingProxyType
+from typing import Mapping, Optional
+from urllib.request import urlopen
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+# Where rates come from: an http(s):// URL or a path to a JSON file; built-in rates when unset
+EXCHANGE_RATES_SOURCE = os.getenv("EXCHANGE_RATES_SOURCE", "")
+# How long a set of rates is used before it is fetched again, and how soon a failed fetch is retried
+EXCHANGE_RATES_TTL_SECONDS = float(os.getenv("EXCHANGE_RATES_TTL_SECONDS", "3600"))
+EXCHANGE_RATES_RETRY_SECONDS = float(os.getenv("EXCHANGE_RATES_RETRY_SECONDS", "60"))
+EXCHANGE_RATES_TIMEOUT_SECONDS = float(os.getenv("EXCHANGE_RATES_TIMEOUT_SECONDS", "10"))
+
+BASE_CURRENCY = "CAD"
+
+# Rates from CAD used when no source is configured
+DEFAULT_RATES = {
+    "CAD": 1.0,
+    "USD": 0.75,
+    "EUR": 0.68,
+    "GBP": 0.59
+}
+
+class StaticRateProvider:
+    """Serves a fixed set of rates"""
+
+    def __init__(self, rates: Optional[Mapping[str, float]] = None):
+        self.rates = dict(rates or DEFAULT_RATES)
+
+    def fetch(self) -> dict:
+        return {"base": BASE_CURRENCY, "rates": dict(self.rates)}
+
+class FileRateProvider:
+    """Reads a JSON feed from a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def fetch(self) -> dict:
+        with open(self.path, "r", encoding="utf-8") as feed:
+            return json.load(feed)
+
+class HttpRateProvider:
+    """Fetches a JSON feed over HTTP"""
+
+    def __init__(self, url: str, timeout: float = EXCHANGE_RATES_TIMEOUT_SECONDS):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self) -> dict:
+        with urlopen(self.url, timeout=self.timeout) as response:
+            return json.load(response)
+
+def provider_from_source(source: str = EXCHANGE_RATES_SOURCE):
+    """
+    Pick the rate provider for a configured source.
+
+    Args:
+        source (str): An http(s):// URL, a file path (optionally file://), or "" for the built-in rates.
+
+    Returns:
+        A provider with a blocking fetch() method returning the feed.
+    """
+    if not source:
+        return StaticRateProvider()
+    if source.startswith(("http://", "https://")):
+        return HttpRateProvider(source)
+    if source.startswith("file://"):
+        source = source[len("file://"):]
+    return FileRateProvider(source)
+
+class RateSnapshot:
+    """
+    Immutable set of rates from the base currency.
+
+    Feeds are JSON objects {"base": "CAD", "rates": {"USD": 0.75, ...}} with an
+    optional "version"; without one the version is derived from the rates.
+    """
+
+    def __init__(self, feed: dict):
+        base = feed.get("base", BASE_CURRENCY)
+        if base != BASE_CURRENCY:
+            raise ValueError(f"Exchange rate feed must be based on {BASE_CURRENCY}, got {base}.")
+        rates = {str(currency): float(rate) for currency, rate in feed["rates"].items()}
+        rates[BASE_CURRENCY] = 1.0
+        if any(rate <= 0 for rate in rates.values()):
+            raise ValueError("Exchange rates must be positive.")
+        self.rates: Mapping[str, float] = MappingProxyType(rates)
+        # /api/exchange-rates is served straight from these bytes
+        self.json_body = json.dumps(rates, sort_keys=True).encode()
+        self.version = str(feed.get("version") or hashlib.sha256(self.json_body).hexdigest()[:12])
+        self.etag = f'"{self.version}"'
+        self.loaded_at = time.monotonic()
+
+    def rate(self, currency: str) -> float:
+        """Conversion rate from the base currency, 1.0 for unknown currencies"""
+        return self.rates.get(currency, 1.0)
+
+class ExchangeRateService:
+    """
+    Per-worker cache of exchange rates.
+
+    Readers take `snapshot` (one attribute read) and use it for a whole
+    calculation; refreshes build a new snapshot and swap it in, so a
+    price is never computed from a mix of old and new rates. A background
+    task refetches every ttl_seconds and keeps the last good snapshot when
+    the provider fails.
+    """
+
+    def __init__(self, provider=None, ttl_seconds: float = EXCHANGE_RATES_TTL_SECONDS, retry_seconds: float = EXCHANGE_RATES_RETRY_SECONDS):
+        self.provider = provider or provider_from_source()
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self._snapshot: Optional[RateSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def snapshot(self) -> RateSnapshot:
+        """The current snapshot, fetched synchronously on first use"""
+        if self._snapshot is None:
+            self.load()
+        return self._snapshot
+
+    @property
+    def rates(self) -> Mapping[str, float]:
+        """Currency to rate from the base currency"""
+        return self.snapshot.rates
+
+    def load(self):
+        """Fetch rates with a blocking call (startup, scripts, tests)"""
+        self._snapshot = RateSnapshot(self.provider.fetch())
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Fetch new rates if the snapshot expired.
+
+        Args:
+            force (bool): Fetch even if the snapshot is still fresh.
+
+        Returns:
+            bool: True if a snapshot with a new version was swapped in.
+        """
+        current = self._snapshot
+        if not force and current is not None and time.monotonic() - current.loaded_at < self.ttl_seconds:
+            return False
+        snapshot = RateSnapshot(await asyncio.to_thread(self.provider.fetch))
+        self._snapshot = snapshot
+        return current is None or current.version != snapshot.version
+
+    def start(self):
+        """Start the background refresh task on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background refresh task"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        delay = self.ttl_seconds
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                if await self.refresh(force=True):
+                    print(f"[RATES] Loaded exchange rates version {self._snapshot.version}")
+                delay = self.ttl_seconds
+            except Exception as e:
+                version = self._snapshot.version if self._snapshot else None
+                print(f"[RATES] Refresh failed, keeping version {version}: {str(e)}")
+                delay = self.retry_seconds
@@ -0,0 +1,315 @@
+"""
+Sales reports aggregated in the database.
+
+Reports are computed from orders and order_items with GROUP BY, or from the
+sales summary tables when REPORTS_SUMMARY_TABLES is enabled. The summaries
+are incremented in the same transaction that creates the orders, so they
+are always consistent with them. After enabling them on a database that
+already has orders, rebuild them once:
+
+Usage:
+    python reports.py --rebuild
+"""
+import argparse
+import os
+from collections import defaultdict
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import engine, run_migrations
+from models import OrderItemTable, OrderTable, SalesCustomerTable, SalesDailyCurrencyTable, SalesDailyProductTable
+from pricing import to_money
+
+# Maintain and report from the summary tables instead of scanning the orders
+REPORTS_SUMMARY_TABLES = os.getenv("REPORTS_SUMMARY_TABLES", "false").lower() == "true"
+
+PERIODS = ("day", "week", "month")
+
+# Bind parameters per summary upsert; asyncpg allows 32767 and SQLite 32766 by default
+UPSERT_MAX_PARAMETERS = 30000
+
+class OrderSale(NamedTuple):
+    """What an order adds to the sales summaries"""
+    created_at: datetime
+    currency: str
+    customer_name: str
+    order_total: Decimal
+    lines: List[Tuple[str, int, Decimal]]  # product name, quantity, line total
+
+def sale_from_order(order: OrderTable) -> OrderSale:
+    """Summary contribution of a priced order with its items loaded"""
+    return OrderSale(
+        order.created_at,
+        order.currency,
+        order.customer_name,
+        order.order_total,
+        [(item.product_name, item.quantity, item.line_total) for item in order.order_items]
+    )
+
+def period_start(column, period: str, dialect_name: str):
+    """
+    SQL expression for the first day of the day, week (Monday) or month containing a date or timestamp.
+
+    Args:
+        column: The date or timestamp column.
+        period (str): One of PERIODS.
+        dialect_name (str): The database dialect.
+
+    Returns:
+        The SQL expression, a date.
+    """
+    if dialect_name == "postgresql":
+        return func.date(func.date_trunc(period, column))
+    if period == "week":
+        return func.date(column, "weekday 0", "-6 days")
+    if period == "month":
+        return func.date(column, "start of month")
+    return func.date(column)
+
+def created_range(from_date: Optional[date], to_date: Optional[date]) -> list:
+    """WHERE clauses for orders created on or after from_date and before to_date"""
+    clauses = []
+    if from_date:
+        clauses.append(OrderTable.created_at >= datetime.combine(from_date, time.min))
+    if to_date:
+        clauses.append(OrderTable.created_at < datetime.combine(to_date, time.min))
+    return clauses
+
+def day_range(column, from_date: Optional[date], to_date: Optional[date]) -> list:
+    """WHERE clauses for summary rows on or after from_date and before to_date"""
+    clauses = []
+    if from_date:
+        clauses.append(column >= from_date)
+    if to_date:
+        clauses.append(column < to_date)
+    return clauses
+
+def products_statement(from_date: Optional[date] = None, to_date: Optional[date] = None, use_summaries: bool = REPORTS_SUMMARY_TABLES):
+    """Quantity and revenue per product and currency, highest revenue first"""
+    if use_summaries:
+        table = SalesDailyProductTable
+        quantity, revenue = func.sum(table.quantity), func.sum(table.revenue)
+        return (
+            select(table.product_name, table.currency, quantity.label("quantity"), revenue.label("revenue"))
+            .where(*day_range(table.day, from_date, to_date))
+            .group_by(table.product_name, table.currency)
+            .order_by(revenue.desc(), table.product_name)
+        )
+    quantity, revenue = func.sum(OrderItemTable.quantity), func.sum(OrderItemTable.line_total)
+    return (
+        select(OrderItemTable.product_name, OrderTable.currency, quantity.label("quantity"), revenue.label("revenue"))
+        .join(OrderTable, OrderTable.id == OrderItemTable.order_id)
+        .where(*created_range(from_date, to_date))
+        .group_by(OrderItemTable.product_name, OrderTable.currency)
+        .order_by(revenue.desc(), OrderItemTable.product_name)
+    )
+
+def currencies_statement(from_date: Optional[date] = None, to_date: Optional[date] = None, use_summaries: bool = REPORTS_SUMMARY_TABLES):
+    """Order count and revenue per currency"""
+    if use_summaries:
+        table = SalesDailyCurrencyTable
+        return (
+            select(table.currency, func.sum(table.orders).label("orders"), func.sum(table.revenue).label("revenue"))
+            .where(*day_range(table.day, from_date, to_date))
+            .group_by(table.currency)
+            .order_by(table.currency)
+        )
+    return (
+        select(OrderTable.currency, func.count(OrderTable.id).label("orders"), func.sum(OrderTable.order_total).label("revenue"))
+        .where(*created_range(from_date, to_date))
+        .group_by(OrderTable.currency)
+        .order_by(OrderTable.currency)
+    )
+
+def periods_statement(
+    period: str,
+    dialect_name: str,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    use_summaries: bool = REPORTS_SUMMARY_TABLES
+):
+    """Order count and revenue per period and currency, oldest period first"""
+    if use_summaries:
+        table = SalesDailyCurrencyTable
+        start = period_start(table.day, period, dialect_name).label("period")
+        return (
+            select(start, table.currency, func.sum(table.orders).label("orders"), func.sum(table.revenue).label("revenue"))
+            .where(*day_range(table.day, from_date, to_date))
+            .group_by(start, table.currency)
+            .order_by(start, table.currency)
+        )
+    start = period_start(OrderTable.created_at, period, dialect_name).label("period")
+    return (
+        select(start, OrderTable.currency, func.count(OrderTable.id).label("orders"), func.sum(OrderTable.order_total).label("revenue"))
+        .where(*created_range(from_date, to_date))
+        .group_by(start, OrderTable.currency)
+        .order_by(start, OrderTable.currency)
+    )
+
+def customers_statement(
+    limit: int,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    use_summaries: bool = REPORTS_SUMMARY_TABLES
+):
+    """Customers with the highest revenue per currency; the summary has no dates, so ranges scan the orders"""
+    if use_summaries and from_date is None and to_date is None:
+        table = SalesCustomerTable
+        return (
+            select(table.customer_name, table.currency, table.orders, table.revenue)
+            .order_by(table.revenue.desc(), table.customer_name)
+            .limit(limit)
+        )
+    revenue = func.sum(OrderTable.order_total)
+    return (
+        select(OrderTable.customer_name, OrderTable.currency, func.count(OrderTable.id).label("orders"), revenue.label("revenue"))
+        .where(*created_range(from_date, to_date))
+        .group_by(OrderTable.customer_name, OrderTable.currency)
+        .order_by(revenue.desc(), OrderTable.customer_name)
+        .limit(limit)
+    )
+
+def report_row(row) -> dict:
+    """JSON-ready report row: money as exact strings, dates as ISO strings"""
+    result = {}
+    for key, value in row._mapping.items():
+        if key == "revenue":
+            value = str(to_money(value or 0))
+        elif key == "period":
+            value = str(value)
+        elif key in ("orders", "quantity"):
+            value = int(value or 0)
+        result[key] = value
+    return result
+
+async def run_report(session: AsyncSession, statement) -> List[dict]:
+    """Execute a report statement and return its rows"""
+    return [report_row(row) for row in (await session.exec(statement)).all()]
+
+def increment_statement(dialect_name: str, table, rows: List[dict], keys: List[str], counters: List[str]):
+    """
+    Multi-row INSERT that adds to the counters of rows that already exist.
+
+    Args:
+        dialect_name (str): The database dialect, postgresql or sqlite.
+        table: The summary table.
+        rows (List[dict]): One row per key, with the amounts to add.
+        keys (List[str]): The primary key columns.
+        counters (List[str]): The columns to add to.
+
+    Returns:
+        The INSERT ... ON CONFLICT DO UPDATE statement.
+    """
+    dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    statement = dialect_insert(table).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={column: table.c[column] + statement.excluded[column] for column in counters}
+    )
+
+async def record_sales(session: AsyncSession, sales: Iterable[OrderSale]):
+    """
+    Add orders to the summary tables in the caller's transaction.
+    Rows are written in key order so concurrent transactions lock them in
+    the same order.
+
+    Args:
+        session (AsyncSession): The session creating the orders; not committed here.
+        sales (Iterable[OrderSale]): The orders being created.
+    """
+    products: Dict[tuple, list] = defaultdict(lambda: [0, Decimal("0")])
+    currencies: Dict[tuple, list] = defaultdict(lambda: [0, Decimal("0")])
+    customers: Dict[tuple, list] = defaultdict(lambda: [0, Decimal("0")])
+    for sale in sales:
+        day = sale.created_at.date()
+        order_total = sale.order_total or Decimal("0")
+        for product_name, quantity, line_total in sale.lines:
+            totals = products[(day, sale.currency, product_name)]
+            totals[0] += quantity
+            totals[1] += line_total or Decimal("0")
+        for totals in (currencies[(day, sale.currency)], customers[(sale.customer_name, sale.currency)]):
+            totals[0] += 1
+            totals[1] += order_total
+    if not currencies:
+        return
+
+    upserts = [
+        (
+            SalesDailyProductTable.__table__,
+            [
+                {"day": day, "currency": currency, "product_name": product_name, "quantity": quantity, "revenue": revenue}
+                for (day, currency, product_name), (quantity, revenue) in sorted(products.items())
+            ],
+            ["day", "currency", "product_name"], ["quantity", "revenue"]
+        ),
+        (
+            SalesDailyCurrencyTable.__table__,
+            [
+                {"day": day, "currency": currency, "orders": orders, "revenue": revenue}
+                for (day, currency), (orders, revenue) in sorted(currencies.items())
+            ],
+            ["day", "currency"], ["orders", "revenue"]
+        ),
+        (
+            SalesCustomerTable.__table__,
+            [
+                {"customer_name": customer_name, "currency": currency, "orders": orders, "revenue": revenue}
+                for (customer_name, currency), (orders, revenue) in sorted(customers.items())
+            ],
+            ["customer_name", "currency"], ["orders", "revenue"]
+        ),
+    ]
+    dialect_name = session.bind.dialect.name
+    for table, rows, keys, counters in upserts:
+        # A large batch has more rows than fit in one statement's bind parameters
+        chunk_rows = max(1, UPSERT_MAX_PARAMETERS // len(rows[0])) if rows else 1
+        for offset in range(0, len(rows), chunk_rows):
+            await session.exec(increment_statement(dialect_name, table, rows[offset:offset + chunk_rows], keys, counters))
+
+def rebuild_summaries():
+    """
+    Recompute the summary tables from the orders in one transaction.
+    Orders created while this runs with REPORTS_SUMMARY_TABLES enabled
+    are counted twice on PostgreSQL; run it before enabling the summaries
+    or while writes are paused.
+    """
+    day = func.date(OrderTable.created_at)
+    with engine.begin() as connection:
+        for table in (SalesDailyProductTable, SalesDailyCurrencyTable, SalesCustomerTable):
+            connection.execute(delete(table))
+        connection.execute(SalesDailyProductTable.__table__.insert().from_select(
+            ["day", "currency", "product_name", "quantity", "revenue"],
+            select(day, OrderTable.currency, OrderItemTable.product_name, func.sum(OrderItemTable.quantity), func.coalesce(func.sum(OrderItemTable.line_total), 0))
+            .join(OrderTable, OrderTable.id == OrderItemTable.order_id)
+            .group_by(day, OrderTable.currency, OrderItemTable.product_name)
+        ))
+        connection.execute(SalesDailyCurrencyTable.__table__.insert().from_select(
+            ["day", "currency", "orders", "revenue"],
+            select(day, OrderTable.currency, func.count(OrderTable.id), func.coalesce(func.sum(OrderTable.order_total), 0))
+            .group_by(day, OrderTable.currency)
+        ))
+        connection.execute(SalesCustomerTable.__table__.insert().from_select(
+            ["customer_name", "currency", "orders", "revenue"],
+            select(OrderTable.customer_name, OrderTable.currency, func.count(OrderTable.id), func.coalesce(func.sum(OrderTable.order_total), 0))
+            .group_by(OrderTable.customer_name, OrderTable.currency)
+        ))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="Recompute the sales summary tables from the orders")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        run_migrations()
+        rebuild_summaries()
+        print("[REPORTS] Sales summaries rebuilt")
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Production entry point: a pre-forking uvicorn server.
+
+The parent process runs the database migrations once, imports the app and
+warms it up (catalog, exchange rates, reportlab fonts), then forks the
+workers. Workers inherit the warmed-up interpreter copy-on-write instead of
+each importing and loading everything again, and skip the migrations.
+
+Nothing mutable is shared after the fork: database connections are closed
+before it, and caches, worker pools and background tasks are created per
+worker. On SIGTERM or SIGINT the parent forwards the signal; each worker
+stops accepting connections, waits up to GRACEFUL_SHUTDOWN_SECONDS for
+in-flight requests, then finishes queued email and PDF work before exiting.
+
+Usage:
+    python server.py [--host 0.0.0.0] [--port 8000] [--workers N]
+"""
+import argparse
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+# Workers to run; defaults to the CPU cores available to this process
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+# Seconds a worker waits for in-flight requests after SIGTERM before closing them
+GRACEFUL_SHUTDOWN_SECONDS = float(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "25"))
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# A worker exiting sooner than this after starting is not restarted, to avoid a crash loop
+MIN_WORKER_UPTIME_SECONDS = 5
+
+def worker_count(configured: int = WEB_CONCURRENCY) -> int:
+    """Configured worker count, or one worker per CPU core this process may run on"""
+    if configured > 0:
+        return configured
+    if hasattr(os, "sched_getaffinity"):
+        return max(len(os.sched_getaffinity(0)), 1)
+    return os.cpu_count() or 1
+
+def prepare():
+    """
+    One-time startup work in the parent, before any worker exists.
+
+    Returns:
+        The warmed-up ASGI app.
+    """
+    from database import engine, run_migrations
+    run_migrations()
+    # Set before the app is imported so the workers it is forked into skip the migrations
+    os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+    import app as application
+    application.warm_up()
+    # Connections must not cross the fork; each worker opens its own
+    engine.dispose()
+    return application.app
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+def run_worker(app, sock: socket.socket):
+    """Serve on the inherited socket until SIGTERM; runs in the forked child"""
+    import uvicorn
+    # Own process group: a terminal's Ctrl+C reaches only the parent, which forwards it
+    # once; uvicorn treats a second SIGINT as "exit now" and would skip the drain
+    os.setpgid(0, 0)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    import app as application
+    application.WORKER_STARTED_AT = time.time()
+    config = uvicorn.Config(app, timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_SECONDS, proxy_headers=True)
+    uvicorn.Server(config).run(sockets=[sock])
+
+def spawn_worker(app, sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(app, sock)
+        except BaseException as e:
+            print(f"[SERVER] Worker {os.getpid()} failed: {str(e)}")
+            code = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(code)
+    return pid
+
+def serve(host: str = HOST, port: int = PORT, workers: int = 0):
+    """
+    Prepare once, fork the workers and supervise them until SIGTERM or SIGINT.
+    A worker that dies while the server is running is replaced.
+    """
+    workers = worker_count(workers or WEB_CONCURRENCY)
+    started = time.perf_counter()
+    app = prepare()
+    sock = bind_socket(host, port)
+    print(f"[SERVER] Migrated and warmed up in {(time.perf_counter() - started) * 1000:.0f} ms; starting {workers} workers on {host}:{port}")
+
+    children: Dict[int, float] = {}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        children[spawn_worker(app, sock)] = time.monotonic()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        spawned_at = children.pop(pid, None)
+        if spawned_at is None or stopping:
+            continue
+        code = os.waitstatus_to_exitcode(status)
+        if time.monotonic() - spawned_at < MIN_WORKER_UPTIME_SECONDS:
+            print(f"[SERVER] Worker {pid} exited with {code} right after starting; not restarting it")
+            continue
+        print(f"[SERVER] Worker {pid} exited with {code}; starting a replacement")
+        children[spawn_worker(app, sock)] = time.monotonic()
+
+    sock.close()
+    print("[SERVER] Stopped")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=0, help="Default: WEB_CONCURRENCY or the available CPU cores")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        # No fork (Windows): uvicorn's spawning supervisor; every worker warms up on its own
+        import uvicorn
+        from database import run_migrations
+        run_migrations()
+        os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+        uvicorn.run("app:app", host=args.host, port=args.port, workers=worker_count(args.workers),
+                    timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_SECONDS, proxy_headers=True)
+        return
+    serve(args.host, args.port, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import os
+import tempfile
+
+import pytest
+
+# The suite runs against a throwaway SQLite database unless DATABASE_URL points
+# at a real server (e.g. PostgreSQL). Set here, before any test imports database.py.
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/tests.db"
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_database():
+    """Schema and seed data for tests that make requests before calling run_migrations()"""
+    from database import run_migrations
+    run_migrations()
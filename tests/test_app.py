@@ -1,9 +1,19 @@
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import io
+import json
+import zipfile
+import time
+from datetime import datetime
+import httpx
 import pytest
 from fastapi.testclient import TestClient
+from sqlmodel import Session, select
 from app import app
+from database import run_migrations, engine
+from models import OrderTable, OrderItemTable
 
 client = TestClient(app)
 
@@ -11,22 +21,22 @@ client = TestClient(app)
 valid_order = {
     "customer_name": "John Doe",
     "order_items": [
-        {"product_name": "Product A", "quantity": 10},
-        {"product_name": "Product B", "quantity": 5}
+        {"product_name": "Laptop", "quantity": 10},
+        {"product_name": "Mouse", "quantity": 5}
     ]
 }
 
 invalid_order_missing_name = {
     "order_items": [
-        {"product_name": "Product A", "quantity": 10}
+        {"product_name": "Laptop", "quantity": 10}
     ]
 }
 
 invalid_order_duplicate_items = {
     "customer_name": "John Doe",
     "order_items": [
-        {"product_name": "Product A", "quantity": 10},
-        {"product_name": "Product A", "quantity": 5}
+        {"product_name": "Laptop", "quantity": 10},
+        {"product_name": "Laptop", "quantity": 5}
     ]
 }
 
@@ -34,12 +44,14 @@ invalid_order_duplicate_items = {
 def test_root_endpoint():
     response = client.get("/")
     assert response.status_code == 200
-    assert "Order Entry Form" in response.text
+    assert response.json()["message"] == "Order Entry API"
 
 def test_create_order_success():
+    run_migrations()
     response = client.post("/order", json=valid_order)
     assert response.status_code == 200
     assert "Order Confirmation" in response.text
+    assert "John Doe" in response.text
 
 def test_create_order_missing_name():
     response = client.post("/order", json=invalid_order_missing_name)
@@ -47,6 +59,222 @@ def test_create_order_missing_name():
     assert "Field required" in response.text
 
 def test_create_order_duplicate_items():
+    run_migrations()
     response = client.post("/order", json=invalid_order_duplicate_items)
     assert response.status_code == 422
-    assert "Duplicate product name detected" in response.text
+    assert [error["msg"] for error in response.json()["detail"]] == ["Duplicate product name detected: 'Laptop'."]
+
+@pytest.fixture
+def seeded_orders():
+    run_migrations()
+    with Session(engine) as session:
+        orders = []
+        for i in range(5):
+            order = OrderTable(customer_name=f"Paged Customer {chr(65 + i)}", currency="CAD")
+            order.order_items = [OrderItemTable(product_name="Mouse", quantity=i + 1)]
+            session.add(order)
+            orders.append(order)
+        session.commit()
+        ids = [order.id for order in orders]
+    return ids
+
+def test_get_orders_keyset_pagination(seeded_orders):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["after"] = cursor
+        response = client.get("/orders", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(order["id"] for order in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert set(seeded_orders) <= set(seen)
+    assert len(seen) == len(set(seen))
+
+def test_get_orders_invalid_cursor():
+    response = client.get("/orders", params={"after": "not-a-cursor"})
+    assert response.status_code == 400
+
+def test_get_orders_ndjson_stream(seeded_orders):
+    response = client.get("/orders", params={"stream": True, "limit": 2})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    ids = [row["id"] for row in rows]
+    assert set(seeded_orders) <= set(ids)
+    assert all(row["order_items"] for row in rows if row["id"] in seeded_orders)
+
+@pytest.fixture
+def filter_orders():
+    run_migrations()
+    with Session(engine) as session:
+        existing = session.exec(
+            select(OrderTable).where(OrderTable.created_at >= datetime(2019, 6, 1), OrderTable.created_at < datetime(2019, 7, 1)).order_by(OrderTable.created_at)
+        ).all()
+        if existing:
+            return [order.id for order in existing]
+        orders = []
+        for name, currency, product, day in [
+            ("Filterina Quist", "GBP", "Webcam", 3),
+            ("Filterina Quast", "EUR", "Webcam", 4),
+            ("filterino Quist", "GBP", "Speaker", 5),
+            ("Other_Person", "GBP", "Webcam", 6),
+        ]:
+            order = OrderTable(customer_name=name, currency=currency, created_at=datetime(2019, 6, day))
+            order.order_items = [OrderItemTable(product_name=product, quantity=1)]
+            session.add(order)
+            orders.append(order)
+        session.commit()
+        return [order.id for order in orders]
+
+def test_get_orders_filters(filter_orders):
+    def ids(**params):
+        response = client.get("/orders", params={"created_from": "2019-06-01T00:00:00", "created_to": "2019-07-01T00:00:00", **params})
+        assert response.status_code == 200
+        return {order["id"] for order in response.json()} & set(filter_orders)
+
+    first, second, third, fourth = filter_orders
+    assert ids() == set(filter_orders)
+    assert ids(customer="filterina") == {first, second}
+    assert ids(customer="FILTERIN") == {first, second, third}
+    # LIKE wildcards in the input are matched literally
+    assert ids(customer="Other_") == {fourth}
+    assert ids(customer="Other%") == set()
+    assert ids(product="Webcam", currency="GBP") == {first, fourth}
+    assert ids(search="quist") == {first, third}
+    assert ids(created_to="2019-06-05T00:00:00") == {first, second}
+
+    # Filters apply to every page and to the NDJSON stream
+    page = client.get("/orders", params={"customer": "filterin", "created_from": "2019-06-01T00:00:00", "limit": 2})
+    assert [order["id"] for order in page.json()] == [first, second]
+    rest = client.get("/orders", params={"customer": "filterin", "created_from": "2019-06-01T00:00:00", "limit": 2, "after": page.headers["X-Next-Cursor"]})
+    assert [order["id"] for order in rest.json()] == [third]
+    streamed = client.get("/orders", params={"customer": "filterin", "product": "Webcam", "stream": True, "limit": 1})
+    assert [json.loads(line)["id"] for line in streamed.text.splitlines()] == [first, second]
+
+    assert client.get("/orders", params={"search": "ab"}).status_code == 422
+
+def test_email_is_queued_without_blocking(seeded_orders):
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            started = time.perf_counter()
+            email_response = await async_client.post(
+                f"/orders/{seeded_orders[0]}/email", params={"email": "buyer@example.com"}
+            )
+            elapsed = time.perf_counter() - started
+            job_response = await async_client.get(f"/email-jobs/{email_response.json()['job_id']}")
+        return email_response, elapsed, job_response
+
+    email_response, elapsed, job_response = asyncio.run(scenario())
+    assert email_response.status_code == 202
+    # The simulated send sleeps for a second; the request must not wait for it
+    assert elapsed < 0.5
+    assert job_response.status_code == 200
+    assert job_response.json()["order_id"] == seeded_orders[0]
+
+def test_email_unknown_order():
+    response = client.post("/orders/999999/email", params={"email": "buyer@example.com"})
+    assert response.status_code == 404
+
+def test_pdf_download_is_cached_with_etag(seeded_orders):
+    response = client.get(f"/orders/{seeded_orders[0]}/pdf")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+    etag = response.headers["ETag"]
+
+    repeat = client.get(f"/orders/{seeded_orders[0]}/pdf")
+    assert repeat.headers["ETag"] == etag
+    assert repeat.content == response.content
+
+    not_modified = client.get(f"/orders/{seeded_orders[0]}/pdf", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    other = client.get(f"/orders/{seeded_orders[1]}/pdf", headers={"If-None-Match": etag})
+    assert other.status_code == 200
+    assert other.headers["ETag"] != etag
+
+def test_generate_order_pdf_renders_in_memory(seeded_orders, monkeypatch):
+    import tempfile
+    import app as app_module
+
+    def no_temp_files(*args, **kwargs):
+        raise AssertionError("PDF rendering must not create temporary files")
+
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", no_temp_files)
+    monkeypatch.setattr(tempfile, "mkstemp", no_temp_files)
+    app_module.product_catalog.load()
+    with Session(engine) as session:
+        order = session.get(OrderTable, seeded_orders[0])
+        pdf_bytes = app_module.generate_order_pdf(order)
+    assert isinstance(pdf_bytes, bytes)
+    assert pdf_bytes.startswith(b"%PDF")
+
+def test_bulk_pdf_zip_export(seeded_orders):
+    response = client.post("/orders/pdf/bulk", json={"order_ids": seeded_orders[:3], "format": "zip"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        names = sorted(archive.namelist())
+        assert names == sorted(f"order_confirmation_{order_id}.pdf" for order_id in seeded_orders[:3])
+        assert all(archive.read(name).startswith(b"%PDF") for name in names)
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist())
+
+def test_bulk_pdf_combined_export_by_range(seeded_orders):
+    response = client.post("/orders/pdf/bulk", json={"created_from": "2000-01-01T00:00:00", "format": "pdf"})
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF")
+    assert response.content.count(b"/Type /Page\n") >= len(seeded_orders)
+
+def test_bulk_pdf_rejects_bad_selection(seeded_orders):
+    assert client.post("/orders/pdf/bulk", json={"format": "zip"}).status_code == 400
+    assert client.post("/orders/pdf/bulk", json={"order_ids": [seeded_orders[0]], "format": "tar"}).status_code == 400
+    assert client.post("/orders/pdf/bulk", json={"order_ids": [999999]}).status_code == 404
+
+def test_bulk_pdf_caps_the_order_id_list(seeded_orders, monkeypatch):
+    import app as app_module
+
+    monkeypatch.setattr(app_module, "BULK_PDF_MAX_ORDER_IDS", 2)
+    response = client.post("/orders/pdf/bulk", json={"order_ids": seeded_orders[:3], "format": "zip"})
+    assert response.status_code == 400
+    assert "at most 2 order IDs" in response.json()["detail"]
+    assert client.post("/orders/pdf/bulk", json={"order_ids": seeded_orders[:2], "format": "zip"}).status_code == 200
+
+def test_create_orders_batch_partial_failure():
+    run_migrations()
+    batch = {"orders": [
+        {"customer_name": "Batch One", "currency": "USD", "order_items": [{"product_name": "Mouse", "quantity": 3}]},
+        {"customer_name": "Batch 2", "currency": "USD", "order_items": [{"product_name": "Mouse", "quantity": 1}]},
+        {"customer_name": "Batch Three", "currency": "EUR", "order_items": [
+            {"product_name": "Laptop", "quantity": 1},
+            {"product_name": "Monitor", "quantity": 2}
+        ]},
+        {"customer_name": "Batch Four", "currency": "CAD", "order_items": []},
+    ]}
+    response = client.post("/orders/batch", json=batch)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 2
+    assert body["failed"] == 2
+    statuses = [result["status"] for result in body["results"]]
+    assert statuses == ["created", "error", "created", "error"]
+    assert "alphabetic" in body["results"][1]["error"]
+
+    third = client.get(f"/orders/{body['results'][2]['order_id']}").json()
+    assert third["customer_name"] == "Batch Three"
+    assert sorted(item["product_name"] for item in third["order_items"]) == ["Laptop", "Monitor"]
+
+def test_pool_metrics(seeded_orders):
+    client.get(f"/orders/{seeded_orders[0]}")
+    response = client.get("/metrics/pool")
+    assert response.status_code == 200
+    write_pool = response.json()["write"]
+    assert write_pool["checkouts"] >= 1
+    assert {"size", "checked_out", "overflow", "wait_seconds_avg", "wait_seconds_max", "timeouts"} <= set(write_pool)
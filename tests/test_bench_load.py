@@ -0,0 +1,39 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+import asyncio
+from bench_load import SCENARIOS, find_regressions, open_client, percentile, run_load_test, summarize
+
+def test_percentiles_use_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0.0
+    summary = summarize([0.002, 0.001, 0.003], errors=1, elapsed=0.5)
+    assert summary["requests"] == 3 and summary["throughput_rps"] == 6
+    assert summary["p50_ms"] == 2.0 and summary["max_ms"] == 3.0
+
+def test_regressions_are_flagged_beyond_the_threshold():
+    baseline = {"scenarios": {"get_order": {"throughput_rps": 100, "p95_ms": 10, "p99_ms": 20, "errors": 0}}}
+    within = {"scenarios": {"get_order": {"throughput_rps": 85, "p95_ms": 11.5, "p99_ms": 23, "errors": 0}}}
+    slower = {"scenarios": {
+        "get_order": {"throughput_rps": 70, "p95_ms": 13, "p99_ms": 20, "errors": 2},
+        "order_pdf": {"throughput_rps": 1, "p95_ms": 900, "p99_ms": 900, "errors": 0},
+    }}
+    assert find_regressions(within, baseline, 0.2) == []
+    regressions = find_regressions(slower, baseline, 0.2)
+    assert len(regressions) == 3
+    assert all(regression.startswith("get_order:") for regression in regressions)
+
+def test_every_scenario_runs_in_process():
+    async def run():
+        async with open_client(None) as client:
+            return await run_load_test(client, list(SCENARIOS), orders=5, requests=4, concurrency=2)
+
+    results = asyncio.run(run())
+    assert list(results["scenarios"]) == list(SCENARIOS)
+    for summary in results["scenarios"].values():
+        assert summary["requests"] == 4
+        assert summary["errors"] == 0
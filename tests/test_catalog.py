@@ -0,0 +1,104 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import random
+import string
+from decimal import Decimal
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+import app as app_module
+from app import app
+from catalog import ProductCatalog
+from database import run_migrations, async_engine
+
+def test_catalog_is_seeded_by_migrations():
+    run_migrations()
+    catalog = ProductCatalog()
+    catalog.load()
+    assert catalog.prices["Laptop"] == 1200.0
+    assert catalog.prices["Speaker"] == 120.0
+    assert catalog.snapshot.version >= 1
+
+def test_catalog_refreshes_on_version_change():
+    run_migrations()
+    reader = ProductCatalog()
+    writer = ProductCatalog()
+
+    async def scenario():
+        try:
+            await reader.refresh(force=True)
+            assert not await reader.refresh()
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                await writer.upsert(session, "Catalog Test Cable", Decimal("12.50"))
+            assert await reader.refresh()
+            return reader.snapshot
+        finally:
+            await async_engine.dispose()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot.prices["Catalog Test Cable"] == 12.5
+    assert snapshot.version == writer.snapshot.version
+
+def test_products_endpoint_etag_and_update():
+    with TestClient(app) as client:
+        response = client.get("/api/products")
+        assert response.status_code == 200
+        assert response.json()["Mouse"] == 25.0
+        assert "max-age" in response.headers["Cache-Control"]
+        etag = response.headers["ETag"]
+
+        not_modified = client.get("/api/products", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+
+        updated = client.put("/api/products/Catalog Test Lamp", json={"price": 44.99})
+        assert updated.status_code == 200
+        assert updated.json()["price"] == 44.99
+
+        changed = client.get("/api/products", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert changed.json()["Catalog Test Lamp"] == 44.99
+
+        assert client.put("/api/products/Catalog Test Lamp", json={"price": -1}).status_code == 422
+
+def test_cold_worker_loads_the_catalog_through_the_async_engine(monkeypatch):
+    run_migrations()
+    catalog = ProductCatalog()
+    with pytest.raises(RuntimeError):
+        catalog.snapshot
+
+    def blocking_load():
+        raise AssertionError("the catalog was loaded with a blocking query")
+
+    monkeypatch.setattr(catalog, "load", blocking_load)
+    monkeypatch.setattr(app_module, "product_catalog", catalog)
+    # No lifespan, so warm_up() is skipped as in a worker that missed it
+    response = TestClient(app).post("/order", json={
+        "customer_name": "Cold Worker",
+        "currency": "CAD",
+        "order_items": [{"product_name": "Mouse", "quantity": 1}]
+    })
+    assert response.status_code == 200
+    assert catalog.snapshot.prices["Mouse"] == 25.0
+
+def test_concurrent_upserts_of_a_new_product_both_succeed():
+    run_migrations()
+    name = "Catalog Race " + "".join(random.choices(string.ascii_letters, k=10))
+
+    async def put(catalog, price):
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            return await catalog.upsert(session, name, price)
+
+    async def scenario():
+        try:
+            return await asyncio.gather(put(ProductCatalog(), Decimal("10.00")), put(ProductCatalog(), Decimal("11.00")))
+        finally:
+            await async_engine.dispose()
+
+    first, second = asyncio.run(scenario())
+    assert first.id == second.id
+    catalog = ProductCatalog()
+    catalog.load()
+    assert catalog.prices[name] in (10.0, 11.0)
@@ -0,0 +1,74 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from fastapi.testclient import TestClient
+from app import app, confirmation_cache, generate_error_response, generate_order_confirmation, product_catalog
+from confirmation import ConfirmationCache
+from database import run_migrations
+from models import OrderTable, OrderItemTable
+
+client = TestClient(app)
+
+@pytest.fixture(scope="module", autouse=True)
+def loaded_catalog():
+    """The helpers are called outside a request, so no route loads the catalog for them"""
+    run_migrations()
+    product_catalog.load()
+
+def make_order(order_id, item_count, priced=True):
+    order = OrderTable(id=order_id, customer_name="Template Customer", currency="EUR", created_at=datetime(2025, 3, 4, 5, 6, 7))
+    order.order_items = [
+        OrderItemTable(
+            id=index,
+            product_name=f"Product <{index}> & co",
+            quantity=index + 1,
+            unit_price=Decimal("2.50") if priced else None,
+            line_total=Decimal("2.50") * (index + 1) if priced else None,
+            order_id=order_id
+        )
+        for index in range(item_count)
+    ]
+    if priced:
+        order.order_total = sum(item.line_total for item in order.order_items)
+    return order
+
+def test_confirmation_lists_every_item_escaped():
+    html = generate_order_confirmation(make_order(-1, 100))
+    assert html.count("<tr>") == 100
+    assert "Product &lt;99&gt; &amp; co" in html
+    assert "<99>" not in html
+    assert "<td>2.50 EUR</td>" in html
+    assert "12625.00 EUR" in html
+    assert "2025-03-04 05:06:07" in html
+
+def test_error_detail_is_escaped():
+    response = generate_error_response("Duplicate product name detected: '<script>alert(1)</script>'.")
+    assert response.status_code == 400
+    assert b"&lt;script&gt;" in response.body
+    assert b"<script>" not in response.body
+
+def test_priced_orders_are_rendered_once():
+    order = make_order(-2, 3)
+    first = generate_order_confirmation(order)
+    order.customer_name = "Changed"  # not visible: the cached page is returned
+    assert generate_order_confirmation(order) is first
+    assert confirmation_cache.get(-2) is first
+
+def test_unpriced_orders_are_not_cached():
+    order = make_order(-3, 2, priced=False)
+    generate_order_confirmation(order)
+    assert confirmation_cache.get(-3) is None
+
+def test_cache_is_bounded_and_can_be_disabled():
+    cache = ConfirmationCache(max_entries=2)
+    for order_id in (1, 2, 3):
+        cache.put(order_id, str(order_id))
+    assert len(cache) == 2
+    assert cache.get(1) is None
+
+    disabled = ConfirmationCache(max_entries=0)
+    disabled.put(1, "x")
+    assert disabled.get(1) is None
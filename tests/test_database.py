@@ -0,0 +1,28 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import database
+from database import engine_options, to_async_url, TimedQueuePool, TimedAsyncQueuePool
+
+def test_to_async_url():
+    assert to_async_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+    assert to_async_url("postgresql+psycopg2://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert to_async_url("sqlite:////tmp/app.db") == "sqlite+aiosqlite:////tmp/app.db"
+
+def test_engine_options_statement_timeout(monkeypatch):
+    monkeypatch.setattr(database, "DB_STATEMENT_TIMEOUT_MS", 2500)
+    sync_options = engine_options("postgresql://u:p@db/app", is_async=False)
+    async_options = engine_options("postgresql+asyncpg://u:p@db/app", is_async=True)
+    assert sync_options["connect_args"] == {"options": "-c statement_timeout=2500"}
+    assert async_options["connect_args"] == {"server_settings": {"statement_timeout": "2500"}}
+    assert sync_options["poolclass"] is TimedQueuePool
+    assert async_options["poolclass"] is TimedAsyncQueuePool
+    assert "connect_args" not in engine_options("sqlite:////tmp/app.db", is_async=False)
+
+def test_pool_stats_survive_dispose():
+    stats = database.engine.pool.stats
+    with database.engine.connect():
+        pass
+    database.engine.dispose()
+    assert database.engine.pool.stats is stats
+    assert stats.checkouts >= 1
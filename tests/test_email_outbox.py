@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import socket
+import pytest
+from sqlmodel import Session
+import app as app_module
+import order_email
+from database import run_migrations, engine
+from email_outbox import EmailOutbox
+from models import EmailJobTable, OrderTable, OrderItemTable
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def create_job(recipient_email="buyer@example.com"):
+    run_migrations()
+    with Session(engine) as session:
+        order = OrderTable(customer_name="Outbox Customer", currency="USD")
+        order.order_items = [OrderItemTable(product_name="Keyboard", quantity=2)]
+        session.add(order)
+        session.commit()
+        job = EmailJobTable(order_id=order.id, recipient_email=recipient_email)
+        session.add(job)
+        session.commit()
+        return job.id
+
+def load_job(job_id):
+    with Session(engine) as session:
+        return session.get(EmailJobTable, job_id)
+
+def test_outbox_delivers_through_smtp(monkeypatch):
+    aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+    from aiosmtpd.handlers import Sink
+
+    class Recorder(Sink):
+        def __init__(self):
+            self.envelopes = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.envelopes.append(envelope)
+            return "250 OK"
+
+    handler = Recorder()
+    port = free_port()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        monkeypatch.setattr(order_email, "SMTP_HOST", "127.0.0.1")
+        monkeypatch.setattr(order_email, "SMTP_PORT", port)
+        job_id = create_job()
+        outbox = EmailOutbox(app_module.deliver_email_job, workers=1, batch_size=100)
+        while asyncio.run(outbox.process_batch()):
+            pass
+    finally:
+        controller.stop()
+
+    job = load_job(job_id)
+    assert job.status == "sent"
+    assert job.attempts == 1
+    delivered = [envelope for envelope in handler.envelopes if envelope.rcpt_tos == ["buyer@example.com"]]
+    assert delivered
+    assert b"application/pdf" in delivered[-1].content
+
+def test_outbox_retries_then_fails():
+    job_id = create_job()
+    calls = []
+
+    async def failing_deliver(job):
+        calls.append(job.id)
+        raise RuntimeError("SMTP unavailable")
+
+    outbox = EmailOutbox(failing_deliver, workers=1, batch_size=100, max_attempts=2, backoff_seconds=0)
+    asyncio.run(outbox.process_batch())
+    job = load_job(job_id)
+    assert job.status == "pending"
+    assert job.attempts == 1
+    assert job.last_error == "SMTP unavailable"
+
+    asyncio.run(outbox.process_batch())
+    job = load_job(job_id)
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert calls.count(job_id) == 2
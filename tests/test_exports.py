@@ -0,0 +1,103 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import csv
+import io
+import random
+import string
+import threading
+import time
+from datetime import datetime, timedelta
+import pyarrow.parquet as pq
+from fastapi.testclient import TestClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app import app
+from database import async_engine, run_migrations
+import exports
+from exports import EXPORT_FIELDS, csv_chunks, export_statement, iter_export_rows, parquet_chunks
+
+client = TestClient(app)
+
+def create_orders(count):
+    """Create orders with two lines each; returns the created_at range covering exactly them"""
+    run_migrations()
+    created_from = datetime.utcnow()
+    customer_name = "Export " + "".join(random.choices(string.ascii_letters, k=10))
+    response = client.post("/orders/batch", json={"orders": [
+        {"customer_name": customer_name, "currency": "EUR", "order_items": [
+            {"product_name": "Laptop", "quantity": 1},
+            {"product_name": "Mouse", "quantity": index + 1},
+        ]}
+        for index in range(count)
+    ]})
+    assert response.json()["created"] == count
+    time.sleep(0.01)
+    return created_from, datetime.utcnow(), customer_name
+
+async def collect(encode, created_from, created_to, batch_rows, **kwargs):
+    async with AsyncSession(async_engine) as session:
+        batches = iter_export_rows(session, export_statement(created_from, created_to, batch_rows))
+        return [chunk async for chunk in encode(batches, **kwargs)]
+
+def test_csv_export_has_one_row_per_line_item():
+    created_from, created_to, customer_name = create_orders(5)
+    response = client.get("/orders/export", params={"from": created_from.isoformat(), "to": created_to.isoformat()})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.headers["content-disposition"] == 'attachment; filename="orders.csv"'
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 10
+    assert list(rows[0]) == EXPORT_FIELDS
+    assert {row["customer_name"] for row in rows} == {customer_name}
+    assert [row["product_name"] for row in rows[:2]] == ["Laptop", "Mouse"]
+    assert all(row["unit_price"] and row["line_total"] for row in rows)
+
+def test_csv_is_streamed_one_cursor_batch_at_a_time():
+    created_from, created_to, _ = create_orders(4)
+    assert export_statement(batch_rows=3).get_execution_options()["yield_per"] == 3
+    chunks = asyncio.run(collect(csv_chunks, created_from, created_to, 3))
+    # 8 rows in batches of 3, 3 and 2; the header goes out with the first
+    assert [chunk.count(b"\n") for chunk in chunks] == [4, 3, 2]
+
+def test_parquet_export_writes_fixed_size_row_groups():
+    created_from, created_to, customer_name = create_orders(7)
+    chunks = asyncio.run(collect(parquet_chunks, created_from, created_to, 4, row_group_rows=5))
+    assert len(chunks) == 3  # two full row groups, then the last one with the footer
+    parquet_file = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert [parquet_file.metadata.row_group(index).num_rows for index in range(parquet_file.metadata.num_row_groups)] == [5, 5, 4]
+    table = parquet_file.read()
+    assert table.column_names == EXPORT_FIELDS
+    assert set(table.column("customer_name").to_pylist()) == {customer_name}
+
+    response = client.get("/orders/export", params={"format": "parquet", "from": created_from.isoformat(), "to": created_to.isoformat()})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    served = pq.ParquetFile(io.BytesIO(response.content)).read()
+    assert served.num_rows == 14
+    assert served.column("product_name").to_pylist()[:2] == ["Laptop", "Mouse"]
+
+def test_encoding_runs_off_the_event_loop(monkeypatch):
+    created_from, created_to, _ = create_orders(3)
+    threads = []
+
+    def recording(encode):
+        def wrapper(*args):
+            threads.append(threading.current_thread().name)
+            return encode(*args)
+        return wrapper
+
+    monkeypatch.setattr(exports, "csv_bytes", recording(exports.csv_bytes))
+    monkeypatch.setattr(exports, "write_row_group", recording(exports.write_row_group))
+    asyncio.run(collect(csv_chunks, created_from, created_to, 4))
+    asyncio.run(collect(parquet_chunks, created_from, created_to, 4, row_group_rows=4))
+    # Two CSV batches and two Parquet row groups, none on the loop's thread
+    assert len(threads) == 4
+    assert all(name.startswith("export") for name in threads)
+
+def test_invalid_export_requests_are_rejected():
+    assert client.get("/orders/export", params={"format": "xlsx"}).status_code == 400
+    now = datetime.utcnow()
+    response = client.get("/orders/export", params={"from": now.isoformat(), "to": (now - timedelta(days=1)).isoformat()})
+    assert response.status_code == 400
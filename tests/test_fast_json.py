@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+from app import app
+from database import engine, run_migrations
+from fast_json import dumps
+from models import OrderTable, OrderItemTable, OrderRead
+
+client = TestClient(app)
+
+def response_model_bytes(value, annotation) -> bytes:
+    """What FastAPI renders for a response_model: validate, dump in JSON mode, json.dumps"""
+    adapter = TypeAdapter(annotation)
+    content = adapter.dump_python(adapter.validate_python(value, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def test_dumps_matches_pydantic_json_mode():
+    order = {
+        "id": 1,
+        "customer_name": "Zoë Ångström",
+        "currency": "EUR",
+        "exchange_rate_version": None,
+        "order_total": Decimal("1234.50"),
+        "created_at": datetime(2025, 1, 2, 3, 4, 5, 6000),
+        "order_items": [{"id": 7, "product_name": "Mouse", "quantity": 2, "unit_price": Decimal("17.00"), "line_total": Decimal("34.00"), "order_id": 1}],
+    }
+    assert dumps(order) == response_model_bytes(order, OrderRead)
+
+def test_order_endpoints_are_byte_compatible_with_order_read():
+    run_migrations()
+    with Session(engine) as session:
+        order = OrderTable(customer_name="Zoë Fastpath", currency="GBP", created_at=datetime(2018, 5, 1, 8, 0, 0, 123456), order_total=Decimal("59.00"))
+        order.order_items = [
+            OrderItemTable(product_name="Speaker", quantity=1, unit_price=Decimal("70.80"), line_total=Decimal("70.80")),
+            OrderItemTable(product_name="Mouse", quantity=3),
+        ]
+        plain = OrderTable(customer_name="Fastpath Plain", currency="CAD", created_at=datetime(2018, 5, 1, 9, 0, 0))
+        plain.order_items = [OrderItemTable(product_name="Laptop", quantity=1)]
+        session.add_all([order, plain])
+        session.commit()
+        order_ids = [order.id, plain.id]
+
+    params = {"created_from": "2018-05-01T00:00:00", "created_to": "2018-05-02T00:00:00"}
+    page = client.get("/orders", params=params)
+    single = client.get(f"/orders/{order_ids[0]}")
+    streamed = client.get("/orders", params={**params, "stream": True})
+
+    with Session(engine) as session:
+        expected = session.exec(
+            select(OrderTable)
+            .where(OrderTable.created_at >= datetime(2018, 5, 1), OrderTable.created_at < datetime(2018, 5, 2))
+            .options(selectinload(OrderTable.order_items))
+            .order_by(OrderTable.created_at, OrderTable.id)
+        ).all()
+        assert page.content == response_model_bytes(expected, List[OrderRead])
+        assert single.content == response_model_bytes(session.get(OrderTable, order_ids[0]), OrderRead)
+        assert streamed.content == b"".join(response_model_bytes(order, OrderRead) + b"\n" for order in expected)
+
+    assert page.headers["content-type"] == "application/json"
+    assert client.get("/orders/999999999").status_code == 404
@@ -0,0 +1,115 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import random
+import string
+import uuid
+from datetime import datetime, timedelta
+import httpx
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
+from app import app, idempotency_store
+from database import engine, run_migrations
+from idempotency import IdempotencyStore
+from models import IdempotencyKeyTable, OrderTable
+
+client = TestClient(app)
+
+def new_order():
+    customer_name = "Idem " + "".join(random.choices(string.ascii_letters, k=12))
+    return {"customer_name": customer_name, "currency": "USD", "order_items": [{"product_name": "Keyboard", "quantity": 1}]}
+
+def order_count(customer_name):
+    with Session(engine) as session:
+        return session.exec(select(func.count(OrderTable.id)).where(OrderTable.customer_name == customer_name)).one()
+
+def test_repeated_key_replays_the_confirmation():
+    run_migrations()
+    order, key = new_order(), str(uuid.uuid4())
+    first = client.post("/order", json=order, headers={"Idempotency-Key": key})
+    assert first.status_code == 200
+    assert "idempotent-replayed" not in first.headers
+
+    replays = idempotency_store.replays
+    second = client.post("/order", json=order, headers={"Idempotency-Key": key})
+    assert second.status_code == 200
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.text == first.text
+    assert idempotency_store.replays == replays + 1
+    assert order_count(order["customer_name"]) == 1
+
+def test_replay_after_cache_loss_reads_the_table():
+    run_migrations()
+    order, key = new_order(), str(uuid.uuid4())
+    first = client.post("/order", json=order, headers={"Idempotency-Key": key})
+    idempotency_store._cache.clear()
+    second = client.post("/order", json=order, headers={"Idempotency-Key": key})
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.text == first.text
+    assert order_count(order["customer_name"]) == 1
+
+def test_key_reused_for_another_order_is_rejected():
+    run_migrations()
+    key = str(uuid.uuid4())
+    assert client.post("/order", json=new_order(), headers={"Idempotency-Key": key}).status_code == 200
+    other = new_order()
+    response = client.post("/order", json=other, headers={"Idempotency-Key": key})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["header", "idempotency-key"]
+    assert order_count(other["customer_name"]) == 0
+
+def test_overlong_key_is_rejected():
+    response = client.post("/order", json=new_order(), headers={"Idempotency-Key": "k" * 256})
+    assert response.status_code == 422
+
+def test_concurrent_duplicates_create_one_order():
+    run_migrations()
+    order, key = new_order(), str(uuid.uuid4())
+
+    async def submit_twice():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await asyncio.gather(*[
+                async_client.post("/order", json=order, headers={"Idempotency-Key": key}) for _ in range(2)
+            ])
+
+    responses = asyncio.run(submit_twice())
+    assert [response.status_code for response in responses] == [200, 200]
+    assert responses[0].text == responses[1].text
+    assert order_count(order["customer_name"]) == 1
+
+def test_sweep_deletes_expired_keys():
+    run_migrations()
+    order, key = new_order(), str(uuid.uuid4())
+    client.post("/order", json=order, headers={"Idempotency-Key": key})
+    with Session(engine) as session:
+        row = session.get(IdempotencyKeyTable, key)
+        row.created_at = datetime.utcnow() - timedelta(days=2)
+        session.add(row)
+        session.commit()
+
+    store = IdempotencyStore(ttl_seconds=24 * 3600)
+    assert asyncio.run(store.sweep()) >= 1
+    with Session(engine) as session:
+        assert session.get(IdempotencyKeyTable, key) is None
+
+def test_expired_key_can_be_reused_before_it_is_swept():
+    run_migrations()
+    key = str(uuid.uuid4())
+    first = new_order()
+    assert client.post("/order", json=first, headers={"Idempotency-Key": key}).status_code == 200
+    with Session(engine) as session:
+        row = session.get(IdempotencyKeyTable, key)
+        row.created_at = datetime.utcnow() - timedelta(days=2)
+        session.add(row)
+        session.commit()
+    idempotency_store._cache.clear()
+
+    second = new_order()
+    response = client.post("/order", json=second, headers={"Idempotency-Key": key})
+    assert response.status_code == 200
+    assert "idempotent-replayed" not in response.headers
+    assert order_count(second["customer_name"]) == 1
+    with Session(engine) as session:
+        assert session.get(IdempotencyKeyTable, key).created_at > datetime.utcnow() - timedelta(hours=1)
@@ -0,0 +1,28 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import subprocess
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Loaded on the first PDF, email or Parquet request, or in warm_up(); never by `import app`
+LAZY_MODULES = ("reportlab", "emails", "order_pdf", "order_email", "pyarrow")
+
+def import_times(module: str) -> dict:
+    """Self and cumulative microseconds per module, from `python -X importtime`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+def test_pdf_and_email_modules_are_not_imported_at_startup():
+    times = import_times("app")
+    imported = [name for name in times if name.split(".")[0] in LAZY_MODULES]
+    assert imported == [], f"`import app` loaded {', '.join(imported)}"
@@ -0,0 +1,76 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import random
+import re
+import string
+from fastapi.testclient import TestClient
+from app import app
+from database import run_migrations
+from metrics import Registry, STAGE_SECONDS
+
+client = TestClient(app)
+
+def sample(text, name, **labels):
+    """Value of one sample in an exposition, or None"""
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}{re.escape('{' + rendered + '}') if rendered else ''} (\S+)$", text, re.M)
+    return float(match.group(1)) if match else None
+
+def test_histogram_exposition_is_cumulative():
+    registry = Registry()
+    histogram = registry.histogram("work_seconds", "Work", ("kind",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "a")
+    text = registry.render()
+    assert "# TYPE work_seconds histogram" in text
+    assert sample(text, "work_seconds_bucket", kind="a", le="0.1") == 1
+    assert sample(text, "work_seconds_bucket", kind="a", le="1.0") == 3
+    assert sample(text, "work_seconds_bucket", kind="a", le="+Inf") == 4
+    assert sample(text, "work_seconds_count", kind="a") == 4
+    assert sample(text, "work_seconds_sum", kind="a") == 6.05
+
+def test_counters_gauges_and_failing_callbacks():
+    registry = Registry()
+    registry.counter("jobs", "Jobs", ("status",)).inc("sent", amount=2)
+    registry.gauge("depth", "Depth", lambda: {("pdf",): 3}, ("pool",))
+    registry.gauge("broken", "Broken", lambda: 1 / 0)
+    text = registry.render()
+    assert sample(text, "jobs_total", status="sent") == 2
+    assert sample(text, "depth", pool="pdf") == 3
+    assert "broken" not in text
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    registry.gauge("odd", "Odd", lambda: {('say "hi"\n',): 1}, ("label",))
+    assert 'odd{label="say \\"hi\\"\\n"} 1' in registry.render()
+
+def test_requests_are_recorded_per_route_template():
+    client.get("/orders/999999998")
+    client.get("/orders/999999997")
+    client.get("/no-such-path")
+    text = client.get("/metrics").text
+    assert sample(text, "http_request_duration_seconds_count", method="GET", route="/orders/{order_id}", status="404") >= 2
+    assert sample(text, "http_request_duration_seconds_count", method="GET", route="unmatched", status="404") >= 1
+    assert "999999998" not in text
+
+def test_order_stages_and_gauges_are_exposed():
+    run_migrations()
+    validations = STAGE_SECONDS.count("validation")
+    commits = STAGE_SECONDS.count("commit")
+    response = client.post("/order", json={
+        "customer_name": "Metrics " + "".join(random.choices(string.ascii_letters, k=10)),
+        "currency": "CAD",
+        "order_items": [{"product_name": "Monitor", "quantity": 1}]
+    })
+    assert response.status_code == 200
+    assert STAGE_SECONDS.count("validation") == validations + 1
+    assert STAGE_SECONDS.count("commit") == commits + 1
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert sample(text, "order_stage_duration_seconds_count", stage="validation") >= 1
+    assert sample(text, "cache_hit_ratio", cache="order") is not None
+    assert sample(text, "email_jobs_pending") is not None
+    assert "# TYPE executor_queue_depth gauge" in text
@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import logging
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlmodel import SQLModel
+import models  # noqa: F401
+from database import alembic_config, engine, run_migrations
+
+def test_migrations_reach_single_head():
+    script = ScriptDirectory.from_config(alembic_config())
+    assert len(script.get_heads()) == 1
+
+def test_migrated_schema_matches_models():
+    run_migrations()
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"compare_type": False})
+        assert compare_metadata(context, SQLModel.metadata) == []
+
+def test_run_migrations_keeps_the_app_logging_setup():
+    root = logging.getLogger()
+    uvicorn_logger = logging.getLogger("uvicorn.error")
+    saved = (root.handlers[:], root.level, uvicorn_logger.level, uvicorn_logger.disabled)
+    handler = logging.NullHandler()
+    try:
+        root.handlers[:] = [handler]
+        root.setLevel(logging.DEBUG)
+        uvicorn_logger.setLevel(logging.INFO)
+        run_migrations()
+        assert root.handlers == [handler]
+        assert root.level == logging.DEBUG
+        assert uvicorn_logger.level == logging.INFO and not uvicorn_logger.disabled
+    finally:
+        root.handlers[:], root.level = saved[0], saved[1]
+        uvicorn_logger.setLevel(saved[2])
+        uvicorn_logger.disabled = saved[3]
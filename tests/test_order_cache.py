@@ -0,0 +1,106 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import random
+import string
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from app import app, order_cache
+from database import engine
+from models import OrderTable
+from order_cache import MemoryBackend, OrderCache, order_etag
+
+client = TestClient(app)
+
+def test_lru_evicts_least_recently_used():
+    async def scenario():
+        cache = OrderCache(max_entries=2, ttl_seconds=0)
+        await cache.put(1, b'{"id":1}')
+        await cache.put(2, b'{"id":2}')
+        assert await cache.get(1) is not None  # 1 is now the most recent
+        await cache.put(3, b'{"id":3}')
+        assert await cache.get(2) is None
+        assert (await cache.get(3)).etag == order_etag(b'{"id":3}')
+        return cache.metrics()
+
+    metrics = asyncio.run(scenario())
+    assert metrics["entries"] == 2
+    assert metrics["evictions"] == 1
+    assert metrics["hits"] == 2
+    assert metrics["misses"] == 1
+    assert metrics["hit_ratio"] == 0.6667
+
+def test_entries_expire():
+    async def scenario():
+        cache = OrderCache(ttl_seconds=0.01)
+        await cache.put(1, b"{}")
+        await asyncio.sleep(0.02)
+        return await cache.get(1)
+
+    assert asyncio.run(scenario()) is None
+
+def test_shared_backend_serves_other_workers():
+    async def scenario():
+        backend = MemoryBackend()
+        first, second = OrderCache(backend=backend), OrderCache(backend=backend)
+        await first.put(42, b'{"id":42}')
+        cached = await second.get(42)
+        again = await second.get(42)
+        return cached, again, second.metrics()
+
+    cached, again, metrics = asyncio.run(scenario())
+    assert cached.body == b'{"id":42}'
+    assert again == cached
+    assert metrics["shared_hits"] == 1
+    assert metrics["hits"] == 2
+
+def test_shared_backend_errors_fall_through():
+    class BrokenBackend(MemoryBackend):
+        async def get(self, key):
+            raise ConnectionError("down")
+
+    async def scenario():
+        cache = OrderCache(backend=BrokenBackend())
+        return await cache.get(1), cache.metrics()
+
+    cached, metrics = asyncio.run(scenario())
+    assert cached is None
+    assert metrics["shared_errors"] == 1
+    assert metrics["misses"] == 1
+
+def test_created_order_is_served_from_cache_with_etag():
+    customer_name = "Cache " + "".join(random.choices(string.ascii_letters, k=12))
+    response = client.post("/order", json={
+        "customer_name": customer_name,
+        "currency": "CAD",
+        "order_items": [{"product_name": "Mouse", "quantity": 2}]
+    })
+    assert response.status_code == 200
+    with Session(engine) as session:
+        order_id = session.exec(select(OrderTable.id).where(OrderTable.customer_name == customer_name)).one()
+
+    hits = order_cache.hits
+    response = client.get(f"/orders/{order_id}")
+    assert response.status_code == 200
+    assert order_cache.hits == hits + 1
+    assert response.json()["customer_name"] == customer_name
+    etag = response.headers["etag"]
+    assert etag == order_etag(response.content)
+
+    not_modified = client.get(f"/orders/{order_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    assert client.get(f"/orders/{order_id}/pdf").status_code == 200
+    assert order_cache.hits == hits + 3
+
+    metrics = client.get("/metrics/order-cache").json()
+    assert metrics["entries"] >= 1
+    assert metrics["hits"] >= 3
+
+def test_missing_order_is_not_cached():
+    misses = order_cache.misses
+    assert client.get("/orders/999999999").status_code == 404
+    assert order_cache.misses == misses + 1
+    assert order_cache.metrics()["entries"] == len(order_cache._entries)
@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pdf_cache import PdfCache, content_key
+
+def test_content_key_is_order_independent_for_dict_fields():
+    assert content_key({"a": 1, "b": [1, 2]}) == content_key({"b": [1, 2], "a": 1})
+    assert content_key({"a": 1}) != content_key({"a": 2})
+
+def test_memory_level_evicts_least_recently_used():
+    cache = PdfCache(directory=None, max_memory_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+
+def test_disk_level_survives_memory_and_is_bounded(tmp_path):
+    cache = PdfCache(directory=str(tmp_path), max_memory_bytes=0, max_disk_bytes=25)
+    for index in range(5):
+        cache.put(f"k{index}", b"x" * 10)
+        os.utime(tmp_path / f"k{index}.pdf", (index, index))
+    remaining = sorted(path.name for path in tmp_path.glob("*.pdf"))
+    assert remaining == ["k3.pdf", "k4.pdf"]
+    # A fresh cache on the same directory (another worker) sees the entries
+    assert PdfCache(directory=str(tmp_path)).get("k4") == b"x" * 10
+
+def test_new_version_of_an_order_replaces_the_old_entry(tmp_path):
+    cache = PdfCache(directory=str(tmp_path))
+    renders = []
+    render = lambda: renders.append(1) or b"pdf"
+    assert cache.get_or_render("v1", render, order_id=7) == b"pdf"
+    assert cache.get_or_render("v1", render, order_id=7) == b"pdf"
+    assert len(renders) == 1
+    cache.get_or_render("v2", render, order_id=7)
+    assert cache.get("v1") is None
+    cache.invalidate_order(7)
+    assert cache.get("v2") is None
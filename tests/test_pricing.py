@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app import app
+from backfill_order_totals import backfill_order_totals
+from database import engine, run_migrations
+from models import OrderTable, OrderItemTable
+from pricing import price_lines, unit_price
+
+client = TestClient(app)
+
+def test_unit_price_rounds_half_up_to_cents():
+    assert unit_price(25, 0.75) == Decimal("18.75")
+    assert unit_price(30, 0.685) == Decimal("20.55")
+    assert unit_price(0.1, 3) == Decimal("0.30")
+
+def test_order_total_is_sum_of_rounded_lines():
+    lines, total = price_lines([("Mouse", 3), ("Charger", 7)], "EUR", {"Mouse": 25.0, "Charger": 30.0}, {"EUR": 0.685})
+    assert lines == [(Decimal("17.13"), Decimal("51.39")), (Decimal("20.55"), Decimal("143.85"))]
+    assert total == Decimal("195.24")
+
+def test_batch_orders_store_totals():
+    response = client.post("/orders/batch", json={"orders": [{
+        "customer_name": "Totals Customer",
+        "currency": "CAD",
+        "order_items": [{"product_name": "Laptop", "quantity": 2}, {"product_name": "Mouse", "quantity": 3}]
+    }]})
+    order_id = response.json()["results"][0]["order_id"]
+    order = client.get(f"/orders/{order_id}").json()
+    assert Decimal(order["order_total"]) == Decimal("2475.00")
+    assert [Decimal(item["line_total"]) for item in order["order_items"]] == [Decimal("2400.00"), Decimal("75.00")]
+
+def test_backfill_prices_legacy_orders():
+    run_migrations()
+    with Session(engine) as session:
+        order = OrderTable(customer_name="Legacy Customer", currency="USD")
+        order.order_items = [OrderItemTable(product_name="Keyboard", quantity=4)]
+        session.add(order)
+        session.commit()
+        order_id = order.id
+
+    assert backfill_order_totals(batch_size=2, rates={"USD": 0.75}) >= 1
+    assert backfill_order_totals(rates={"USD": 0.75}) == 0
+
+    with Session(engine) as session:
+        order = session.get(OrderTable, order_id)
+        assert order.order_total == Decimal("225.00")
+        assert order.order_items[0].unit_price == Decimal("56.25")
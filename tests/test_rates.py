@@ -0,0 +1,156 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from fastapi.testclient import TestClient
+import app as app_module
+from rates import ExchangeRateService, FileRateProvider, HttpRateProvider, StaticRateProvider, provider_from_source
+
+class FeedServer:
+    """Local stand-in for an exchange rate feed"""
+
+    def __init__(self, feed):
+        self.feed = feed
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                if server.feed is None:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps(server.feed).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/rates"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def test_provider_from_source(tmp_path):
+    assert isinstance(provider_from_source(""), StaticRateProvider)
+    assert isinstance(provider_from_source("https://rates.example.com/cad"), HttpRateProvider)
+    provider = provider_from_source(f"file://{tmp_path}/rates.json")
+    assert isinstance(provider, FileRateProvider)
+    assert provider.path == f"{tmp_path}/rates.json"
+
+def test_file_provider_and_versions(tmp_path):
+    feed_path = tmp_path / "rates.json"
+    feed_path.write_text(json.dumps({"base": "CAD", "rates": {"USD": 0.7, "EUR": 0.6}, "version": "2025-08-29"}))
+    service = ExchangeRateService(FileRateProvider(str(feed_path)))
+    assert service.snapshot.version == "2025-08-29"
+    assert service.snapshot.rate("USD") == 0.7
+    assert service.snapshot.rate("CAD") == 1.0
+
+    # Feeds without a version get one derived from their content
+    feed_path.write_text(json.dumps({"base": "CAD", "rates": {"USD": 0.72}}))
+    assert asyncio.run(service.refresh(force=True))
+    assert len(service.snapshot.version) == 12
+    assert service.rates["USD"] == 0.72
+
+def test_rejects_invalid_feeds(tmp_path):
+    feed_path = tmp_path / "rates.json"
+    feed_path.write_text(json.dumps({"base": "USD", "rates": {"CAD": 1.33}}))
+    with pytest.raises(ValueError):
+        ExchangeRateService(FileRateProvider(str(feed_path))).load()
+    feed_path.write_text(json.dumps({"base": "CAD", "rates": {"USD": 0}}))
+    with pytest.raises(ValueError):
+        ExchangeRateService(FileRateProvider(str(feed_path))).load()
+
+def test_http_feed_refresh_keeps_last_good_snapshot():
+    with FeedServer({"base": "CAD", "rates": {"USD": 0.74}, "version": "v1"}) as feed:
+        service = ExchangeRateService(HttpRateProvider(feed.url), ttl_seconds=3600, retry_seconds=0.01)
+        service.load()
+        first = service.snapshot
+
+        async def scenario():
+            # Still fresh: served from memory without a fetch
+            assert not await service.refresh()
+            feed.feed = {"base": "CAD", "rates": {"USD": 0.76}, "version": "v2"}
+            assert await service.refresh(force=True)
+            feed.feed = None
+            service.ttl_seconds = 0.01
+            service.start()
+            await asyncio.sleep(0.2)
+            await service.stop()
+
+        asyncio.run(scenario())
+        assert first.rates["USD"] == 0.74
+        assert service.snapshot.version == "v2"
+        assert service.rates["USD"] == 0.76
+        assert feed.requests >= 3
+
+def test_orders_record_rate_version_and_endpoint_etag(monkeypatch):
+    service = ExchangeRateService(StaticRateProvider({"USD": 0.5, "EUR": 0.4, "GBP": 0.3}))
+    monkeypatch.setattr(app_module, "exchange_rate_service", service)
+    with TestClient(app_module.app) as client:
+        response = client.get("/api/exchange-rates")
+        assert response.json() == {"CAD": 1.0, "EUR": 0.4, "GBP": 0.3, "USD": 0.5}
+        etag = response.headers["ETag"]
+        assert etag == f'"{service.snapshot.version}"'
+        assert client.get("/api/exchange-rates", headers={"If-None-Match": etag}).status_code == 304
+
+        created = client.post("/order", json={
+            "customer_name": "Rate Customer",
+            "currency": "USD",
+            "order_items": [{"product_name": "Mouse", "quantity": 2}]
+        })
+        assert created.status_code == 200
+        # 2 x 25.00 CAD at 0.5
+        assert "25.00 USD" in created.text
+
+        batch = client.post("/orders/batch", json={"orders": [{
+            "customer_name": "Rate Customer",
+            "currency": "EUR",
+            "order_items": [{"product_name": "Mouse", "quantity": 1}]
+        }]})
+        order_id = batch.json()["results"][0]["order_id"]
+        assert client.get(f"/orders/{order_id}").json()["exchange_rate_version"] == service.snapshot.version
+
+def test_currencies_follow_the_rate_feed(monkeypatch):
+    service = ExchangeRateService(StaticRateProvider({"USD": 0.5, "JPY": 110.0}))
+    monkeypatch.setattr(app_module, "exchange_rate_service", service)
+    with TestClient(app_module.app) as client:
+        # Dropped from the feed: rejected rather than priced at a rate of 1.0
+        dropped = client.post("/order", json={
+            "customer_name": "Rate Customer",
+            "currency": "GBP",
+            "order_items": [{"product_name": "Mouse", "quantity": 1}]
+        })
+        assert dropped.status_code == 422
+        assert dropped.json()["detail"][0]["msg"] == "Currency 'GBP' is not supported. Supported currencies: CAD, JPY, USD"
+        batch = client.post("/orders/batch", json={"orders": [{
+            "customer_name": "Rate Customer",
+            "currency": "GBP",
+            "order_items": [{"product_name": "Mouse", "quantity": 1}]
+        }]})
+        assert batch.json()["results"][0]["errors"][0]["loc"] == ["body", "orders", 0, "currency"]
+
+        # Added to the feed: accepted and priced at its rate
+        added = client.post("/order", json={
+            "customer_name": "Rate Customer",
+            "currency": "JPY",
+            "order_items": [{"product_name": "Mouse", "quantity": 1}]
+        })
+        assert added.status_code == 200
+        assert "2750.00 JPY" in added.text
@@ -0,0 +1,125 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from sqlalchemy import event, func
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+import app as app_module
+from database import async_engine, engine, run_migrations
+from models import OrderTable, OrderItemTable, SalesCustomerTable
+from pricing import price_order
+from reports import UPSERT_MAX_PARAMETERS, OrderSale, record_sales, rebuild_summaries
+
+client = TestClient(app_module.app)
+
+RANGE = {"from": "2020-03-01", "to": "2020-04-01"}
+
+@pytest.fixture(scope="module")
+def march_2020_orders():
+    """Priced orders in March 2020, a range no other test writes to"""
+    run_migrations()
+    orders = [
+        ("Report Alice", "CAD", datetime(2020, 3, 2, 9, 30), [("Laptop", 1), ("Mouse", 2)]),
+        ("Report Alice", "CAD", datetime(2020, 3, 8, 23, 59), [("Mouse", 4)]),
+        ("Report Bob", "USD", datetime(2020, 3, 9, 0, 0), [("Monitor", 2)]),
+        ("Report Carol", "CAD", datetime(2020, 3, 31, 12, 0), [("Keyboard", 1)]),
+    ]
+    with Session(engine) as session:
+        if session.exec(select(OrderTable).where(OrderTable.customer_name == "Report Alice")).first():
+            return
+        for customer_name, currency, created_at, items in orders:
+            order = OrderTable(customer_name=customer_name, currency=currency, created_at=created_at)
+            order.order_items = [OrderItemTable(product_name=name, quantity=quantity) for name, quantity in items]
+            price_order(order, {"Laptop": 1200.0, "Mouse": 25.0, "Monitor": 300.0, "Keyboard": 75.0}, {"USD": 0.75})
+            session.add(order)
+        session.commit()
+
+def test_sales_reports_from_orders(march_2020_orders):
+    products = client.get("/reports/sales/products", params=RANGE).json()
+    assert products[0] == {"product_name": "Laptop", "currency": "CAD", "quantity": 1, "revenue": "1200.00"}
+    assert {"product_name": "Mouse", "currency": "CAD", "quantity": 6, "revenue": "150.00"} in products
+
+    currencies = client.get("/reports/sales/currencies", params=RANGE).json()
+    assert currencies == [
+        {"currency": "CAD", "orders": 3, "revenue": "1425.00"},
+        {"currency": "USD", "orders": 1, "revenue": "450.00"},
+    ]
+
+    weeks = client.get("/reports/sales/periods", params={**RANGE, "period": "week"}).json()
+    assert [(row["period"], row["currency"], row["orders"]) for row in weeks] == [
+        ("2020-03-02", "CAD", 2),
+        ("2020-03-09", "USD", 1),
+        ("2020-03-30", "CAD", 1),
+    ]
+    months = client.get("/reports/sales/periods", params={**RANGE, "period": "month"}).json()
+    assert [(row["period"], row["revenue"]) for row in months] == [("2020-03-01", "1425.00"), ("2020-03-01", "450.00")]
+
+    customers = client.get("/reports/sales/customers", params={**RANGE, "limit": 2}).json()
+    assert [row["customer_name"] for row in customers] == ["Report Alice", "Report Bob"]
+    assert customers[0]["orders"] == 2
+
+def test_sales_reports_reject_bad_parameters():
+    assert client.get("/reports/sales/periods", params={"period": "year"}).status_code == 422
+    assert client.get("/reports/sales/products", params={"from": "2020-04-01", "to": "2020-03-01"}).status_code == 400
+
+def test_summary_tables_match_orders_and_follow_new_orders(march_2020_orders, monkeypatch):
+    reports = [
+        ("/reports/sales/products", RANGE),
+        ("/reports/sales/currencies", RANGE),
+        ("/reports/sales/periods", {**RANGE, "period": "week"}),
+        ("/reports/sales/periods", {**RANGE, "period": "month"}),
+    ]
+    from_orders = [client.get(path, params=params).json() for path, params in reports]
+
+    rebuild_summaries()
+    monkeypatch.setattr(app_module, "REPORTS_SUMMARY_TABLES", True)
+    assert [client.get(path, params=params).json() for path, params in reports] == from_orders
+
+    def customer_row():
+        rows = client.get("/reports/sales/customers", params={"limit": 100}).json()
+        return next((row for row in rows if row["customer_name"] == "Summary Dana"), None)
+
+    before = customer_row() or {"orders": 0, "revenue": "0.00"}
+    order = {"customer_name": "Summary Dana", "currency": "CAD", "order_items": [{"product_name": "Tablet", "quantity": 3}]}
+    assert client.post("/order", json=order).status_code == 200
+    assert client.post("/orders/batch", json={"orders": [order, order]}).json()["created"] == 2
+    after = customer_row()
+    assert after["orders"] == before["orders"] + 3
+    assert float(after["revenue"]) == float(before["revenue"]) + 4500
+
+def test_large_batches_are_summarised_in_chunks():
+    run_migrations()
+    customer_count = UPSERT_MAX_PARAMETERS // 4 + 1500  # 4 columns per customer row: two chunks
+    sales = [
+        OrderSale(datetime(2019, 6, 1), "EUR", f"Chunk Customer {index}", Decimal("10.00"), [("Mouse", 1, Decimal("10.00"))])
+        for index in range(customer_count)
+    ]
+    inserts = []
+
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO SALES_CUSTOMER"):
+            inserts.append(statement)
+
+    async def record_and_count():
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count_inserts)
+        try:
+            async with AsyncSession(async_engine) as session:
+                await record_sales(session, sales)
+                orders, revenue = (await session.exec(
+                    select(func.sum(SalesCustomerTable.orders), func.sum(SalesCustomerTable.revenue))
+                    .where(SalesCustomerTable.customer_name.like("Chunk Customer %"))
+                )).one()
+                await session.rollback()
+                return orders, revenue
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count_inserts)
+
+    orders, revenue = asyncio.run(record_and_count())
+    assert len(inserts) == 2
+    assert orders == customer_count
+    assert Decimal(revenue) == Decimal("10.00") * customer_count
@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import time
+import app as application
+from executors import run_blocking
+from server import worker_count
+
+def test_worker_count_defaults_to_available_cores():
+    assert worker_count(3) == 3
+    expected = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    assert worker_count(0) == expected
+
+def test_lifespan_warms_up_and_records_cold_start():
+    async def start_and_stop():
+        async with application.app.router.lifespan_context(application.app):
+            return application.WARMED_UP
+
+    assert asyncio.run(start_and_stop())
+    assert "worker_cold_start_seconds " in application.REGISTRY.render()
+
+def test_shutdown_waits_for_in_flight_pool_work():
+    finished = []
+
+    def slow_job():
+        time.sleep(0.2)
+        finished.append(True)
+
+    async def start_job_then_stop():
+        async with application.app.router.lifespan_context(application.app):
+            asyncio.ensure_future(run_blocking("email", slow_job))
+            await asyncio.sleep(0.01)
+
+    asyncio.run(start_job_then_stop())
+    assert finished == [True]
@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from fastapi.testclient import TestClient
+from app import app
+from models import OrderCreate
+from validation import OrderValidationError, order_errors, validate_order, validate_orders
+
+client = TestClient(app)
+
+PRODUCTS = frozenset({"Laptop", "Mouse"})
+CURRENCIES = frozenset({"CAD", "USD", "EUR", "GBP"})
+
+def make_order(customer_name="Valid Customer", currency="CAD", items=(("Mouse", 1),)):
+    return OrderCreate.model_validate({
+        "customer_name": customer_name,
+        "currency": currency,
+        "order_items": [{"product_name": name, "quantity": quantity} for name, quantity in items]
+    })
+
+def test_valid_order_has_no_errors():
+    order = make_order(items=[("Mouse", 1), ("Laptop", 2)])
+    assert order_errors(order, PRODUCTS, CURRENCIES) == []
+    assert validate_order(order, PRODUCTS, CURRENCIES) is order
+
+def test_every_error_is_reported_with_its_location():
+    order = make_order("R2D2", "JPY", [("Mouse", 1), ("Tablet", 1), ("Mouse", 999999), (" ", 1)])
+    errors = order_errors(order, PRODUCTS, CURRENCIES)
+    assert [(error["loc"], error["input"]) for error in errors] == [
+        (["body", "customer_name"], "R2D2"),
+        (["body", "currency"], "JPY"),
+        (["body", "order_items", 1, "product_name"], "Tablet"),
+        (["body", "order_items", 2, "product_name"], "Mouse"),
+        (["body", "order_items", 3, "product_name"], " "),
+        (["body", "order_items"], 1000002),
+    ]
+    assert all(error["type"] == "value_error" for error in errors)
+    assert "Duplicate product name detected: 'Mouse'." in errors[3]["msg"]
+
+def test_order_item_count_limits():
+    assert order_errors(make_order(items=[]), PRODUCTS, CURRENCIES)[0]["msg"] == "Order must have at least one order item."
+    too_many = make_order(items=[("Mouse", 1)] * 101)
+    messages = [error["msg"] for error in order_errors(too_many, PRODUCTS, CURRENCIES)]
+    assert "You cannot add more than 100 line items." in messages
+
+def test_validate_order_raises_with_all_errors():
+    with pytest.raises(OrderValidationError) as raised:
+        validate_order(make_order("", "XYZ"), PRODUCTS, CURRENCIES)
+    assert len(raised.value.errors) == 2
+    assert "Customer name cannot be empty" in str(raised.value)
+
+def test_batch_errors_are_located_per_order():
+    results = validate_orders([make_order(), make_order(currency="JPY"), make_order()], PRODUCTS, CURRENCIES)
+    assert results[0] == [] and results[2] == []
+    assert results[1][0]["loc"] == ["body", "orders", 1, "currency"]
+
+def test_supported_currencies_come_from_the_given_rates():
+    errors = order_errors(make_order(currency="USD"), PRODUCTS, {"CAD": 1.0, "EUR": 0.68})
+    assert errors[0]["msg"] == "Currency 'USD' is not supported. Supported currencies: CAD, EUR"
+    assert order_errors(make_order(currency="JPY"), PRODUCTS, {"CAD": 1.0, "JPY": 110.0}) == []
+
+def test_create_order_returns_structured_422():
+    response = client.post("/order", json={
+        "customer_name": "Bad Name 1",
+        "currency": "JPY",
+        "order_items": [{"product_name": "Mouse", "quantity": 1}, {"product_name": "Mouse", "quantity": 1}]
+    })
+    assert response.status_code == 422
+    assert [error["loc"] for error in response.json()["detail"]] == [
+        ["body", "customer_name"],
+        ["body", "currency"],
+        ["body", "order_items", 1, "product_name"],
+    ]
+
+def test_batch_results_include_structured_errors():
+    response = client.post("/orders/batch", json={"orders": [
+        {"customer_name": "Batch Invalid", "currency": "JPY", "order_items": [{"product_name": "Mouse", "quantity": 1}]}
+    ]})
+    result = response.json()["results"][0]
+    assert result["status"] == "error"
+    assert "not supported" in result["error"]
+    assert result["errors"][0]["loc"] == ["body", "orders", 0, "currency"]
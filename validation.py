@@ -0,0 +1,117 @@
+"""
+Order validation in one pass over the submitted models.
+
+Every rule is checked and every failure is reported, in the shape FastAPI
+uses for request validation errors, so clients can show all problems at
+once and map each one to its field:
+
+    {"type": "value_error", "loc": ["body", "order_items", 1, "product_name"], "msg": "...", "input": "..."}
+"""
+import re
+from typing import Collection, Container, Iterable, List, Sequence, Tuple
+
+from models import OrderCreate
+
+CUSTOMER_NAME_PATTERN = re.compile(r"[a-zA-Z ]+")
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+MAX_ORDER_ITEMS = 100
+MAX_TOTAL_QUANTITY = 1000000
+
+class OrderValidationError(ValueError):
+    """Raised with every error found in an order"""
+
+    def __init__(self, errors: List[dict]):
+        super().__init__(" ".join(error["msg"] for error in errors))
+        self.errors = errors
+
+def error(loc: Sequence, msg: str, value) -> dict:
+    """One error in FastAPI's request validation format"""
+    return {"type": "value_error", "loc": list(loc), "msg": msg, "input": value}
+
+def order_errors(order: OrderCreate, products: Container[str], currencies: Collection[str], loc: Tuple = ("body",)) -> List[dict]:
+    """
+    Check an order against every rule.
+
+    Args:
+        order (OrderCreate): The submitted order.
+        products (Container[str]): Names of the products that can be ordered.
+        currencies (Collection[str]): Currencies of the current exchange rates.
+        loc (Tuple): Location of the order in the request body.
+
+    Returns:
+        List[dict]: The errors, empty when the order is valid.
+    """
+    errors = []
+    customer_name = order.customer_name
+    if not customer_name.strip():
+        errors.append(error(loc + ("customer_name",), "Customer name cannot be empty or whitespace.", customer_name))
+    elif CUSTOMER_NAME_PATTERN.fullmatch(customer_name) is None:
+        errors.append(error(loc + ("customer_name",), "Customer name can only contain alphabetic characters and spaces.", customer_name))
+
+    if order.currency not in currencies:
+        errors.append(error(
+            loc + ("currency",),
+            f"Currency '{order.currency}' is not supported. Supported currencies: {', '.join(sorted(currencies))}",
+            order.currency
+        ))
+
+    items = order.order_items
+    if not items:
+        errors.append(error(loc + ("order_items",), "Order must have at least one order item.", items))
+    elif len(items) > MAX_ORDER_ITEMS:
+        errors.append(error(loc + ("order_items",), f"You cannot add more than {MAX_ORDER_ITEMS} line items.", len(items)))
+
+    seen = set()
+    total_quantity = 0
+    for index, item in enumerate(items):
+        product_name = item.product_name
+        if not product_name.strip():
+            errors.append(error(loc + ("order_items", index, "product_name"), "Product name cannot be empty or whitespace.", product_name))
+        elif product_name not in products:
+            errors.append(error(
+                loc + ("order_items", index, "product_name"),
+                f"Product '{product_name}' is not available. Please select from predefined products.",
+                product_name
+            ))
+        if product_name in seen:
+            errors.append(error(loc + ("order_items", index, "product_name"), f"Duplicate product name detected: '{product_name}'.", product_name))
+        seen.add(product_name)
+        total_quantity += item.quantity
+
+    if total_quantity > MAX_TOTAL_QUANTITY:
+        errors.append(error(loc + ("order_items",), "The total quantity for the order cannot exceed 1,000,000.", total_quantity))
+    return errors
+
+def validate_order(order: OrderCreate, products: Container[str], currencies: Collection[str]) -> OrderCreate:
+    """
+    Validate one order.
+
+    Args:
+        order (OrderCreate): The submitted order.
+        products (Container[str]): Names of the products that can be ordered.
+        currencies (Collection[str]): Currencies of the current exchange rates.
+
+    Returns:
+        OrderCreate: The same order if it is valid.
+
+    Raises:
+        OrderValidationError: With every error found.
+    """
+    errors = order_errors(order, products, currencies)
+    if errors:
+        raise OrderValidationError(errors)
+    return order
+
+def validate_orders(orders: Iterable[OrderCreate], products: Container[str], currencies: Collection[str]) -> List[List[dict]]:
+    """
+    Validate many orders against the same products and currencies, for bulk ingest.
+
+    Args:
+        orders (Iterable[OrderCreate]): The submitted orders.
+        products (Container[str]): Names of the products that can be ordered.
+        currencies (Collection[str]): Currencies of the current exchange rates.
+
+    Returns:
+        List[List[dict]]: The errors of each order, in order; located under body.orders[index].
+    """
+    return [order_errors(order, products, currencies, ("body", "orders", index)) for index, order in enumerate(orders)]